@@ -0,0 +1,77 @@
+"""
+Measures the cost of building `pages.create` payloads from the input
+models of `notion.types` compared to `PagePayloadBuilder`:
+
+    $ python benchmarks/builders.py
+"""
+
+import datetime
+import timeit
+
+from typing import Any, Dict
+
+from notion.builders import PagePayloadBuilder
+from notion.types import (
+    CheckboxPropertyValue,
+    DatePropertyValue,
+    NumberPropertyValue,
+    RichTextInputPropertyValue,
+    RichTextTextInput,
+    SelectOptionWithName,
+    SelectPropertyValue,
+    StartEndDate,
+    Text,
+    TitleInputPropertyValue,
+)
+
+
+NUMBER = 10_000
+DATABASE = {
+    "id": "database",
+    "properties": {
+        "Name": {"id": "title", "type": "title"},
+        "Status": {"id": "p0", "type": "select"},
+        "Due": {"id": "p1", "type": "date"},
+        "Estimate": {"id": "p2", "type": "number"},
+        "Done": {"id": "p3", "type": "checkbox"},
+        "Notes": {"id": "p4", "type": "rich_text"},
+    },
+}
+ROW = ("Task", "In progress", datetime.date(2021, 8, 1), 3.5, False, "Some notes")
+
+
+def with_models() -> Dict[str, Any]:
+    name, status, due, estimate, done, notes = ROW
+    properties = {
+        "Name": TitleInputPropertyValue(
+            id="title", title=[RichTextTextInput(text=Text(content=name))]
+        ),
+        "Status": SelectPropertyValue(id="p0", select=SelectOptionWithName(name=status)),
+        "Due": DatePropertyValue(id="p1", date=StartEndDate(start=due)),
+        "Estimate": NumberPropertyValue(id="p2", number=estimate),
+        "Done": CheckboxPropertyValue(id="p3", checkbox=done),
+        "Notes": RichTextInputPropertyValue(
+            id="p4", rich_text=[RichTextTextInput(text=Text(content=notes))]
+        ),
+    }
+    return {
+        "parent": {"database_id": DATABASE["id"]},
+        "properties": {
+            key: value.dict(exclude_none=True, exclude={"id"}) for key, value in properties.items()
+        },
+    }
+
+
+def main() -> None:
+    builder = PagePayloadBuilder(
+        DATABASE, columns=("Name", "Status", "Due", "Estimate", "Done", "Notes")
+    )
+    models = timeit.timeit(with_models, number=NUMBER)
+    built = timeit.timeit(lambda: builder.build(ROW), number=NUMBER)
+    print("{:<10} {:>14}".format("payloads", "per row (us)"))
+    print("{:<10} {:>14.2f}".format("models", models / NUMBER * 1e6))
+    print("{:<10} {:>14.2f}".format("builder", built / NUMBER * 1e6))
+
+
+if __name__ == "__main__":
+    main()
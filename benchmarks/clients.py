@@ -0,0 +1,156 @@
+"""
+Measures the hot paths of `NotionClient` and `NotionAsyncClient` against
+the in-process `MockNotionServer`, without network access:
+
+    $ python benchmarks/clients.py
+    $ python benchmarks/clients.py --requests 2000 --latency 0.01 --concurrency 50
+
+Throughput and latency are measured on `pages.retrieve` for the sync client
+(sequentially and through `map`) and the async client. Parse cost and peak
+memory are measured on `databases.query` pages of a 40 columns database.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+from typing import Any, Awaitable, Callable, Dict, List
+
+from notion import NotionAsyncClient, NotionClient
+from notion.mock import MockNotionServer
+from notion.types import Page, PaginatedList
+
+
+def summarize(name: str, latencies: List[float], elapsed: float) -> Dict[str, Any]:
+    latencies = sorted(latencies)
+    return {
+        "benchmark": name,
+        "requests/s": len(latencies) / elapsed,
+        "p50 (ms)": statistics.median(latencies) * 1000,
+        "p99 (ms)": latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000,
+    }
+
+
+def bench_sync(server: MockNotionServer, page_ids: List[str], workers: int) -> List[Dict]:
+    rows = []
+    with NotionClient(auth="bench", transport=server.transport(), pool_size=workers) as client:
+        latencies: List[float] = []
+
+        def retrieve(page_id: str) -> None:
+            started = time.perf_counter()
+            client.pages.retrieve(page_id)
+            latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for page_id in page_ids:
+            retrieve(page_id)
+        rows.append(summarize("sync", latencies, time.perf_counter() - started))
+
+        latencies = []
+        started = time.perf_counter()
+        client.map(retrieve, page_ids)
+        rows.append(
+            summarize(
+                "sync map ({n} threads)".format(n=workers),
+                latencies,
+                time.perf_counter() - started,
+            )
+        )
+    return rows
+
+
+async def bench_async(server: MockNotionServer, page_ids: List[str], concurrency: int) -> Dict:
+    async with NotionAsyncClient(auth="bench", transport=server.async_transport()) as client:
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies: List[float] = []
+
+        async def retrieve(page_id: str) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                await client.pages.retrieve(page_id)
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(retrieve(page_id) for page_id in page_ids))
+        return summarize(
+            "async ({n} in flight)".format(n=concurrency), latencies, time.perf_counter() - started
+        )
+
+
+def bench_parse(server: MockNotionServer, database_id: str, rounds: int) -> Dict[str, Any]:
+    client = NotionClient(auth="bench", transport=server.transport())
+    request_time = parse_time = 0.0
+    for _ in range(rounds):
+        started = time.perf_counter()
+        response = client.request("POST", "databases/{id}/query".format(id=database_id))
+        parsed = time.perf_counter()
+        PaginatedList[Page].parse_obj(response)
+        request_time += parsed - started
+        parse_time += time.perf_counter() - parsed
+    rows = rounds * len(response["results"])
+    return {
+        "benchmark": "query parse ({n} rows)".format(n=rows),
+        "request (ms/row)": request_time / rows * 1000,
+        "parse (ms/row)": parse_time / rows * 1000,
+    }
+
+
+def bench_memory(server: MockNotionServer, database_id: str) -> Dict[str, Any]:
+    client = NotionClient(auth="bench", transport=server.transport())
+    pages = []
+    tracemalloc.start()
+    cursor = None
+    while True:
+        response = client.databases.query(database_id, start_cursor=cursor)
+        pages.extend(response.results)
+        if not response.has_more:
+            break
+        cursor = response.next_cursor
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "benchmark": "full scan ({n} rows)".format(n=len(pages)),
+        "peak memory (MiB)": peak / 2**20,
+    }
+
+
+def run(function: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+    return asyncio.run(function(*args))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    server = MockNotionServer(latency=args.latency)
+    database_id = server.add_database(rows=args.rows, columns=40)
+    page_ids = list(server.pages)
+    page_ids = (page_ids * (args.requests // len(page_ids) + 1))[: args.requests]
+
+    results = bench_sync(server, page_ids, args.concurrency)
+    results.append(run(bench_async, server, page_ids, args.concurrency))
+
+    server.latency = 0.0
+    results.append(bench_parse(server, database_id, rounds=5))
+    results.append(bench_memory(server, database_id))
+
+    for result in results:
+        print(
+            "{name:<28} {values}".format(
+                name=result.pop("benchmark"),
+                values="  ".join(
+                    "{key}: {value:.3f}".format(key=key, value=value)
+                    for key, value in result.items()
+                ),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Measures the throughput of a database export decoded in the main process
+by `databases.query` compared to `DatabaseExporter` worker processes:
+
+    $ python benchmarks/export.py --rows 20000 --columns 12
+
+Exports through shared memory (`+ shm`) are measured on Python 3.8 and
+later. Query responses are rendered once and replayed from memory, so that the
+main process only spends time on the client side. The CPU time of the
+main process per page shows how far exports scale with the number of
+cores: it is the part of the work that is not spread over the workers.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from httpx import MockTransport, Request, Response
+
+from notion import NotionAsyncClient
+from notion.export import DatabaseExporter
+from notion.helpers import async_iterate_paginated_api
+from notion.mock import MockNotionServer
+from notion.sharedmemory import SHARED_MEMORY_AVAILABLE
+
+
+RING_SIZE = 32 * 1024 * 1024
+
+
+def render(rows: int, columns: int) -> Dict[str, bytes]:
+    server = MockNotionServer()
+    database_id = server.add_database(rows=rows, columns=columns)
+    client = server.transport()
+    responses: Dict[str, bytes] = {}
+    cursor = ""
+    while cursor is not None:
+        body = {"page_size": 100, "start_cursor": cursor} if cursor else {"page_size": 100}
+        request = Request(
+            "POST",
+            "https://api.notion.com/v1/databases/{id}/query".format(id=database_id),
+            json=body,
+        )
+        content = client.handle_request(request).read()
+        responses[cursor] = content
+        cursor = json.loads(content)["next_cursor"]
+    return responses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--columns", type=int, default=12)
+    args = parser.parse_args()
+    responses = render(args.rows, args.columns)
+
+    def handler(request: Request) -> Response:
+        cursor = json.loads(request.content).get("start_cursor", "")
+        return Response(200, content=responses[cursor])
+
+    def client() -> NotionAsyncClient:
+        return NotionAsyncClient(auth="secret", transport=MockTransport(handler))
+
+    async def in_process() -> int:
+        count = 0
+        query = client().databases.query
+        async for _ in async_iterate_paginated_api(query, database_id="database"):
+            count += 1
+        return count
+
+    async def exported(processes: int, ring_size: Optional[int] = None) -> int:
+        count = 0
+        async with DatabaseExporter(processes=processes, ring_size=ring_size) as exporter:
+            async for _ in exporter.export(client(), "database"):
+                count += 1
+        return count
+
+    print("{:<16} {:>10} {:>12} {:>16}".format("mode", "seconds", "pages/s", "main CPU (us)"))
+    runs: List[Tuple[str, Callable[[], Any]]] = [("in process", in_process)]
+    for processes in (1, 2, 4):
+        runs.append(
+            ("{} processes".format(processes), lambda processes=processes: exported(processes))
+        )
+        if SHARED_MEMORY_AVAILABLE:
+            runs.append(
+                (
+                    "{} + shm".format(processes),
+                    lambda processes=processes: exported(processes, RING_SIZE),
+                )
+            )
+    for name, run in runs:
+        started = time.perf_counter()
+        cpu = time.process_time()
+        count = asyncio.run(run())
+        cpu = time.process_time() - cpu
+        elapsed = time.perf_counter() - started
+        print(
+            "{:<16} {:>10.2f} {:>12.0f} {:>16.1f}".format(
+                name, elapsed, count / elapsed, cpu / count * 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
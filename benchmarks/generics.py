@@ -0,0 +1,54 @@
+"""
+Measures the cost of specializing `PaginatedList` on each endpoint call
+compared to the cached specializations returned by `paginated_list`:
+
+    $ python benchmarks/generics.py
+"""
+
+import time
+import timeit
+
+from typing import Any, Union
+
+from notion.helpers import paginated_list
+from notion.types import Block, Database, Page, PageOrDatabase, PaginatedList, User
+
+
+NUMBER = 100_000
+ITEM_TYPES = {
+    "Block": Block,
+    "Database": Database,
+    "Page": Page,
+    "User": User,
+    "Union[Page, Database]": PageOrDatabase,
+}
+
+
+def first_use(item_type: Any) -> float:
+    started = time.perf_counter()
+    paginated_list(item_type)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    print(
+        "{:<22} {:>16} {:>18} {:>16}".format(
+            "item type", "first use (ms)", "subscript (us)", "cached (us)"
+        )
+    )
+    for name, item_type in ITEM_TYPES.items():
+        build = first_use(item_type)
+        if name.startswith("Union"):
+            subscript = timeit.timeit(lambda: PaginatedList[Union[Page, Database]], number=NUMBER)
+        else:
+            subscript = timeit.timeit(lambda: PaginatedList[item_type], number=NUMBER)
+        cached = timeit.timeit(lambda: paginated_list(item_type), number=NUMBER)
+        print(
+            "{:<22} {:>16.3f} {:>18.3f} {:>16.3f}".format(
+                name, build * 1000, subscript / NUMBER * 1e6, cached / NUMBER * 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Compares HTTP/1.1 and HTTP/2 for many concurrent `NotionAsyncClient` calls.
+
+A local stub of the Notion API is served with hypercorn over TLS, with a
+certificate from a throwaway authority, so that clients built with the
+`http2` option negotiate the protocol as they would with the Notion API.
+The benchmark requires `h2`, `hypercorn` and `trustme`:
+
+    $ pip install notion-sdk[http2] hypercorn trustme
+    $ python benchmarks/http2.py
+"""
+
+import asyncio
+import json
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+import trustme
+
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+
+from notion import NotionAsyncClient
+
+
+SERVER_LATENCY = 0.02
+IN_FLIGHT = (50, 100, 200)
+ROUNDS = 5
+
+USER = json.dumps(
+    {"object": "user", "id": "bench", "type": "bot", "name": "Bench", "avatar_url": None}
+).encode()
+
+
+class StubServer:
+    def __init__(self) -> None:
+        self.connections: Set[Tuple[str, int]] = set()
+        self.port = _free_port()
+        self._loop = asyncio.new_event_loop()
+        self._shutdown = asyncio.Event()
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            return
+        self.connections.add(tuple(scope["client"]))
+        await asyncio.sleep(SERVER_LATENCY)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": USER})
+
+    def start(self, certfile: str, keyfile: str) -> None:
+        config = Config()
+        config.bind = ["127.0.0.1:{port}".format(port=self.port)]
+        config.certfile = certfile
+        config.keyfile = keyfile
+        config.loglevel = "ERROR"
+        config.h2_max_concurrent_streams = max(IN_FLIGHT)
+
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._shutdown = asyncio.Event()
+            self._loop.run_until_complete(serve(self, config, shutdown_trigger=self._shutdown.wait))
+
+        threading.Thread(target=run, daemon=True).start()
+        time.sleep(0.5)
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._shutdown.set)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run(server: StubServer, http2: bool, in_flight: int) -> Dict[str, Any]:
+    base_url = "https://127.0.0.1:{port}".format(port=server.port)
+    client = NotionAsyncClient(auth="bench", base_url=base_url, http2=http2, pool_size=in_flight)
+    latencies: List[float] = []
+
+    async def call() -> None:
+        started = time.perf_counter()
+        await client.users.retrieve("bench")
+        latencies.append(time.perf_counter() - started)
+
+    server.connections.clear()
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        await asyncio.gather(*(call() for _ in range(in_flight)))
+    elapsed = time.perf_counter() - started
+    await client.aclose()
+
+    latencies.sort()
+    return {
+        "protocol": "HTTP/2" if http2 else "HTTP/1.1",
+        "in_flight": in_flight,
+        "requests/s": len(latencies) / elapsed,
+        "p50 (ms)": statistics.median(latencies) * 1000,
+        "p99 (ms)": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "connections": len(server.connections),
+    }
+
+
+def _write_certificates(directory: str) -> Tuple[str, str]:
+    """
+    Writes a certificate for 127.0.0.1 and its key, and makes clients trust
+    the authority that issued it through SSL_CERT_FILE.
+    """
+
+    authority = trustme.CA()
+    certificate = authority.issue_cert("127.0.0.1")
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    cafile = os.path.join(directory, "ca.pem")
+    certificate.cert_chain_pems[0].write_to_path(certfile)
+    certificate.private_key_pem.write_to_path(keyfile)
+    authority.cert_pem.write_to_path(cafile)
+    os.environ["SSL_CERT_FILE"] = cafile
+    return certfile, keyfile
+
+
+def main() -> None:
+    directory = tempfile.TemporaryDirectory()
+    server = StubServer()
+    server.start(*_write_certificates(directory.name))
+    try:
+        header = "{:<9} {:>9} {:>11} {:>9} {:>9} {:>12}".format(
+            "protocol", "in_flight", "requests/s", "p50 (ms)", "p99 (ms)", "connections"
+        )
+        print(header)
+        for in_flight in IN_FLIGHT:
+            for http2 in (False, True):
+                row = asyncio.run(run(server, http2, in_flight))
+                print(
+                    "{protocol:<9} {in_flight:>9} {requests/s:>11.0f} {p50 (ms):>9.1f} "
+                    "{p99 (ms):>9.1f} {connections:>12}".format(**row)
+                )
+    finally:
+        server.stop()
+        directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
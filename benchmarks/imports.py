@@ -0,0 +1,65 @@
+"""
+Measures the cold start cost of the package, each statement being run in a
+fresh interpreter:
+
+    $ python benchmarks/imports.py
+    $ python benchmarks/imports.py --runs 20 --output import-times.jsonl
+
+With `--output`, the medians are appended as one JSON line tagged with the
+package version, so results can be tracked over releases.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from typing import Dict, List
+
+
+STATEMENTS = {
+    "import notion": "import notion",
+    "from notion import NotionClient": "from notion import NotionClient",
+    "NotionClient()": "from notion import NotionClient; NotionClient()",
+    "first endpoint access": "from notion import NotionClient; NotionClient().pages",
+}
+
+TEMPLATE = """
+import time
+started = time.perf_counter()
+{statement}
+print(time.perf_counter() - started)
+"""
+
+
+def measure(statement: str, runs: int) -> float:
+    timings: List[float] = []
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, "-c", TEMPLATE.format(statement=statement)], text=True
+        )
+        timings.append(float(output))
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", help="JSON Lines file to append results to")
+    args = parser.parse_args()
+
+    results: Dict[str, float] = {}
+    for name, statement in STATEMENTS.items():
+        results[name] = measure(statement, args.runs) * 1000
+        print("{name:<34} {value:>8.1f} ms".format(name=name, value=results[name]))
+
+    if args.output:
+        from notion.__version__ import __version__
+
+        with open(args.output, "a") as output:
+            output.write(json.dumps({"version": __version__, "median_ms": results}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
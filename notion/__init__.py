@@ -1,5 +1,10 @@
-from notion.client import NotionAsyncClient, NotionClient
-from notion.errors import APIErrorCode, APIResponseError
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+
+if TYPE_CHECKING:
+    from notion.client import NotionAsyncClient, NotionClient
+    from notion.errors import APIErrorCode, APIResponseError
 
 
 __all__ = [
@@ -8,3 +13,27 @@ __all__ = [
     "NotionAsyncClient",
     "NotionClient",
 ]
+
+# Public attributes are imported on first access (PEP 562), so that
+# `import notion` does not pay for httpx, pydantic and the API models.
+_LAZY_ATTRIBUTES = {
+    "APIErrorCode": "notion.errors",
+    "APIResponseError": "notion.errors",
+    "NotionAsyncClient": "notion.client",
+    "NotionClient": "notion.client",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name, None)
+    if module is None:
+        raise AttributeError(
+            "module {module!r} has no attribute {name!r}".format(module=__name__, name=name)
+        )
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,9 +1,12 @@
 def get_version():
     try:
-        version = __import__("pkg_resources").get_distribution("notion-sdk").version
+        try:
+            from importlib.metadata import version as distribution_version
+        except ImportError:  # Python < 3.8
+            return __import__("pkg_resources").get_distribution("notion-sdk").version
+        return distribution_version("notion-sdk")
     except Exception:
-        version = "unknown"
-    return version
+        return "unknown"
 
 
 __author__ = "Nicolas Lecoy"
@@ -0,0 +1,132 @@
+import re
+import threading
+import time
+
+from enum import Enum
+from typing import Dict, NamedTuple, Optional
+
+from notion.errors import CircuitOpenError
+
+
+_OBJECT_ID = re.compile(
+    r"[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}", re.IGNORECASE
+)
+
+
+def endpoint_key(method: str, path: str) -> str:
+    """
+    Returns the endpoint of a request, e.g. `GET blocks/{id}/children`,
+    with object IDs replaced so that all calls to an endpoint share it.
+    """
+
+    return "{method} {path}".format(method=method, path=_OBJECT_ID.sub("{id}", path.strip("/")))
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class Admission(NamedTuple):
+    # Endpoint of the request, and state of its circuit when it was let
+    # through: outcomes of requests admitted before the circuit last changed
+    # state are ignored.
+    key: str
+    state: CircuitState
+    generation: int
+
+
+class _Circuit:
+    __slots__ = ("state", "failures", "opened_at", "probes", "generation")
+
+    def __init__(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        # Incremented on every change of state.
+        self.generation = 0
+
+    def change(self, state: CircuitState) -> None:
+        self.state = state
+        self.generation += 1
+        self.failures = 0
+        self.probes = 0
+        if state == CircuitState.OPEN:
+            self.opened_at = time.monotonic()
+
+
+class CircuitBreaker:
+    """
+    Fails requests fast while an endpoint keeps failing.
+
+    Each endpoint has its own circuit. After `failure_threshold` failures
+    in a row, 5xx responses, timeouts or connection errors, the circuit
+    opens: calls to the endpoint raise `CircuitOpenError` without being
+    sent for `cooldown` seconds. Then up to `probes` calls are let through
+    at a time; the first success of a probe closes the circuit and a
+    failure opens it again for another cooldown. Outcomes of requests let
+    through before the circuit last changed state are ignored.
+
+    A breaker can be shared by several clients, e.g. all tenant handles of
+    a `NotionAsyncClient`, as outages are not specific to a token.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0, probes: int = 1) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.probes = probes
+        self._circuits: Dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def state(self, method: str, path: str) -> CircuitState:
+        with self._lock:
+            circuit = self._circuits.get(endpoint_key(method, path), None)
+            return circuit.state if circuit is not None else CircuitState.CLOSED
+
+    def acquire(self, method: str, path: str) -> Admission:
+        """
+        Returns the admission of the request to pass to `release` once it
+        is done, or raises `CircuitOpenError`.
+        """
+
+        key = endpoint_key(method, path)
+        with self._lock:
+            circuit = self._circuits.get(key, None)
+            if circuit is None:
+                circuit = self._circuits[key] = _Circuit()
+            if circuit.state == CircuitState.OPEN:
+                retry_after = circuit.opened_at + self.cooldown - time.monotonic()
+                if retry_after > 0:
+                    raise CircuitOpenError(key, retry_after)
+                circuit.change(CircuitState.HALF_OPEN)
+            if circuit.state == CircuitState.HALF_OPEN:
+                if circuit.probes >= self.probes:
+                    raise CircuitOpenError(key, 0.0)
+                circuit.probes += 1
+            return Admission(key, circuit.state, circuit.generation)
+
+    def release(self, admission: Admission, failed: Optional[bool]) -> None:
+        """
+        Records the outcome of a request, `None` when it was not sent or
+        interrupted by the caller.
+        """
+
+        with self._lock:
+            circuit = self._circuits[admission.key]
+            if circuit.generation != admission.generation:
+                return
+            if circuit.state == CircuitState.HALF_OPEN:
+                circuit.probes -= 1
+                if failed is not None:
+                    circuit.change(CircuitState.OPEN if failed else CircuitState.CLOSED)
+                return
+            if failed is None:
+                return
+            if not failed:
+                circuit.failures = 0
+                return
+            circuit.failures += 1
+            if circuit.failures >= self.failure_threshold:
+                circuit.change(CircuitState.OPEN)
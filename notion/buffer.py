@@ -0,0 +1,359 @@
+import asyncio
+import atexit
+import threading
+import time
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from notion.errors import is_retryable
+from notion.helpers import pick
+
+
+if TYPE_CHECKING:
+    from notion.client import NotionAsyncClient, NotionClient
+
+
+PendingUpdate = Dict[str, Any]
+
+
+def _merge(older: PendingUpdate, newer: PendingUpdate) -> PendingUpdate:
+    merged = {**older, **newer}
+    if "properties" in older and "properties" in newer:
+        merged["properties"] = {**older["properties"], **newer["properties"]}
+    return merged
+
+
+class _UpdateBuffer:
+    def __init__(self, flush_interval: float, max_pending: int, max_retries: int) -> None:
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        # Number of updates received and of requests sent to apply them.
+        self.updates = 0
+        self.writes = 0
+        self.error: Optional[Exception] = None
+        self._pending: Dict[str, PendingUpdate] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _add(self, page_id: str, properties: Optional[Dict[str, Any]], **kwargs: Any) -> bool:
+        """
+        Merges an update into the pending one of the page, and returns
+        whether the buffer is full.
+        """
+
+        update = pick(kwargs, "archived", "cover", "icon")
+        if properties:
+            update["properties"] = dict(properties)
+        with self._lock:
+            self.updates += 1
+            current = self._pending.get(page_id, None)
+            self._pending[page_id] = _merge(current, update) if current else update
+            return len(self._pending) >= self.max_pending
+
+    def _take(self) -> List[Tuple[str, PendingUpdate]]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return list(pending.items())
+
+    def _restore(self, items: Iterable[Tuple[str, PendingUpdate]]) -> None:
+        # Updates are put back under the ones received for the page in the
+        # meantime.
+        with self._lock:
+            for page_id, update in items:
+                newer = self._pending.get(page_id, None)
+                self._pending[page_id] = _merge(update, newer) if newer else update
+
+    def _fail(self, page_id: str, update: PendingUpdate, error: Exception) -> None:
+        # Failed updates that may succeed later are put back.
+        if is_retryable(error):
+            self._restore([(page_id, update)])
+
+    def _retry_delay(self, attempt: int) -> Optional[float]:
+        """
+        Returns how long to wait before flushing again on close, or `None`
+        once the updates left have been retried `max_retries` times.
+        """
+
+        if not self._pending or attempt >= self.max_retries:
+            return None
+        return self.flush_interval * 2**attempt
+
+    def _path(self, page_id: str) -> str:
+        return "pages/{id}".format(id=page_id)
+
+
+class PageUpdateBuffer(_UpdateBuffer):
+    """
+    Write-behind buffer coalescing `pages.update` calls.
+
+    Updates of the same page received before a flush are merged into a
+    single request, property by property, so the last value written to
+    each property wins:
+
+        with PageUpdateBuffer(notion) as buffer:
+            buffer.update(page_id, properties={"Status": {"select": {"name": "Done"}}})
+            buffer.update(page_id, properties={"Count": {"number": 3}})
+
+    Pending updates are written by a background thread every
+    `flush_interval` seconds, or as soon as `max_pending` pages have
+    pending updates, on the thread pool of the client, see
+    `NotionClient.map`. `close` writes the remaining updates the same way.
+    It is also called on exit of the interpreter, when thread pools no
+    longer accept work, and then writes them one at a time.
+
+    Updates failing with a timeout, a rate limit or a server error are put
+    back in the buffer for the next flush; other errors drop the update.
+    On close, updates put back are retried up to `max_retries` times with
+    an exponential backoff, after which the error is raised and they are
+    left in `pending`.
+    """
+
+    def __init__(
+        self,
+        client: "NotionClient",
+        flush_interval: float = 1.0,
+        max_pending: int = 100,
+        max_retries: int = 3,
+    ) -> None:
+        super().__init__(flush_interval, max_pending, max_retries)
+        self.client = client
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        # Set when closed on exit of the interpreter.
+        self._exiting = False
+        self._thread: Optional[threading.Thread] = None
+
+    def update(
+        self, page_id: str, properties: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> None:
+        if self._closed:
+            raise RuntimeError("Cannot update pages through a closed buffer")
+        if self._add(page_id, properties, **kwargs):
+            self._wakeup.set()
+        if self._thread is None:
+            self._start()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="notion-sdk-buffer", daemon=True)
+            self._thread.start()
+        atexit.register(self._close_at_exit)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._closed:
+                return
+            try:
+                self.flush()
+            except Exception as error:
+                self.error = error
+
+    def flush(self) -> None:
+        """
+        Writes the pending updates now, and raises the first error met.
+        """
+
+        errors: List[Exception] = []
+        written: Set[str] = set()
+
+        def write(item: Tuple[str, PendingUpdate]) -> None:
+            page_id, update = item
+            try:
+                self.client.request("PATCH", self._path(page_id), body=update)
+            except Exception as error:
+                self._fail(page_id, update, error)
+                errors.append(error)
+            written.add(page_id)
+
+        # Flushes are serialized, so that two updates of a page are never
+        # written concurrently and applied in the wrong order.
+        with self._flush_lock:
+            batch = self._take()
+            try:
+                if batch and self._exiting:
+                    # On exit of the interpreter, thread pools no longer
+                    # accept work: the last updates are written from this
+                    # thread.
+                    for item in batch:
+                        write(item)
+                elif batch:
+                    try:
+                        self.client.map(write, batch)
+                    except RuntimeError:
+                        # Nor does the pool of a closed client. On close,
+                        # the updates are written from this thread.
+                        if not self._closed or written:
+                            raise
+                        for item in batch:
+                            write(item)
+            except BaseException:
+                # E.g. the thread pool of a closed client: updates not
+                # written are kept for the next flush.
+                self._restore(item for item in batch if item[0] not in written)
+                raise
+            finally:
+                self.writes += len(written)
+        if errors:
+            raise errors[0]
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            atexit.unregister(self._close_at_exit)
+        error: Optional[Exception] = None
+        attempt = 0
+        while True:
+            try:
+                self.flush()
+            except Exception as failure:
+                error = error or failure
+            delay = self._retry_delay(attempt)
+            if delay is None:
+                break
+            time.sleep(delay)
+            attempt += 1
+        if error is not None:
+            raise error
+
+    def _close_at_exit(self) -> None:
+        self._exiting = True
+        self.close()
+
+    def __enter__(self) -> "PageUpdateBuffer":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class AsyncPageUpdateBuffer(_UpdateBuffer):
+    """
+    Same as `PageUpdateBuffer` for `NotionAsyncClient`, with a background
+    task writing up to `concurrency` updates at the same time. Close it
+    with `aclose`, or use it as an async context manager, to write the
+    remaining updates.
+    """
+
+    def __init__(
+        self,
+        client: "NotionAsyncClient",
+        flush_interval: float = 1.0,
+        max_pending: int = 100,
+        concurrency: int = 10,
+        max_retries: int = 3,
+    ) -> None:
+        super().__init__(flush_interval, max_pending, max_retries)
+        self.client = client
+        self.concurrency = concurrency
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._closed = False
+        self._task: Optional["asyncio.Future[None]"] = None
+
+    def update(
+        self, page_id: str, properties: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> None:
+        """
+        Adds an update to the buffer. Must be called from the event loop
+        running the client.
+        """
+
+        if self._closed:
+            raise RuntimeError("Cannot update pages through a closed buffer")
+        full = self._add(page_id, properties, **kwargs)
+        if self._task is None:
+            self._flush_lock = asyncio.Lock()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+        if full:
+            assert self._wakeup is not None
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as error:
+                self.error = error
+
+    async def flush(self) -> None:
+        """
+        Writes the pending updates now, and raises the first error met.
+        """
+
+        errors: List[Exception] = []
+        written: Set[str] = set()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def write(page_id: str, update: PendingUpdate) -> None:
+            async with semaphore:
+                try:
+                    await self.client.request("PATCH", self._path(page_id), body=update)
+                except Exception as error:
+                    self._fail(page_id, update, error)
+                    errors.append(error)
+                written.add(page_id)
+
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            batch = self._take()
+            try:
+                if batch:
+                    await asyncio.gather(*(write(page_id, update) for page_id, update in batch))
+            except BaseException:
+                # E.g. a cancelled flush: updates not written are kept.
+                self._restore(item for item in batch if item[0] not in written)
+                raise
+            finally:
+                self.writes += len(written)
+        if errors:
+            raise errors[0]
+
+    async def aclose(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is not None:
+            assert self._wakeup is not None
+            self._wakeup.set()
+            await self._task
+        error: Optional[Exception] = None
+        attempt = 0
+        while True:
+            try:
+                await self.flush()
+            except Exception as failure:
+                error = error or failure
+            delay = self._retry_delay(attempt)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+            attempt += 1
+        if error is not None:
+            raise error
+
+    async def __aenter__(self) -> "AsyncPageUpdateBuffer":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
@@ -0,0 +1,179 @@
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from notion.types import Database, PropertyType
+
+
+Serializer = Callable[[Any], Dict[str, Any]]
+Row = Union[Mapping[str, Any], Sequence[Any]]
+
+# Property types computed by Notion, that cannot be set when creating a page.
+READ_ONLY_PROPERTY_TYPES = frozenset(
+    (
+        PropertyType.FORMULA,
+        PropertyType.ROLLUP,
+        PropertyType.CREATED_BY,
+        PropertyType.CREATED_TIME,
+        PropertyType.LAST_EDITED_BY,
+        PropertyType.LAST_EDITED_TIME,
+    )
+)
+
+
+def _rich_text(value: Any) -> List[Dict[str, Any]]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [{"type": "text", "text": {"content": str(value)}}]
+
+
+def _date(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise ValueError("Unsupported date value {value!r}".format(value=value))
+
+
+def _date_range(value: Any) -> Optional[Dict[str, Any]]:
+    if value is None:
+        return None
+    if isinstance(value, tuple):
+        start, end = value
+        return {"start": _date(start), "end": _date(end)}
+    return {"start": _date(value), "end": None}
+
+
+def _names(values: Iterable[str]) -> List[Dict[str, str]]:
+    return [{"name": name} for name in values]
+
+
+def _files(values: Iterable[str]) -> List[Dict[str, Any]]:
+    return [{"name": url, "type": "external", "external": {"url": url}} for url in values]
+
+
+def _unavailable(message: str) -> Serializer:
+    # Raises only when a value is set, so that the other properties of the
+    # database can still be built.
+    def serializer(value: Any) -> Dict[str, Any]:
+        raise ValueError(message)
+
+    return serializer
+
+
+def _compile(name: str, property_type: str) -> Serializer:
+    """
+    Returns the function serializing a Python value into the Notion JSON
+    value of a property of type `property_type`.
+    """
+
+    if property_type in READ_ONLY_PROPERTY_TYPES:
+        return _unavailable(
+            "Property {name!r} of type {type} is read-only".format(name=name, type=property_type)
+        )
+    if property_type == PropertyType.TITLE:
+        return lambda value: {"title": _rich_text(value)}
+    if property_type == PropertyType.RICH_TEXT:
+        return lambda value: {"rich_text": _rich_text(value)}
+    if property_type == PropertyType.NUMBER:
+        return lambda value: {"number": value}
+    if property_type == PropertyType.SELECT:
+        return lambda value: {"select": {"name": value} if value is not None else None}
+    if property_type == PropertyType.MULTI_SELECT:
+        return lambda value: {"multi_select": _names(value or ())}
+    if property_type == PropertyType.DATE:
+        return lambda value: {"date": _date_range(value)}
+    if property_type == PropertyType.PEOPLE:
+        return lambda value: {"people": [{"object": "user", "id": id} for id in value or ()]}
+    if property_type == PropertyType.FILES:
+        return lambda value: {"files": _files(value or ())}
+    if property_type == PropertyType.CHECKBOX:
+        return lambda value: {"checkbox": bool(value)}
+    if property_type == PropertyType.URL:
+        return lambda value: {"url": value}
+    if property_type == PropertyType.EMAIL:
+        return lambda value: {"email": value}
+    if property_type == PropertyType.PHONE_NUMBER:
+        return lambda value: {"phone_number": value}
+    if property_type == PropertyType.RELATION:
+        return lambda value: {"relation": [{"id": id} for id in value or ()]}
+    return _unavailable(
+        "Property {name!r} has unsupported type {type}, pass its JSON value as a dict".format(
+            name=name, type=property_type
+        )
+    )
+
+
+class PagePayloadBuilder:
+    """
+    Builds `pages.create` payloads for a database from plain Python rows.
+
+    The database schema is read once to compile one serializer per
+    property, so that building a payload does not instantiate any model:
+
+        builder = PagePayloadBuilder(notion.databases.retrieve(database_id))
+        notion.pages.create(**builder.build({"Name": "Task", "Status": "Done"}))
+
+    Rows are either mappings of property names to values, or sequences of
+    values in the order of `columns`. Values are plain Python objects:
+    strings for texts, selects, URLs, emails and phone numbers, numbers,
+    booleans, dates or `(start, end)` tuples, and iterables of names, IDs
+    or URLs for multi-selects, people, relations and files. Dicts and lists
+    of rich text objects are passed through unchanged. Properties of a type
+    the builder does not support, like `status`, only raise a `ValueError`
+    when given a value other than a dict.
+    """
+
+    def __init__(
+        self, database: Union[Database, Dict[str, Any]], columns: Optional[Sequence[str]] = None
+    ) -> None:
+        if isinstance(database, Database):
+            database_id = database.id
+            schema = {
+                name: PropertyType(value.type).value for name, value in database.properties.items()
+            }
+        else:
+            database_id = database["id"]
+            schema = {name: value["type"] for name, value in database["properties"].items()}
+        self.parent = {"database_id": database_id}
+        self.serializers: Dict[str, Serializer] = {
+            name: _compile(name, property_type) for name, property_type in schema.items()
+        }
+        self.columns: Tuple[Tuple[str, Serializer], ...] = ()
+        if columns is not None:
+            self.columns = tuple((name, self._serializer(name)) for name in columns)
+
+    def _serializer(self, name: str) -> Serializer:
+        serializer = self.serializers.get(name, None)
+        if serializer is None:
+            raise KeyError("Database has no property {name!r}".format(name=name))
+        return serializer
+
+    def properties(self, row: Row) -> Dict[str, Any]:
+        if isinstance(row, Mapping):
+            items: Iterable[Tuple[str, Any, Serializer]] = (
+                (name, value, self._serializer(name)) for name, value in row.items()
+            )
+        else:
+            if len(row) != len(self.columns):
+                raise ValueError(
+                    "Expected {expected} values, got {count}".format(
+                        expected=len(self.columns), count=len(row)
+                    )
+                )
+            items = (
+                (name, value, serializer) for (name, serializer), value in zip(self.columns, row)
+            )
+        return {
+            name: value if isinstance(value, dict) else serializer(value)
+            for name, value, serializer in items
+        }
+
+    def build(self, row: Row, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Returns the keyword arguments of `pages.create` for `row`. Extra
+        arguments, like `children` or `icon`, are added to the payload.
+        """
+
+        return {"parent": self.parent, "properties": self.properties(row), **kwargs}
@@ -1,39 +1,130 @@
-from typing import Any, Dict, Optional, Union, TypeVar, Type
+import asyncio
+import threading
+import time
+import warnings
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextvars import copy_context
+from importlib import import_module
+from importlib.util import find_spec
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from httpx import (
     URL,
+    AsyncBaseTransport,
     AsyncClient,
+    BaseTransport,
     Client,
     Headers,
     HTTPStatusError,
+    Limits,
     Request,
     Response,
     TimeoutException,
+    TransportError,
 )
+from httpx import __version__ as HTTPX_VERSION
 
-from notion import __version__
-from notion.endpoints import (
-    BlocksAsyncEndpoint,
-    BlocksEndpoint,
-    DatabasesAsyncEndpoint,
-    DatabasesEndpoint,
-    PagesAsyncEndpoint,
-    PagesEndpoint,
-    SearchAsyncEndpoint,
-    SearchEndpoint,
-    UsersAsyncEndpoint,
-    UsersEndpoint,
+from notion.__version__ import __version__
+from notion.breaker import Admission, CircuitBreaker
+from notion.deadlines import remaining
+from notion.errors import (
+    APIResponseError,
+    DeadlineExceededError,
+    HTTPResponseError,
+    RequestTimeoutError,
+    is_api_error,
 )
-from notion.errors import APIResponseError, HTTPResponseError, RequestTimeoutError, is_api_error
+from notion.hedging import HedgingPolicy
+from notion.identity import IdentityMap
+from notion.metrics import ClientMetrics, RequestRecord
+from notion.ratelimit import RateLimiter
+from notion.scheduler import PriorityScheduler
+
+
+if TYPE_CHECKING:
+    from notion.endpoints import (
+        BlocksAsyncEndpoint,
+        BlocksEndpoint,
+        DatabasesAsyncEndpoint,
+        DatabasesEndpoint,
+        PagesAsyncEndpoint,
+        PagesEndpoint,
+        SearchAsyncEndpoint,
+        SearchEndpoint,
+        UsersAsyncEndpoint,
+        UsersEndpoint,
+    )
 
 
 DEFAULT_NOTION_URL = "https://api.notion.com/v1/"
 DEFAULT_NOTION_VERSION = "2021-08-16"
 DEFAULT_NOTION_SDK_USER_AGENT = f"notion-sdk/{__version__} (https://github.com/getsyncr/notion-sdk)"
 
+DEFAULT_LIMITS = Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=5.0)
+
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
+
+def _accept_encoding() -> str:
+    # Best compression first. httpx decodes br when brotli is installed,
+    # and zstd from version 0.27 when zstandard is installed.
+    encodings = ["gzip", "deflate"]
+    if find_spec("brotli") is not None or find_spec("brotlicffi") is not None:
+        encodings.insert(0, "br")
+    version = tuple(int(part) for part in HTTPX_VERSION.split(".")[:2] if part.isdigit())
+    if find_spec("zstandard") is not None and version >= (0, 27):
+        encodings.insert(0, "zstd")
+    return ", ".join(encodings)
+
+
+ACCEPT_ENCODING = _accept_encoding()
+
+
+def normalize_base_url(base_url: str) -> str:
+    if base_url and not base_url.endswith("/v1/"):
+        base_url = base_url + "/v1/"
+    return base_url
+
+
 _HttpClientType = TypeVar("_HttpClientType", Client, AsyncClient)
 
 
+class LazyEndpoint:
+    """
+    Client attribute creating an endpoint on first access.
+
+    Endpoint modules, and through them the pydantic models of
+    `notion.types`, are only imported when an endpoint is first used.
+    """
+
+    def __init__(self, module: str, name: str) -> None:
+        self.module = module
+        self.name = name
+
+    def __set_name__(self, owner: Type, attribute: str) -> None:
+        self.attribute = attribute
+
+    def __get__(self, client: Optional["BaseClient"], owner: Type) -> Any:
+        if client is None:
+            return self
+        endpoint = getattr(import_module(self.module), self.name)(client)
+        client.__dict__[self.attribute] = endpoint
+        return endpoint
+
+
 class BaseClient:
     def __init__(
         self,
@@ -42,14 +133,34 @@ class BaseClient:
         base_url: str = DEFAULT_NOTION_URL,
         notion_version: str = DEFAULT_NOTION_VERSION,
         user_agent: str = DEFAULT_NOTION_SDK_USER_AGENT,
+        rate_limit: Optional[float] = None,
+        priorities: Optional[Mapping[str, float]] = None,
+        pool_size: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: bool = False,
+        transport: Optional[Union[BaseTransport, AsyncBaseTransport]] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        identity_map: Optional[IdentityMap] = None,
     ) -> None:
         self.auth = auth
-        if base_url and not base_url.endswith("/v1/"):
-            base_url = base_url + "/v1/"
-        self.base_url = URL(base_url)
+        self.base_url = URL(normalize_base_url(base_url))
         self.timeout = timeout
         self.notion_version = notion_version
         self.user_agent = user_agent
+        self.rate_limit = rate_limit
+        self.priorities = priorities
+        self.pool_size = pool_size
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.transport = transport
+        self.circuit_breaker = circuit_breaker
+        self.identity_map = identity_map
+        self.rate_limiter: Optional[Union[RateLimiter, PriorityScheduler]] = None
+        if rate_limit and priorities is not None:
+            self.rate_limiter = PriorityScheduler(rate_limit, weights=priorities)
+        elif rate_limit:
+            self.rate_limiter = RateLimiter(rate_limit)
+        self.metrics = ClientMetrics()
 
     def _build_request(
         self,
@@ -63,40 +174,125 @@ class BaseClient:
         headers = Headers()
         if auth is not None:
             headers["Authorization"] = "Bearer {token}".format(token=auth)
-        return client.build_request(method, path, params=query, json=body, headers=headers)
+        left = remaining()
+        if left is None:
+            return client.build_request(method, path, params=query, json=body, headers=headers)
+        if left <= 0:
+            raise DeadlineExceededError()
+        return client.build_request(
+            method,
+            path,
+            params=query,
+            json=body,
+            headers=headers,
+            timeout=min(self.timeout, left),
+        )
+
+    def _record_request(
+        self, request: Request, response: Optional[Response], started: float
+    ) -> None:
+        self.metrics.record(
+            RequestRecord(
+                method=request.method,
+                path=request.url.path,
+                status=response.status_code if response is not None else None,
+                elapsed=time.perf_counter() - started,
+                bytes_sent=len(request.content),
+                bytes_received=response.num_bytes_downloaded if response is not None else 0,
+                bytes_decoded=len(response.content) if response is not None else 0,
+            )
+        )
 
-    def _parse_response(self, response: Response) -> Any:
+    def _enter_circuit(self, method: str, path: str) -> Optional[Admission]:
+        if self.circuit_breaker is None:
+            return None
+        return self.circuit_breaker.acquire(method, path)
+
+    def _exit_circuit(self, circuit: Optional[Admission], failed: Optional[bool]) -> None:
+        if circuit is not None and self.circuit_breaker is not None:
+            self.circuit_breaker.release(circuit, failed)
+
+    def _timeout_error(self) -> RequestTimeoutError:
+        left = remaining()
+        if left is not None and left <= 0:
+            return DeadlineExceededError()
+        return RequestTimeoutError()
+
+    def _parse_response(self, response: Response, raw: bool = False) -> Any:
         try:
             response.raise_for_status()
-        except TimeoutException:
-            raise RequestTimeoutError()
         except HTTPStatusError as err:
-            body = err.response.json()
-            code = body.get("code", None)
+            try:
+                body = err.response.json()
+            except ValueError:
+                # Error pages of proxies and load balancers are not JSON.
+                raise HTTPResponseError(err.response)
+            code = body.get("code", None) if isinstance(body, dict) else None
             if is_api_error(code):
                 raise APIResponseError(response, body["message"], code)
             raise HTTPResponseError(err.response)
+        if raw:
+            return response.content
         return response.json()
 
     def _create_http_client(self, client_factory: Type[_HttpClientType]) -> _HttpClientType:
-        client = client_factory(
-            base_url=self.base_url,
-            timeout=self.timeout,
-            headers=Headers(
-                {
-                    "Notion-Version": self.notion_version,
-                    "User-Agent": self.user_agent,
-                }
-            ),
+        headers = Headers(
+            {
+                "Accept-Encoding": ACCEPT_ENCODING,
+                "Notion-Version": self.notion_version,
+                "User-Agent": self.user_agent,
+            }
         )
-
         if self.auth:
-            client.headers["Authorization"] = "Bearer {token}".format(token=self.auth)
+            headers["Authorization"] = "Bearer {token}".format(token=self.auth)
 
-        return client
+        kwargs: Dict[str, Any] = {}
+        if self.pool_size is not None or self.keepalive_expiry is not None:
+            kwargs["limits"] = Limits(
+                max_connections=self.pool_size or DEFAULT_LIMITS.max_connections,
+                max_keepalive_connections=self.pool_size
+                or DEFAULT_LIMITS.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry or DEFAULT_LIMITS.keepalive_expiry,
+            )
+        if self.http2:
+            if HTTP2_AVAILABLE:
+                kwargs["http2"] = True
+            else:
+                warnings.warn(
+                    "HTTP/2 requires the h2 package (pip install notion-sdk[http2]), "
+                    "falling back to HTTP/1.1."
+                )
+        if self.transport is not None:
+            kwargs["transport"] = self.transport
+
+        return client_factory(
+            base_url=self.base_url, timeout=self.timeout, headers=headers, **kwargs
+        )
 
 
 class NotionClient(BaseClient):
+    """
+    Synchronous Notion API client.
+
+    A client can be shared between threads: the underlying httpx client is
+    configured once at construction and never mutated afterwards, and the
+    rate limiter and metrics are lock protected. Set `pool_size` to the
+    number of worker threads so each of them can hold a connection.
+    """
+
+    if TYPE_CHECKING:
+        blocks: BlocksEndpoint
+        databases: DatabasesEndpoint
+        pages: PagesEndpoint
+        search: SearchEndpoint
+        users: UsersEndpoint
+    else:
+        blocks = LazyEndpoint("notion.endpoints.sync", "BlocksEndpoint")
+        databases = LazyEndpoint("notion.endpoints.sync", "DatabasesEndpoint")
+        pages = LazyEndpoint("notion.endpoints.sync", "PagesEndpoint")
+        search = LazyEndpoint("notion.endpoints.sync", "SearchEndpoint")
+        users = LazyEndpoint("notion.endpoints.sync", "UsersEndpoint")
+
     def __init__(
         self,
         auth: Optional[str] = None,
@@ -104,6 +300,14 @@ class NotionClient(BaseClient):
         base_url: str = DEFAULT_NOTION_URL,
         notion_version: str = DEFAULT_NOTION_VERSION,
         user_agent: str = DEFAULT_NOTION_SDK_USER_AGENT,
+        rate_limit: Optional[float] = None,
+        priorities: Optional[Mapping[str, float]] = None,
+        pool_size: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: bool = False,
+        transport: Optional[BaseTransport] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        identity_map: Optional[IdentityMap] = None,
     ) -> None:
         super().__init__(
             auth=auth,
@@ -111,14 +315,18 @@ class NotionClient(BaseClient):
             base_url=base_url,
             notion_version=notion_version,
             user_agent=user_agent,
+            rate_limit=rate_limit,
+            priorities=priorities,
+            pool_size=pool_size,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+            transport=transport,
+            circuit_breaker=circuit_breaker,
+            identity_map=identity_map,
         )
         self.http_client = self._create_http_client(Client)
-
-        self.blocks = BlocksEndpoint(self)
-        self.databases = DatabasesEndpoint(self)
-        self.pages = PagesEndpoint(self)
-        self.search = SearchEndpoint(self)
-        self.users = UsersEndpoint(self)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
 
     def request(
         self,
@@ -127,15 +335,98 @@ class NotionClient(BaseClient):
         auth: Optional[str] = None,
         query: Optional[Dict[Any, Any]] = None,
         body: Optional[Dict[Any, Any]] = None,
+        raw: bool = False,
     ) -> Any:
-        request = self._build_request(
-            self.http_client, method, path, query=query, body=body, auth=auth
-        )
-        response = self.http_client.send(request)
-        return self._parse_response(response)
+        circuit = self._enter_circuit(method, path)
+        response = None
+        failed = None
+        try:
+            # Waiting for a slot is bounded by the current deadline.
+            if self.rate_limiter is not None and not self.rate_limiter.acquire(remaining()):
+                raise DeadlineExceededError()
+            request = self._build_request(
+                self.http_client, method, path, query=query, body=body, auth=auth
+            )
+            started = time.perf_counter()
+            try:
+                response = self.http_client.send(request)
+            except TimeoutException:
+                error = self._timeout_error()
+                failed = not isinstance(error, DeadlineExceededError)
+                raise error
+            except TransportError:
+                failed = True
+                raise
+            finally:
+                self._record_request(request, response, started)
+            failed = response.status_code >= 500
+        finally:
+            self._exit_circuit(circuit, failed)
+        return self._parse_response(response, raw=raw)
+
+    def map(self, function: Callable[..., Any], *iterables: Iterable[Any]) -> List[Any]:
+        """
+        Calls `function` with arguments taken from `iterables` on the
+        client's thread pool and returns the results in order.
+
+        The pool has `pool_size` workers and is created on first use, e.g.
+        `client.map(client.pages.retrieve, page_ids)`. Calls run in a copy
+        of the caller's context, so they keep its request `priority` and
+        `deadline`. The first error cancels the calls not started yet and
+        waits for the running ones before being raised, so that a failed
+        fan-out leaves no request in flight.
+        """
+
+        context = copy_context()
+        pool = self._pool()
+        futures = [
+            pool.submit(lambda *args: context.copy().run(function, *args), *args)
+            for args in zip(*iterables)
+        ]
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            raise
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Created under a lock, so that threads calling `map` at the same
+        # time share a single pool.
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.pool_size, thread_name_prefix="notion-sdk"
+                )
+            return self._executor
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+        self.http_client.close()
+
+    def __enter__(self) -> "NotionClient":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
 
 
 class NotionAsyncClient(BaseClient):
+    if TYPE_CHECKING:
+        blocks: BlocksAsyncEndpoint
+        databases: DatabasesAsyncEndpoint
+        pages: PagesAsyncEndpoint
+        search: SearchAsyncEndpoint
+        users: UsersAsyncEndpoint
+    else:
+        blocks = LazyEndpoint("notion.endpoints.asynchronous", "BlocksAsyncEndpoint")
+        databases = LazyEndpoint("notion.endpoints.asynchronous", "DatabasesAsyncEndpoint")
+        pages = LazyEndpoint("notion.endpoints.asynchronous", "PagesAsyncEndpoint")
+        search = LazyEndpoint("notion.endpoints.asynchronous", "SearchAsyncEndpoint")
+        users = LazyEndpoint("notion.endpoints.asynchronous", "UsersAsyncEndpoint")
+
     def __init__(
         self,
         auth: Optional[str] = None,
@@ -143,6 +434,16 @@ class NotionAsyncClient(BaseClient):
         base_url: str = DEFAULT_NOTION_URL,
         notion_version: str = DEFAULT_NOTION_VERSION,
         user_agent: str = DEFAULT_NOTION_SDK_USER_AGENT,
+        rate_limit: Optional[float] = None,
+        priorities: Optional[Mapping[str, float]] = None,
+        pool_size: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: bool = False,
+        transport: Optional[AsyncBaseTransport] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        identity_map: Optional[IdentityMap] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        http_client: Optional[AsyncClient] = None,
     ) -> None:
         super().__init__(
             auth=auth,
@@ -150,13 +451,21 @@ class NotionAsyncClient(BaseClient):
             base_url=base_url,
             notion_version=notion_version,
             user_agent=user_agent,
+            rate_limit=rate_limit,
+            priorities=priorities,
+            pool_size=pool_size,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+            transport=transport,
+            circuit_breaker=circuit_breaker,
+            identity_map=identity_map,
         )
-
-        self.blocks = BlocksAsyncEndpoint(self)
-        self.databases = DatabasesAsyncEndpoint(self)
-        self.pages = PagesAsyncEndpoint(self)
-        self.search = SearchAsyncEndpoint(self)
-        self.users = UsersAsyncEndpoint(self)
+        self.hedging = hedging
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or self._create_http_client(AsyncClient)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._parent: Optional[NotionAsyncClient] = None
+        self._tenants: Dict[str, NotionAsyncClient] = {}
 
     async def request(
         self,
@@ -165,8 +474,196 @@ class NotionAsyncClient(BaseClient):
         auth: Optional[str] = None,
         query: Optional[Dict[Any, Any]] = None,
         body: Optional[Dict[Any, Any]] = None,
+        raw: bool = False,
     ) -> Any:
-        async with self._create_http_client(AsyncClient) as client:
-            request = self._build_request(client, method, path, query=query, body=body, auth=auth)
-            response = await client.send(request)
-        return self._parse_response(response)
+        if self.hedging is not None and method == "GET":
+            return await self._hedged_request(
+                method, path, auth=auth, query=query, body=body, raw=raw
+            )
+        return await self._request(method, path, auth=auth, query=query, body=body, raw=raw)
+
+    async def _hedged_request(self, method: str, path: str, **kwargs: Any) -> Any:
+        """
+        Sends a second copy of the request when the first one is slower than
+        the delay given by `hedging`, and returns the first response. The
+        other request is cancelled.
+
+        Latencies are measured from the moment a request is sent, once it
+        got its rate limiter slot, so that waiting for the quota does not
+        trigger hedges. The latency of the successful request is observed,
+        and when the first request loses to its hedge, the time it had been
+        running is observed as a censored sample. Requests failing fast or
+        hedges cancelled early would skew the hedging delay down.
+        """
+
+        hedging = self.hedging
+        assert hedging is not None
+        started: Dict["asyncio.Future[Any]", float] = {}
+
+        def send(sent: Optional[asyncio.Event] = None) -> "asyncio.Future[Any]":
+            def on_send() -> None:
+                started[task] = time.perf_counter()
+                if sent is not None:
+                    sent.set()
+
+            task = asyncio.ensure_future(self._request(method, path, on_send=on_send, **kwargs))
+            return task
+
+        primary_sent = asyncio.Event()
+        primary = send(primary_sent)
+        tasks = {primary}
+        waiter = asyncio.ensure_future(primary_sent.wait())
+        try:
+            await asyncio.wait({primary, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            if not primary.done():
+                done, _ = await asyncio.wait(tasks, timeout=hedging.delay(method, path))
+                if not done and hedging.acquire():
+                    tasks.add(send())
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    now = time.perf_counter()
+                    hedging.observe(method, path, now - started[winner])
+                    if winner is not primary:
+                        hedging.wins += 1
+                        if not primary.done():
+                            hedging.observe(method, path, now - started[primary], censored=True)
+                    return winner.result()
+                if not pending:
+                    return primary.result()
+        finally:
+            waiter.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(waiter, *tasks, return_exceptions=True)
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        auth: Optional[str] = None,
+        query: Optional[Dict[Any, Any]] = None,
+        body: Optional[Dict[Any, Any]] = None,
+        raw: bool = False,
+        on_send: Optional[Callable[[], None]] = None,
+    ) -> Any:
+        circuit = self._enter_circuit(method, path)
+        response = None
+        failed = None
+        try:
+            # Waiting for a slot is bounded by the current deadline.
+            if self.rate_limiter is not None and not await self.rate_limiter.acquire_async(
+                remaining()
+            ):
+                raise DeadlineExceededError()
+            http_client = self._current_http_client()
+            request = self._build_request(
+                http_client,
+                method,
+                path,
+                query=query,
+                body=body,
+                auth=auth if auth is not None else self._tenant_auth,
+            )
+            started = time.perf_counter()
+            if on_send is not None:
+                on_send()
+            left = remaining()
+            try:
+                if left is None:
+                    response = await http_client.send(request)
+                else:
+                    # httpx timeouts apply to each phase of the request, the
+                    # deadline to the whole of it.
+                    response = await asyncio.wait_for(http_client.send(request), left)
+            except asyncio.TimeoutError:
+                failed = False
+                raise DeadlineExceededError()
+            except TimeoutException:
+                error = self._timeout_error()
+                failed = not isinstance(error, DeadlineExceededError)
+                raise error
+            except TransportError:
+                failed = True
+                raise
+            finally:
+                self._record_request(request, response, started)
+            failed = response.status_code >= 500
+        finally:
+            self._exit_circuit(circuit, failed)
+        return self._parse_response(response, raw=raw)
+
+    def _current_http_client(self) -> AsyncClient:
+        """
+        Returns the connection pool to send requests with in the running
+        event loop.
+
+        Connections belong to the event loop they were opened in, so a pool
+        owned by the client is replaced by a new one when the client is used
+        from another loop, e.g. by successive `asyncio.run()` calls. Tenant
+        handles use the pool of their parent.
+        """
+
+        if self._parent is not None:
+            return self._parent._current_http_client()
+        if self._owns_http_client:
+            loop = asyncio.get_event_loop()
+            if self._loop is not loop:
+                if self._loop is not None:
+                    self.http_client = self._create_http_client(AsyncClient)
+                self._loop = loop
+        return self.http_client
+
+    @property
+    def _tenant_auth(self) -> Optional[str]:
+        # Tenant handles share a connection pool created without credentials,
+        # so their token has to be sent with each request.
+        return None if self._owns_http_client else self.auth
+
+    def tenant(self, auth: str) -> "NotionAsyncClient":
+        """
+        Returns a client authenticated with `auth` that shares this client's
+        connection pool, circuit breaker and hedging policy.
+
+        Handles are cached by token and each one keeps its own rate limiter,
+        metrics and identity map, since objects parsed for one token may
+        hold data another one cannot see. Closing a handle leaves the shared
+        pool open.
+        """
+
+        handle = self._tenants.get(auth)
+        if handle is None:
+            identity_map = None
+            if self.identity_map is not None:
+                identity_map = IdentityMap(max_size=self.identity_map.max_size)
+            handle = NotionAsyncClient(
+                auth=auth,
+                timeout=self.timeout,
+                base_url=str(self.base_url),
+                notion_version=self.notion_version,
+                user_agent=self.user_agent,
+                rate_limit=self.rate_limit,
+                priorities=self.priorities,
+                pool_size=self.pool_size,
+                keepalive_expiry=self.keepalive_expiry,
+                http2=self.http2,
+                circuit_breaker=self.circuit_breaker,
+                identity_map=identity_map,
+                hedging=self.hedging,
+                http_client=self.http_client,
+            )
+            handle._parent = self
+            self._tenants[auth] = handle
+        return handle
+
+    async def aclose(self) -> None:
+        if self._owns_http_client:
+            await self.http_client.aclose()
+
+    async def __aenter__(self) -> "NotionAsyncClient":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Iterator, List, Optional
+
+from notion.errors import DeadlineExceededError
+
+
+_deadline: ContextVar[Optional[float]] = ContextVar("notion_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """
+    Bounds the time taken by all the requests sent in the block, in the
+    current thread or task and the tasks it starts:
+
+        with deadline(2.0):
+            pages = collect_paginated_api(notion.databases.query, database_id=database_id)
+
+    The timeout of each request is shrunk to the time left, and requests
+    started once the deadline has passed raise `DeadlineExceededError`
+    without being sent. Nested deadlines can only shorten the budget.
+
+    httpx applies timeouts to each phase of a request, connecting, sending
+    and each read, so a request of `NotionClient` may run past the
+    deadline by a few times the time that was left. `NotionAsyncClient`
+    also cancels a request still running at the deadline.
+    """
+
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires if current is None else min(current, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """
+    Returns the number of seconds left before the current deadline, or
+    `None` without a deadline.
+    """
+
+    expires = _deadline.get()
+    if expires is None:
+        return None
+    return expires - time.monotonic()
+
+
+def check_deadline() -> None:
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError()
+
+
+async def gather(*awaitables: Awaitable[Any]) -> List[Any]:
+    """
+    Same as `asyncio.gather`, except that the first error cancels the
+    awaitables still running and waits for them before being raised, so
+    that a failed fan-out leaves no request in flight.
+    """
+
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
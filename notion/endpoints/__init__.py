@@ -1,17 +1,22 @@
-from notion.endpoints.asynchronous import (
-    BlocksAsyncEndpoint,
-    DatabasesAsyncEndpoint,
-    PagesAsyncEndpoint,
-    SearchAsyncEndpoint,
-    UsersAsyncEndpoint,
-)
-from notion.endpoints.sync import (
-    BlocksEndpoint,
-    DatabasesEndpoint,
-    PagesEndpoint,
-    SearchEndpoint,
-    UsersEndpoint,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+
+if TYPE_CHECKING:
+    from notion.endpoints.asynchronous import (
+        BlocksAsyncEndpoint,
+        DatabasesAsyncEndpoint,
+        PagesAsyncEndpoint,
+        SearchAsyncEndpoint,
+        UsersAsyncEndpoint,
+    )
+    from notion.endpoints.sync import (
+        BlocksEndpoint,
+        DatabasesEndpoint,
+        PagesEndpoint,
+        SearchEndpoint,
+        UsersEndpoint,
+    )
 
 
 __all__ = [
@@ -26,3 +31,18 @@ __all__ = [
     "SearchEndpoint",
     "UsersEndpoint",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in __all__:
+        raise AttributeError(
+            "module {module!r} has no attribute {name!r}".format(module=__name__, name=name)
+        )
+    module = "notion.endpoints.asynchronous" if "Async" in name else "notion.endpoints.sync"
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
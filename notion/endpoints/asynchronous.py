@@ -1,7 +1,27 @@
-from typing import TYPE_CHECKING, Any, Union
+from __future__ import annotations
 
-from notion.helpers import parse_block_obj, pick
-from notion.types import Block, BotUser, Database, Page, PaginatedList, PersonUser, User, UserType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Sequence, Union
+
+from notion.helpers import (
+    SkipSet,
+    paginated_list,
+    parse_block_obj,
+    parse_user_obj,
+    pick,
+    project_page,
+    project_pages,
+)
+from notion.types import (
+    Block,
+    BotUser,
+    Database,
+    Page,
+    PageOrDatabase,
+    PageRow,
+    PaginatedList,
+    PersonUser,
+    User,
+)
 
 
 if TYPE_CHECKING:
@@ -12,25 +32,49 @@ class AsyncEndpoint:
     def __init__(self, client: "NotionAsyncClient") -> None:
         self.client = client
 
+    def _parse(self, parse: Callable[[Dict], Any], response: Dict) -> Any:
+        if self.client.identity_map is None:
+            return parse(response)
+        return self.client.identity_map.parse(parse, response)
+
+    def _parse_write(self, parse: Callable[[Dict], Any], response: Dict) -> Any:
+        # The response of a write may have the version of the object before
+        # the write, since `last_edited_time` is rounded to the minute.
+        if self.client.identity_map is None:
+            return parse(response)
+        return self.client.identity_map.refresh(parse, response)
+
+    def _parse_list(
+        self, item_type: Any, response: Dict, skip: Optional[SkipSet] = None
+    ) -> PaginatedList:
+        if skip is not None:
+            response = skip.filter(response)
+        if self.client.identity_map is None:
+            return paginated_list(item_type).parse_obj(response)
+        return self.client.identity_map.parse_list(paginated_list(item_type), response)
+
 
 class BlocksChildrenAsyncEndpoint(AsyncEndpoint):
     async def append(self, block_id: str, **kwargs) -> PaginatedList[Block]:
-        return PaginatedList[Block].parse_obj(
+        return self._parse_list(
+            Block,
             await self.client.request(
                 path="blocks/{id}/children".format(id=block_id),
                 method="PATCH",
-                body=pick(kwargs, "children"),
-            )
+                body=pick(kwargs, "children", "after"),
+            ),
         )
 
     async def list(self, block_id: str, **kwargs) -> PaginatedList[Block]:
-        return PaginatedList[Block].parse_obj(
+        return self._parse_list(
+            Block,
             await self.client.request(
                 path="blocks/{id}/children".format(id=block_id),
                 method="GET",
                 auth=kwargs.get("auth", None),
                 query=pick(kwargs, "start_cursor", "page_size"),
-            )
+            ),
+            skip=kwargs.get("skip", None),
         )
 
 
@@ -40,16 +84,18 @@ class BlocksAsyncEndpoint(AsyncEndpoint):
         self.children = BlocksChildrenAsyncEndpoint(*args, **kwargs)
 
     async def retrieve(self, block_id: str, **kwargs) -> Block:
-        return parse_block_obj(
+        return self._parse(
+            parse_block_obj,
             await self.client.request(
                 path="blocks/{id}".format(id=block_id),
                 method="GET",
                 auth=kwargs.get("auth", None),
-            )
+            ),
         )
 
     async def update(self, block_id: str, **kwargs):
-        return parse_block_obj(
+        return self._parse_write(
+            parse_block_obj,
             await self.client.request(
                 path="blocks/{id}".format(id=block_id),
                 method="PATCH",
@@ -65,126 +111,169 @@ class BlocksAsyncEndpoint(AsyncEndpoint):
                     "toggle",
                     "to_do",
                 ),
-            )
+            ),
+        )
+
+    async def delete(self, block_id: str, **kwargs) -> Block:
+        return self._parse_write(
+            parse_block_obj,
+            await self.client.request(
+                path="blocks/{id}".format(id=block_id),
+                method="DELETE",
+                auth=kwargs.get("auth", None),
+            ),
         )
 
 
 class DatabasesAsyncEndpoint(AsyncEndpoint):
     async def create(self, **kwargs) -> Database:
-        return Database.parse_obj(
+        return self._parse_write(
+            Database.parse_obj,
             await self.client.request(
                 method="POST",
                 path="/databases",
                 auth=kwargs.get("auth", None),
                 body=pick(kwargs, "parent", "properties", "children", "icon", "cover"),
-            )
+            ),
         )
 
     async def list(self, **kwargs) -> PaginatedList[Database]:
-        return PaginatedList[Database].parse_obj(
+        return self._parse_list(
+            Database,
             await self.client.request(
                 method="GET",
                 path="/databases",
                 auth=kwargs.get("auth", None),
                 query=pick(kwargs, "start_cursor", "page_size"),
-            )
+            ),
+            skip=kwargs.get("skip", None),
         )
 
     async def query(self, database_id: str, **kwargs) -> PaginatedList[Page]:
-        return PaginatedList[Page].parse_obj(
+        return self._parse_list(
+            Page,
+            await self.client.request(
+                method="POST",
+                path="/databases/{id}/query".format(id=database_id),
+                auth=kwargs.get("auth", None),
+                body=pick(kwargs, "filter", "sorts", "start_cursor", "page_size"),
+            ),
+            skip=kwargs.get("skip", None),
+        )
+
+    async def query_rows(
+        self, database_id: str, properties: Sequence[str], **kwargs
+    ) -> PaginatedList[PageRow]:
+        return project_pages(
             await self.client.request(
                 method="POST",
                 path="/databases/{id}/query".format(id=database_id),
                 auth=kwargs.get("auth", None),
                 body=pick(kwargs, "filter", "sorts", "start_cursor", "page_size"),
-            )
+            ),
+            properties,
+            skip=kwargs.get("skip", None),
         )
 
     async def retrieve(self, database_id: str, **kwargs) -> Database:
-        return Database.parse_obj(
+        return self._parse(
+            Database.parse_obj,
             await self.client.request(
                 method="GET",
                 path="/databases/{id}".format(id=database_id),
                 auth=kwargs.get("auth", None),
-            )
+            ),
         )
 
     async def update(self, database_id: str, **kwargs) -> Database:
-        return Database.parse_obj(
+        return self._parse_write(
+            Database.parse_obj,
             await self.client.request(
                 method="PATCH",
                 path="/databases/{id}".format(id=database_id),
                 auth=kwargs.get("auth", None),
                 body=pick(kwargs, "properties", "title", "icon", "cover"),
-            )
+            ),
         )
 
 
 class PagesAsyncEndpoint(AsyncEndpoint):
     async def create(self, **kwargs) -> Page:
-        return Page.parse_obj(
+        return self._parse_write(
+            Page.parse_obj,
             await self.client.request(
                 method="POST",
                 path="/pages",
                 auth=kwargs.get("auth", None),
                 body=pick(kwargs, "parent", "properties", "children", "cover", "icon"),
-            )
+            ),
         )
 
     async def retrieve(self, page_id: str, **kwargs) -> Page:
-        return Page.parse_obj(
+        return self._parse(
+            Page.parse_obj,
             await self.client.request(
                 method="GET",
                 path="pages/{id}".format(id=page_id),
                 auth=kwargs.get("auth", None),
-            )
+            ),
+        )
+
+    async def retrieve_row(self, page_id: str, properties: Sequence[str], **kwargs) -> PageRow:
+        return project_page(
+            await self.client.request(
+                method="GET",
+                path="pages/{id}".format(id=page_id),
+                auth=kwargs.get("auth", None),
+            ),
+            properties,
         )
 
     async def update(self, page_id: str, **kwargs) -> Page:
-        return Page.parse_obj(
+        return self._parse_write(
+            Page.parse_obj,
             await self.client.request(
                 method="PATCH",
                 path="pages/{id}".format(id=page_id),
                 auth=kwargs.get("auth", None),
                 body=pick(kwargs, "archived", "properties", "cover", "icon"),
-            )
+            ),
         )
 
 
 class UsersAsyncEndpoint(AsyncEndpoint):
     async def list(self, **kwargs) -> PaginatedList[User]:
-        return PaginatedList[User].parse_obj(
+        return self._parse_list(
+            User,
             await self.client.request(
                 method="GET",
                 path="/users",
                 auth=kwargs.get("auth", None),
                 query=pick(kwargs, "start_cursor", "page_size"),
-            )
+            ),
+            skip=kwargs.get("skip", None),
         )
 
     async def retrieve(self, user_id: str, **kwargs) -> Union[BotUser, PersonUser]:
-        response = await self.client.request(
-            method="GET",
-            path="/users/{id}".format(id=user_id),
-            auth=kwargs.get("auth", None),
+        return self._parse(
+            parse_user_obj,
+            await self.client.request(
+                method="GET",
+                path="/users/{id}".format(id=user_id),
+                auth=kwargs.get("auth", None),
+            ),
         )
 
-        user_type = response.get("type", None)
-        if user_type == UserType.BOT:
-            return BotUser.parse_obj(response)
-        elif user_type == UserType.PERSON:
-            return PersonUser.parse_obj(response)
-        else:
-            raise ValueError("Could not decode User object with type {type}".format(type=user_type))
-
 
 class SearchAsyncEndpoint(AsyncEndpoint):
-    async def __call__(self, **kwargs) -> PaginatedList[Union[Page, Database]]:
-        return PaginatedList[Union[Page, Database]].parse_obj(
+    async def __call__(self, **kwargs) -> PaginatedList[PageOrDatabase]:
+        return self._parse_list(
+            PageOrDatabase,
             await self.client.request(
                 path="/search",
                 method="POST",
                 auth=kwargs.get("auth", None),
                 body=pick(kwargs, "query", "sort", "filter", "start_cursor", "page_size"),
-            )
+            ),
+            skip=kwargs.get("skip", None),
         )
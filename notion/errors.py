@@ -1,7 +1,7 @@
 from enum import Enum
-from typing import Optional
+from typing import Any, List, Optional
 
-from httpx import Headers, Response
+from httpx import Headers, Response, TransportError
 
 
 class APIErrorCode(str, Enum):
@@ -21,6 +21,8 @@ class APIErrorCode(str, Enum):
 class ClientErrorCode(str, Enum):
     REQUEST_TIMEOUT = "notionhq_client_request_timeout"
     RESPONSE_ERROR = "notionhq_client_response_error"
+    DEADLINE_EXCEEDED = "notionhq_client_deadline_exceeded"
+    CIRCUIT_OPEN = "notionhq_client_circuit_open"
 
 
 class RequestTimeoutError(Exception):
@@ -30,6 +32,31 @@ class RequestTimeoutError(Exception):
         super().__init__(message)
 
 
+class DeadlineExceededError(RequestTimeoutError):
+    code: ClientErrorCode = ClientErrorCode.DEADLINE_EXCEEDED
+    # Items collected before the deadline by the operation that was interrupted.
+    results: List[Any]
+
+    def __init__(self, message: str = "Deadline of the operation has been exceeded") -> None:
+        super().__init__(message)
+        self.results = []
+
+
+class CircuitOpenError(Exception):
+    code: ClientErrorCode = ClientErrorCode.CIRCUIT_OPEN
+    endpoint: str
+    retry_after: float
+
+    def __init__(self, endpoint: str, retry_after: float) -> None:
+        super().__init__(
+            "Circuit open for {endpoint} after repeated failures, retry in {delay:.1f}s".format(
+                endpoint=endpoint, delay=retry_after
+            )
+        )
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
 class HTTPResponseError(Exception):
     code: ClientErrorCode = ClientErrorCode.RESPONSE_ERROR
     status: int
@@ -53,3 +80,14 @@ class APIResponseError(HTTPResponseError):
 
 def is_api_error(code: str) -> bool:
     return isinstance(code, str) and code in (error.value for error in APIErrorCode)
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Returns whether a failed request may succeed if sent again later:
+    timeouts, connection errors, rate limits and server errors.
+    """
+
+    if isinstance(error, HTTPResponseError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (RequestTimeoutError, CircuitOpenError, TransportError))
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import re
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+from notion.helpers import pick
+from notion.sharedmemory import SharedMemoryRing, read_results
+from notion.types import Page
+
+
+if TYPE_CHECKING:
+    from notion.client import NotionAsyncClient
+
+
+Transform = Callable[[Dict[str, Any]], Any]
+
+_NEXT_CURSOR = re.compile(rb'"next_cursor"\s*:\s*(?:null|"([^"]*)")')
+
+
+def next_cursor(content: bytes) -> Optional[str]:
+    """
+    Reads the cursor of the next page from a raw list response without
+    decoding its results.
+
+    Top-level keys follow the results in API responses, so the last
+    `next_cursor` key is the one of the list.
+    """
+
+    match = _NEXT_CURSOR.match(content, max(content.rfind(b'"next_cursor"'), 0))
+    if match is None:
+        return json.loads(content).get("next_cursor", None)
+    cursor = match.group(1)
+    return cursor.decode() if cursor is not None else None
+
+
+def decode_results(content: bytes, transform: Optional[Transform] = None) -> List[Any]:
+    """
+    Decodes the results of a raw list response, applying `transform` to
+    each of them. Runs in the worker processes of `DatabaseExporter`.
+    """
+
+    results = json.loads(content)["results"]
+    if transform is None:
+        return results
+    return [transform(result) for result in results]
+
+
+class DatabaseExporter:
+    """
+    Exports databases with network I/O and decoding in separate processes.
+
+    Raw query responses are fetched by an async producer and decoded by a
+    pool of `processes` worker processes, which also apply `transform` to
+    each page: validation into `Page` models by default, or any picklable
+    function of a raw page, e.g. `functools.partial(project_page,
+    properties=("Name", "Status"))`. Results are yielded in the order of
+    the query, while the next responses are being fetched and decoded:
+
+        async with DatabaseExporter(processes=4) as exporter:
+            async for page in exporter.export(notion, database_id):
+                ...
+
+    Several exports, from different databases or clients authenticated
+    with different tokens, can run at the same time and share the pool.
+    Up to `prefetch` responses per export are decoded ahead of the
+    consumer.
+
+    With `ring_size`, responses are passed to the workers through a
+    `SharedMemoryRing` of that many bytes per export instead of being
+    pickled, see `notion.sharedmemory`. Responses larger than the ring
+    are still pickled.
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        transform: Optional[Transform] = Page.parse_obj,
+        prefetch: int = 4,
+        page_size: int = 100,
+        ring_size: Optional[int] = None,
+    ) -> None:
+        self.processes = processes
+        self.transform = transform
+        self.prefetch = prefetch
+        self.page_size = page_size
+        self.ring_size = ring_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    async def export(
+        self, client: "NotionAsyncClient", database_id: str, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        """
+        Yields the transformed pages of a database, optionally filtered and
+        sorted with the `filter` and `sorts` arguments of `databases.query`.
+        """
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.processes)
+        loop = asyncio.get_event_loop()
+        path = "databases/{id}/query".format(id=database_id)
+        body = {**pick(kwargs, "filter", "sorts"), "page_size": self.page_size}
+        ring = SharedMemoryRing(self.ring_size) if self.ring_size else None
+        # Decoding results, and whether their response is in the ring.
+        pending: Deque[Tuple["asyncio.Future[List[Any]]", bool]] = deque()
+        cursor = None
+        try:
+            while True:
+                if cursor:
+                    body["start_cursor"] = cursor
+                content = await client.request(
+                    "POST", path, auth=kwargs.get("auth", None), body=body, raw=True
+                )
+                shared = ring.write(content) if ring is not None else None
+                while shared is None and ring is not None and pending and ring.pending:
+                    # Results are consumed to free space in the ring.
+                    future, in_ring = pending.popleft()
+                    for result in await future:
+                        yield result
+                    if in_ring:
+                        ring.release()
+                    shared = ring.write(content)
+                if shared is not None:
+                    future = loop.run_in_executor(
+                        self._executor, read_results, shared, self.transform
+                    )
+                else:
+                    future = loop.run_in_executor(
+                        self._executor, decode_results, content, self.transform
+                    )
+                pending.append((future, shared is not None))
+                cursor = next_cursor(content)
+                while pending and (len(pending) > self.prefetch or not cursor):
+                    future, in_ring = pending.popleft()
+                    for result in await future:
+                        yield result
+                    if in_ring:
+                        ring.release()  # type: ignore
+                if not cursor:
+                    return
+        finally:
+            for future, _ in pending:
+                future.cancel()
+            if ring is not None:
+                ring.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def __aenter__(self) -> "DatabaseExporter":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.close()
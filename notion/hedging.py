@@ -0,0 +1,114 @@
+import threading
+import time
+
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from notion.breaker import endpoint_key
+
+
+class _Latencies:
+    __slots__ = ("samples", "delay", "stale")
+
+    def __init__(self, window: int) -> None:
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.delay: Optional[float] = None
+        self.stale = 0
+
+
+class HedgingPolicy:
+    """
+    Decides when `NotionAsyncClient` sends a second copy of a slow `GET`.
+
+    The hedging delay of an endpoint is the `percentile` of its latest
+    `window` response times, bounded by `min_delay` and `max_delay`, and
+    `max_delay` until `min_samples` responses have been seen. With the
+    default 95th percentile, about one request in twenty is hedged.
+
+    Hedges are sent through the rate limiter of the client like any other
+    request, and are limited twice so that they cannot use up the quota
+    when the API slows down as a whole: each request earns `budget` of a
+    hedge, e.g. 5 hedges per 100 requests, and at most `max_rate` hedges
+    are sent per second.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_delay: float = 0.05,
+        max_delay: float = 2.0,
+        budget: float = 0.05,
+        max_rate: float = 1.0,
+        window: int = 200,
+        min_samples: int = 20,
+    ) -> None:
+        if not 0 < percentile < 100:
+            raise ValueError("Percentile must be between 0 and 100.")
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.max_rate = max_rate
+        self.window = window
+        self.min_samples = min_samples
+        self.hedges = 0
+        self.wins = 0
+        self._endpoints: Dict[str, _Latencies] = {}
+        self._credit = 1.0
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def delay(self, method: str, path: str) -> float:
+        """
+        Returns the number of seconds to wait for a response before hedging
+        a request.
+        """
+
+        with self._lock:
+            latencies = self._endpoints.get(endpoint_key(method, path), None)
+            if latencies is None or len(latencies.samples) < self.min_samples:
+                return self.max_delay
+            # The percentile is computed again once the window has changed
+            # by a tenth, not on each request.
+            if latencies.delay is None or latencies.stale * 10 >= self.window:
+                samples = sorted(latencies.samples)
+                index = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+                latencies.delay = min(self.max_delay, max(self.min_delay, samples[index]))
+                latencies.stale = 0
+            return latencies.delay
+
+    def observe(self, method: str, path: str, elapsed: float, censored: bool = False) -> None:
+        """
+        Records the latency of a request. A `censored` sample is the time a
+        request cancelled before its response had been running, a lower
+        bound of its latency, and does not earn hedging budget.
+        """
+
+        key = endpoint_key(method, path)
+        with self._lock:
+            latencies = self._endpoints.get(key, None)
+            if latencies is None:
+                latencies = self._endpoints[key] = _Latencies(self.window)
+            latencies.samples.append(elapsed)
+            latencies.stale += 1
+            if not censored:
+                self._credit = min(self._credit + self.budget, max(1.0, self.budget * self.window))
+
+    def acquire(self) -> bool:
+        """
+        Takes a hedge from the budget and rate cap, returning `False` when
+        none is left.
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            burst = max(1.0, self.max_rate)
+            self._tokens = min(burst, self._tokens + (now - self._updated) * self.max_rate)
+            self._updated = now
+            if self._credit < 1 or self._tokens < 1:
+                return False
+            self._credit -= 1
+            self._tokens -= 1
+            self.hedges += 1
+            return True
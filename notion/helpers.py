@@ -1,6 +1,36 @@
-from typing import Any, Dict
+import hashlib
+import json
 
-from notion.types import BLOCK_MAPPING, Block
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Type,
+    Union,
+)
+
+from pydantic.datetime_parse import parse_datetime
+
+from notion.errors import DeadlineExceededError
+from notion.types import (
+    BLOCK_MAPPING,
+    PROPERTY_VALUE_MAPPING,
+    Block,
+    BotUser,
+    PageRow,
+    PaginatedList,
+    PersonUser,
+    PropertyValue,
+    UserType,
+)
 
 
 def pick(base: Dict[str, Any], *keys: str) -> Dict[str, Any]:
@@ -12,8 +42,218 @@ def pick(base: Dict[str, Any], *keys: str) -> Dict[str, Any]:
     return {key: base[key] for key in keys if key in base and base[key] is not None}
 
 
+_PAGINATED_LISTS: Dict[Any, Type[PaginatedList]] = {}
+
+
+def paginated_list(item_type: Any) -> Type[PaginatedList]:
+    """
+    Returns the `PaginatedList` model specialized for `item_type`.
+
+    Specializations are built on first use and then reused, so that
+    endpoints skip pydantic generic machinery on every call.
+    """
+
+    model = _PAGINATED_LISTS.get(item_type, None)
+    if model is None:
+        model = _PAGINATED_LISTS[item_type] = PaginatedList[item_type]
+    return model
+
+
 def parse_block_obj(response: Dict) -> Block:
     block_type = response.get("type", None)
     if block_type is None or block_type not in BLOCK_MAPPING:
         raise ValueError("Block type not supported. Please, check notion-sdk updates.")
     return BLOCK_MAPPING[block_type].parse_obj(response)
+
+
+def parse_user_obj(response: Dict) -> Union[BotUser, PersonUser]:
+    user_type = response.get("type", None)
+    if user_type == UserType.BOT:
+        return BotUser.parse_obj(response)
+    elif user_type == UserType.PERSON:
+        return PersonUser.parse_obj(response)
+    else:
+        raise ValueError("Could not decode User object with type {type}".format(type=user_type))
+
+
+def parse_property_value(response: Dict) -> Optional[PropertyValue]:
+    """
+    Decodes a single page property value with the model matching its type.
+
+    Property types without a model are returned as is.
+    """
+
+    if response is None:
+        return None
+    model = PROPERTY_VALUE_MAPPING.get(response.get("type", None))
+    if model is None:
+        return response
+    return model.parse_obj(response)
+
+
+def project_page(response: Dict, properties: Sequence[str]) -> PageRow:
+    """
+    Builds a `PageRow` from a raw page object, decoding only the given
+    properties and skipping all the others.
+    """
+
+    values = response["properties"]
+    return PageRow(
+        id=response["id"],
+        last_edited_time=parse_datetime(response["last_edited_time"]),
+        values=tuple(parse_property_value(values.get(name, None)) for name in properties),
+    )
+
+
+def project_pages(
+    response: Dict, properties: Sequence[str], skip: Optional["SkipSet"] = None
+) -> PaginatedList[PageRow]:
+    if skip is not None:
+        response = skip.filter(response)
+    return paginated_list(PageRow).construct(
+        results=[project_page(page, properties) for page in response["results"]],
+        has_more=response["has_more"],
+        next_cursor=response.get("next_cursor", None),
+    )
+
+
+def fingerprint(response: Dict) -> str:
+    """
+    Returns a stable hash of an object, over its ID, last edited time,
+    archived flag and properties, or whole content for objects without
+    properties. Two versions of a page with the same properties have the
+    same fingerprint.
+    """
+
+    content = response.get("properties", response)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(
+        "{id}\0{time}\0{archived}\0".format(
+            id=response.get("id", None),
+            time=response.get("last_edited_time", None),
+            archived=response.get("archived", None),
+        ).encode()
+    )
+    digest.update(json.dumps(content, sort_keys=True, separators=(",", ":")).encode())
+    return digest.hexdigest()
+
+
+class SkipSet:
+    """
+    Fingerprints of the objects processed by a previous sync, whose
+    unchanged versions are dropped from list responses before they are
+    parsed:
+
+        skip = SkipSet(load_fingerprints())
+        for page in iterate_paginated_api(notion.databases.query, database_id=id, skip=skip):
+            process(page)
+        save_fingerprints(skip.seen)
+
+    `seen` holds the fingerprints of all the objects received, skipped or
+    not, to be passed to the next sync. Endpoint methods returning lists
+    accept it as `skip` argument.
+
+    Skipped objects are missing from the results, so deleted objects
+    cannot be told apart from unchanged ones by the output of
+    `iterate_paginated_api`: compare the IDs of the objects received,
+    `ids`, with the ones of the previous sync instead.
+    """
+
+    def __init__(self, fingerprints: Iterable[str] = ()) -> None:
+        self.fingerprints = set(fingerprints)
+        self.seen: Set[str] = set()
+        self.ids: Set[str] = set()
+        self.skipped = 0
+
+    def __contains__(self, value: object) -> bool:
+        return value in self.fingerprints
+
+    def filter(self, response: Dict) -> Dict:
+        """
+        Returns a list response without the results already processed.
+        """
+
+        results = []
+        for result in response["results"]:
+            value = fingerprint(result)
+            self.seen.add(value)
+            self.ids.add(result["id"])
+            if value in self.fingerprints:
+                self.skipped += 1
+            else:
+                results.append(result)
+        return {**response, "results": results}
+
+
+def iterate_paginated_api(function: Callable[..., Any], **kwargs: Any) -> Iterator[Any]:
+    """
+    Yields the results of a paginated endpoint method, like
+    `databases.query`, fetching the next page when the previous one has
+    been consumed. Results in a `skip` argument, see `SkipSet`, are
+    dropped before being parsed, and deletions can only be detected from
+    its `ids`.
+    """
+
+    cursor = None
+    while True:
+        response = function(**kwargs, start_cursor=cursor) if cursor else function(**kwargs)
+        yield from response.results
+        if not response.has_more:
+            return
+        cursor = response.next_cursor
+
+
+def collect_paginated_api(function: Callable[..., Any], **kwargs: Any) -> List[Any]:
+    """
+    Returns all the results of a paginated endpoint method.
+
+    When the current `deadline` is exceeded, the results collected so far
+    are available in the `results` attribute of `DeadlineExceededError`.
+    """
+
+    results: List[Any] = []
+    try:
+        results.extend(iterate_paginated_api(function, **kwargs))
+    except DeadlineExceededError as error:
+        error.results = results
+        raise
+    return results
+
+
+async def async_iterate_paginated_api(
+    function: Callable[..., Awaitable[Any]], **kwargs: Any
+) -> AsyncIterator[Any]:
+    """
+    Same as `iterate_paginated_api` for the endpoint methods of
+    `NotionAsyncClient`.
+    """
+
+    cursor = None
+    while True:
+        if cursor:
+            response = await function(**kwargs, start_cursor=cursor)
+        else:
+            response = await function(**kwargs)
+        for result in response.results:
+            yield result
+        if not response.has_more:
+            return
+        cursor = response.next_cursor
+
+
+async def async_collect_paginated_api(
+    function: Callable[..., Awaitable[Any]], **kwargs: Any
+) -> List[Any]:
+    """
+    Same as `collect_paginated_api` for the endpoint methods of
+    `NotionAsyncClient`.
+    """
+
+    results: List[Any] = []
+    try:
+        async for result in async_iterate_paginated_api(function, **kwargs):
+            results.append(result)
+    except DeadlineExceededError as error:
+        error.results = results
+        raise
+    return results
@@ -0,0 +1,125 @@
+import threading
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar
+
+
+if TYPE_CHECKING:
+    from notion.types import PaginatedList
+
+
+T = TypeVar("T")
+
+
+def _key(response: Dict[str, Any]) -> Optional[Tuple[Any, str]]:
+    # A page and its child_page block, like a database and its
+    # child_database block, share their ID and last edited time.
+    key = response.get("id", None)
+    return (response.get("object", None), key) if key is not None else None
+
+
+def _version(response: Dict[str, Any]) -> Any:
+    # Objects without a last edited time, like users, are compared whole.
+    return response.get("last_edited_time", None) or response
+
+
+class IdentityMap:
+    """
+    Session-level map of the objects parsed by a client, keyed by object
+    type and ID.
+
+    An object received again with the same `last_edited_time` is not
+    validated again: the instance parsed the first time is returned, so
+    that long-running processes hold a single copy of each page, database,
+    block or user. Objects without a last edited time are reused when
+    their JSON is equal.
+
+    Pass it to a client with the `identity_map` option. Instances are
+    shared by all the responses in which they appear and must not be
+    modified. The `max_size` objects used most recently are kept. Only
+    share a map between clients using the same token: an object parsed
+    for one integration may hold data that another one cannot see.
+
+    `last_edited_time` is rounded to the minute by the API: an edit made
+    by another client within the same minute as the version already
+    parsed is only seen once the object is edited again. Responses of the
+    writes of the client are always parsed, see `refresh`.
+    """
+
+    def __init__(self, max_size: int = 10000) -> None:
+        self.max_size = max_size
+        # Number of objects reused and parsed.
+        self.hits = 0
+        self.misses = 0
+        self._objects: "OrderedDict[Tuple[Any, str], Tuple[Any, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def get(self, response: Dict[str, Any]) -> Optional[Any]:
+        """
+        Returns the instance parsed from an object with the same type, ID
+        and version as `response`, if any.
+        """
+
+        key = _key(response)
+        with self._lock:
+            entry = self._objects.get(key, None) if key is not None else None
+            if entry is None or entry[0] != _version(response):
+                self.misses += 1
+                return None
+            self._objects.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, response: Dict[str, Any], instance: T) -> T:
+        key = _key(response)
+        if key is None:
+            return instance
+        with self._lock:
+            self._objects[key] = (_version(response), instance)
+            self._objects.move_to_end(key)
+            while len(self._objects) > self.max_size:
+                self._objects.popitem(last=False)
+        return instance
+
+    def parse(self, parse: Callable[[Dict[str, Any]], T], response: Dict[str, Any]) -> T:
+        """
+        Returns the known instance of `response`, or parses it with `parse`.
+        """
+
+        instance = self.get(response)
+        if instance is None:
+            instance = self.put(response, parse(response))
+        return instance
+
+    def refresh(self, parse: Callable[[Dict[str, Any]], T], response: Dict[str, Any]) -> T:
+        """
+        Parses `response` with `parse` and replaces the known instance, for
+        the responses of writes, which may have the same version as the
+        object before the write.
+        """
+
+        return self.put(response, parse(response))
+
+    def parse_list(self, model: "Type[PaginatedList]", response: Dict[str, Any]) -> "PaginatedList":
+        """
+        Parses a list response with `model`, only validating the results
+        that are not known.
+        """
+
+        results = response.get("results", None) or []
+        instances: List[Any] = [self.get(result) for result in results]
+        misses = [result for result, instance in zip(results, instances) if instance is None]
+        parsed = model.parse_obj({**response, "results": misses})
+        fresh = iter(parsed.results)
+        for index, result in enumerate(results):
+            if instances[index] is None:
+                instances[index] = self.put(result, next(fresh))
+        parsed.results = instances
+        return parsed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._objects.clear()
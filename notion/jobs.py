@@ -0,0 +1,406 @@
+import asyncio
+import inspect
+import json
+import sqlite3
+import time
+
+from contextlib import contextmanager
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from httpx import ConnectError
+
+from notion.errors import CircuitOpenError, HTTPResponseError, is_retryable
+
+
+if TYPE_CHECKING:
+    from notion.client import NotionAsyncClient, NotionClient
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    # Sent by a run that stopped before its result was saved, and not safe
+    # to send again without a reconcile hook.
+    UNKNOWN = "unknown"
+
+
+class Job(NamedTuple):
+    key: str
+    method: str
+    path: str
+    body: Optional[Dict[str, Any]]
+    attempts: int
+
+
+Reconcile = Callable[[Job], Union[Optional[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]]
+_Outcome = Tuple[Job, Optional[Dict[str, Any]], Optional[Exception]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    path TEXT NOT NULL,
+    body TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    updated REAL NOT NULL,
+    not_before REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+"""
+
+
+def is_idempotent(method: str, path: str) -> bool:
+    """
+    Returns whether sending a request twice has the same effect as sending
+    it once. Creating pages and appending blocks are not idempotent.
+    """
+
+    if method in ("GET", "DELETE"):
+        return True
+    return method == "PATCH" and not path.rstrip("/").endswith("/children")
+
+
+def _not_sent(error: Exception) -> bool:
+    """
+    Returns whether a failed request is known not to have been applied:
+    rate limited, refused by the circuit breaker, or without a connection.
+    Timeouts and server errors may happen after the request was applied.
+    """
+
+    if isinstance(error, HTTPResponseError):
+        return error.status == 429
+    return isinstance(error, (CircuitOpenError, ConnectError))
+
+
+def _retry_after(error: Exception) -> float:
+    if isinstance(error, CircuitOpenError):
+        return error.retry_after
+    if isinstance(error, HTTPResponseError):
+        try:
+            return float(error.headers.get("Retry-After", 0))
+        except ValueError:
+            return 0.0
+    return 0.0
+
+
+def _result(response: Any) -> Optional[Dict[str, Any]]:
+    # Only the identity of created objects is kept, not whole responses.
+    if isinstance(response, dict) and "id" in response:
+        return {"object": response.get("object", None), "id": response["id"]}
+    return None
+
+
+class JobQueue:
+    """
+    Durable queue of API requests stored in a SQLite database at `path`,
+    for bulk operations that must survive a restart of the process.
+
+    Each job has an idempotency key: adding a job whose key is already in
+    the queue does nothing, so the producer can be run again from the start
+    after a crash. Jobs are sent in chunks of `batch_size` and the outcome
+    of each chunk is saved before the next one is started:
+
+        with JobQueue("import.sqlite") as queue:
+            queue.put_many(
+                (row["id"], "POST", "pages", builder.build(row)) for row in rows
+            )
+            queue.run(notion)
+
+    Jobs failing with a retryable error are sent again by a later chunk,
+    up to `max_attempts` times, after a delay doubling from `retry_delay`
+    seconds, or the `Retry-After` of the response if longer. Jobs of a
+    chunk that was interrupted may or may not have been applied: on the
+    next run, they are passed to the `reconcile` hook, which returns the
+    result of the job when it finds it was applied, e.g. by querying the
+    page created with the key in a property, or `None` to send it again.
+    Without a hook, idempotent jobs are sent again and the others are
+    marked `unknown`, never duplicated.
+
+    The same goes for jobs that are not idempotent failing with a timeout,
+    a connection error or a server error during a run: only rate limits,
+    open circuits and refused connections prove that such a job was not
+    applied, and let it be sent again without a hook.
+    """
+
+    def __init__(
+        self, path: str, max_attempts: int = 5, batch_size: int = 100, retry_delay: float = 1.0
+    ) -> None:
+        self.path = path
+        self.max_attempts = max_attempts
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self._connection = sqlite3.connect(path, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def put(self, key: str, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Adds a job, and returns `False` if a job with the same key exists.
+        """
+
+        return self.put_many(((key, method, path, body),)) == 1
+
+    def put_many(self, jobs: Iterable[Tuple[str, str, str, Optional[Dict[str, Any]]]]) -> int:
+        """
+        Adds `(key, method, path, body)` jobs in a single transaction, and
+        returns the number of new jobs.
+        """
+
+        now = time.time()
+        with self._transaction():
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO jobs (key, method, path, body, status, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        key,
+                        method,
+                        path,
+                        json.dumps(body) if body is not None else None,
+                        JobStatus.PENDING.value,
+                        now,
+                    )
+                    for key, method, path, body in jobs
+                ),
+            )
+            return self._connection.total_changes - before
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+
+    def results(self) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Yields the key and result of the jobs done, e.g. the ID of each
+        created page.
+        """
+
+        for key, result in self._connection.execute(
+            "SELECT key, result FROM jobs WHERE status = ? ORDER BY rowid",
+            (JobStatus.DONE.value,),
+        ):
+            yield key, json.loads(result) if result is not None else None
+
+    def requeue(self, status: str = JobStatus.FAILED) -> int:
+        """
+        Sends the jobs with the given status again on the next run.
+        """
+
+        with self._transaction():
+            return self._connection.execute(
+                "UPDATE jobs SET status = ?, attempts = 0, updated = ?, not_before = 0 "
+                "WHERE status = ?",
+                (JobStatus.PENDING.value, time.time(), JobStatus(status).value),
+            ).rowcount
+
+    def run(self, client: "NotionClient", reconcile: Optional[Reconcile] = None) -> Dict[str, int]:
+        """
+        Sends the pending jobs on the thread pool of the client, see
+        `NotionClient.map`, and returns the counts of jobs by status.
+        """
+
+        self._reconcile(self._interrupted(), reconcile)
+
+        def send(job: Job) -> _Outcome:
+            try:
+                return job, _result(client.request(job.method, job.path, body=job.body)), None
+            except Exception as error:
+                return job, None, error
+
+        while True:
+            jobs = self._claim()
+            if jobs:
+                self._reconcile(self._save(client.map(send, jobs)), reconcile)
+                continue
+            delay = self._next_delay()
+            if delay is None:
+                return self.counts()
+            time.sleep(delay)
+
+    async def run_async(
+        self,
+        client: "NotionAsyncClient",
+        reconcile: Optional[Reconcile] = None,
+        concurrency: int = 10,
+    ) -> Dict[str, int]:
+        """
+        Same as `run`, sending up to `concurrency` jobs at the same time.
+        `reconcile` may be a coroutine function.
+        """
+
+        await self._reconcile_async(self._interrupted(), reconcile)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send(job: Job) -> _Outcome:
+            async with semaphore:
+                try:
+                    response = await client.request(job.method, job.path, body=job.body)
+                    return job, _result(response), None
+                except Exception as error:
+                    return job, None, error
+
+        while True:
+            jobs = self._claim()
+            if jobs:
+                outcomes = await asyncio.gather(*(send(job) for job in jobs))
+                await self._reconcile_async(self._save(outcomes), reconcile)
+                continue
+            delay = self._next_delay()
+            if delay is None:
+                return self.counts()
+            await asyncio.sleep(delay)
+
+    def _reconcile(self, jobs: List[Job], reconcile: Optional[Reconcile]) -> None:
+        for job in jobs:
+            if reconcile is None:
+                self._recover(job, None, reconciled=False)
+            else:
+                self._recover(job, reconcile(job), reconciled=True)  # type: ignore
+
+    async def _reconcile_async(self, jobs: List[Job], reconcile: Optional[Reconcile]) -> None:
+        for job in jobs:
+            if reconcile is None:
+                self._recover(job, None, reconciled=False)
+                continue
+            result = reconcile(job)
+            if inspect.isawaitable(result):
+                result = await result
+            self._recover(job, result, reconciled=True)  # type: ignore
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+    def _jobs(self, query: str, *parameters: Any) -> List[Job]:
+        return [
+            Job(key, method, path, json.loads(body) if body is not None else None, attempts)
+            for key, method, path, body, attempts in self._connection.execute(
+                "SELECT key, method, path, body, attempts FROM jobs " + query, parameters
+            )
+        ]
+
+    def _interrupted(self) -> List[Job]:
+        return self._jobs("WHERE status = ? ORDER BY rowid", JobStatus.RUNNING.value)
+
+    def _recover(self, job: Job, result: Optional[Dict[str, Any]], reconciled: bool) -> None:
+        if result is not None:
+            status = JobStatus.DONE
+        elif reconciled or is_idempotent(job.method, job.path):
+            status = JobStatus.PENDING
+        else:
+            status = JobStatus.UNKNOWN
+        with self._transaction():
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, updated = ? WHERE key = ?",
+                (
+                    status.value,
+                    json.dumps(_result(result) or result) if result is not None else None,
+                    time.time(),
+                    job.key,
+                ),
+            )
+
+    def _claim(self) -> List[Job]:
+        # Jobs are marked as running, and their attempt counted, before
+        # being sent, so that a crash leaves them to be reconciled.
+        with self._transaction():
+            jobs = self._jobs(
+                "WHERE status = ? AND not_before <= ? ORDER BY rowid LIMIT ?",
+                JobStatus.PENDING.value,
+                time.time(),
+                self.batch_size,
+            )
+            self._connection.executemany(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, updated = ? WHERE key = ?",
+                ((JobStatus.RUNNING.value, time.time(), job.key) for job in jobs),
+            )
+        return [job._replace(attempts=job.attempts + 1) for job in jobs]
+
+    def _next_delay(self) -> Optional[float]:
+        """
+        Returns how long to wait for the next pending job to be due, or
+        `None` when no job is pending.
+        """
+
+        (not_before,) = self._connection.execute(
+            "SELECT MIN(not_before) FROM jobs WHERE status = ?", (JobStatus.PENDING.value,)
+        ).fetchone()
+        if not_before is None:
+            return None
+        return max(0.0, not_before - time.time())
+
+    def _save(self, outcomes: Iterable[_Outcome]) -> List[Job]:
+        """
+        Saves the outcomes of a chunk, and returns the jobs that may or may
+        not have been applied, left running to be reconciled.
+        """
+
+        now = time.time()
+        rows = []
+        unsure = []
+        for job, result, error in outcomes:
+            not_before = 0.0
+            if error is not None and is_retryable(error):
+                not_before = now + max(
+                    self.retry_delay * 2 ** (job.attempts - 1), _retry_after(error)
+                )
+            if error is None:
+                status, detail = JobStatus.DONE, json.dumps(result) if result else None
+            elif not is_retryable(error):
+                status, detail = JobStatus.FAILED, None
+            elif not is_idempotent(job.method, job.path) and not _not_sent(error):
+                if job.attempts < self.max_attempts:
+                    status, detail = JobStatus.RUNNING, None
+                    unsure.append(job)
+                else:
+                    status, detail = JobStatus.UNKNOWN, None
+            elif job.attempts < self.max_attempts:
+                status, detail = JobStatus.PENDING, None
+            else:
+                status, detail = JobStatus.FAILED, None
+            rows.append(
+                (status.value, detail, str(error) if error else None, now, not_before, job.key)
+            )
+        with self._transaction():
+            self._connection.executemany(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated = ?, not_before = ? "
+                "WHERE key = ?",
+                rows,
+            )
+        return unsure
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "JobQueue":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
@@ -0,0 +1,55 @@
+import threading
+
+from typing import Callable, List, NamedTuple, Optional
+
+
+class RequestRecord(NamedTuple):
+    method: str
+    path: str
+    status: Optional[int]
+    elapsed: float
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    bytes_decoded: int = 0
+
+
+class ClientMetrics:
+    """
+    Counters collected by a client for every request it sends.
+
+    Listeners registered with `subscribe` receive a `RequestRecord`
+    for each request, which can be forwarded to any monitoring system.
+    `bytes_received` counts response bodies as transferred on the wire,
+    `bytes_decoded` counts them once decompressed.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.elapsed = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        self._listeners: List[Callable[[RequestRecord], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def compression_ratio(self) -> float:
+        if not self.bytes_received:
+            return 1.0
+        return self.bytes_decoded / self.bytes_received
+
+    def subscribe(self, listener: Callable[[RequestRecord], None]) -> None:
+        self._listeners.append(listener)
+
+    def record(self, record: RequestRecord) -> None:
+        with self._lock:
+            self.requests += 1
+            self.elapsed += record.elapsed
+            self.bytes_sent += record.bytes_sent
+            self.bytes_received += record.bytes_received
+            self.bytes_decoded += record.bytes_decoded
+            if record.status is None or record.status >= 400:
+                self.errors += 1
+        for listener in self._listeners:
+            listener(record)
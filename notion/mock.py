@@ -0,0 +1,616 @@
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import uuid
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from httpx import MockTransport, Request, Response
+
+
+ERROR_CODES = {
+    400: "validation_error",
+    404: "object_not_found",
+    409: "conflict_error",
+    429: "rate_limited",
+    500: "internal_server_error",
+    503: "service_unavailable",
+}
+
+MAX_PAGE_SIZE = 100
+
+_Route = Tuple[str, "re.Pattern[str]", Callable[..., Response]]
+
+
+def _timestamp(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _rich_text(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    rich_text = []
+    for item in items:
+        text = item.get("text", {})
+        rich_text.append(
+            {
+                "type": "text",
+                "text": {"content": text.get("content", ""), "link": text.get("link", None)},
+                "plain_text": text.get("content", ""),
+                "href": None,
+                "annotations": {
+                    "bold": False,
+                    "italic": False,
+                    "strikethrough": False,
+                    "underline": False,
+                    "code": False,
+                    "color": "default",
+                    **item.get("annotations", {}),
+                },
+            }
+        )
+    return rich_text
+
+
+def _text(content: str) -> List[Dict[str, Any]]:
+    return _rich_text([{"text": {"content": content}}])
+
+
+def _instant(value: str) -> datetime:
+    if len(value) == 10:
+        value += "T00:00:00+00:00"
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _plain_text(items: List[Dict[str, Any]]) -> str:
+    return "".join(item.get("plain_text", "") for item in items)
+
+
+def _property_value(page: Dict[str, Any], kind: str, name: Optional[str]) -> Any:
+    if kind in ("created_time", "last_edited_time") and (
+        name is None or name not in page["properties"]
+    ):
+        return page[kind]
+    value = page["properties"].get(name, None)
+    if value is None:
+        return None
+    content = value.get(kind, None)
+    if kind in ("title", "rich_text"):
+        return _plain_text(content or [])
+    if kind == "select":
+        return content["name"] if content else None
+    if kind == "multi_select":
+        return [option["name"] for option in content or []]
+    if kind == "date":
+        return content["start"] if content else None
+    return content
+
+
+def _matches_condition(value: Any, kind: str, condition: Dict[str, Any]) -> bool:
+    operator, operand = next(iter(condition.items()))
+    if operator == "is_empty":
+        return value in (None, "", [])
+    if operator == "is_not_empty":
+        return value not in (None, "", [])
+    if kind == "multi_select":
+        if operator == "contains":
+            return operand in value
+        if operator == "does_not_contain":
+            return operand not in value
+    elif kind in ("date", "created_time", "last_edited_time"):
+        if value is None:
+            return False
+        instant, bound = _instant(value), _instant(operand)
+        comparisons = {
+            "equals": instant == bound,
+            "before": instant < bound,
+            "after": instant > bound,
+            "on_or_before": instant <= bound,
+            "on_or_after": instant >= bound,
+        }
+        if operator in comparisons:
+            return comparisons[operator]
+    else:
+        if operator == "equals":
+            return value == operand
+        if operator == "does_not_equal":
+            return value != operand
+        if operator == "contains" and kind in ("title", "rich_text"):
+            return operand in (value or "")
+        if operator in ("greater_than", "less_than") and value is not None:
+            return value > operand if operator == "greater_than" else value < operand
+    raise ValueError("Unsupported filter condition {condition}".format(condition=condition))
+
+
+def _matches(page: Dict[str, Any], query_filter: Dict[str, Any]) -> bool:
+    """
+    Evaluates a `databases.query` filter on a page. Supports compound
+    filters, timestamps and the common conditions of text, number,
+    checkbox, select, multi-select and date properties.
+    """
+
+    if "and" in query_filter:
+        return all(_matches(page, item) for item in query_filter["and"])
+    if "or" in query_filter:
+        return any(_matches(page, item) for item in query_filter["or"])
+    name = query_filter.get("property", None)
+    kind = query_filter.get("timestamp", None) or next(
+        key for key in query_filter if key != "property"
+    )
+    return _matches_condition(_property_value(page, kind, name), kind, query_filter[kind])
+
+
+class MockNotionServer:
+    """
+    In-process stand-in for the Notion API.
+
+    It answers the requests of `NotionClient` and `NotionAsyncClient` from
+    in-memory objects, so that code using the client can be exercised and
+    measured without network access:
+
+        server = MockNotionServer(latency=0.05)
+        database_id = server.add_database(rows=10_000, columns=40)
+        notion = NotionClient(auth="token", transport=server.transport())
+
+    Responses are paginated like the real API. `latency` (plus a random
+    `jitter`) is added to every response, and `error_rate` replaces that
+    share of responses with errors picked from `error_statuses`, on top of
+    the ones queued with `fail_next`. With `round_timestamps`, timestamps
+    are truncated to the minute like the ones of the API.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Tuple[int, ...] = (429, 500, 503),
+        seed: int = 0,
+        round_timestamps: bool = False,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.round_timestamps = round_timestamps
+        self.databases: Dict[str, Dict[str, Any]] = {}
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.blocks: Dict[str, Dict[str, Any]] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.users: Dict[str, Dict[str, Any]] = {}
+        self.requests: List[Tuple[str, str]] = []
+        self._failures: List[int] = []
+        self._lock = threading.RLock()
+        self._random = random.Random(seed)
+        self._clock = datetime(2021, 1, 1, tzinfo=timezone.utc)
+        self._routes: List[_Route] = [
+            ("GET", re.compile(r"/v1/blocks/([^/]+)/children"), self._list_children),
+            ("PATCH", re.compile(r"/v1/blocks/([^/]+)/children"), self._append_children),
+            ("GET", re.compile(r"/v1/blocks/([^/]+)"), self._retrieve_block),
+            ("PATCH", re.compile(r"/v1/blocks/([^/]+)"), self._update_block),
+            ("DELETE", re.compile(r"/v1/blocks/([^/]+)"), self._delete_block),
+            ("GET", re.compile(r"/v1/databases"), self._list_databases),
+            ("POST", re.compile(r"/v1/databases"), self._create_database),
+            ("POST", re.compile(r"/v1/databases/([^/]+)/query"), self._query_database),
+            ("GET", re.compile(r"/v1/databases/([^/]+)"), self._retrieve_database),
+            ("PATCH", re.compile(r"/v1/databases/([^/]+)"), self._update_database),
+            ("POST", re.compile(r"/v1/pages"), self._create_page),
+            ("GET", re.compile(r"/v1/pages/([^/]+)"), self._retrieve_page),
+            ("PATCH", re.compile(r"/v1/pages/([^/]+)"), self._update_page),
+            ("GET", re.compile(r"/v1/users"), self._list_users),
+            ("GET", re.compile(r"/v1/users/([^/]+)"), self._retrieve_user),
+            ("POST", re.compile(r"/v1/search"), self._search),
+        ]
+
+    def transport(self) -> MockTransport:
+        return MockTransport(self.handle)
+
+    def async_transport(self) -> MockTransport:
+        return MockTransport(self.handle_async)
+
+    def fail_next(self, status: int, count: int = 1) -> None:
+        self._failures.extend([status] * count)
+
+    def handle(self, request: Request) -> Response:
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        return self._dispatch(request)
+
+    async def handle_async(self, request: Request) -> Response:
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return self._dispatch(request)
+
+    def _delay(self) -> float:
+        return self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def _dispatch(self, request: Request) -> Response:
+        # Requests of threads sharing a client are handled one at a time.
+        with self._lock:
+            return self._route(request)
+
+    def _route(self, request: Request) -> Response:
+        self.requests.append((request.method, request.url.path))
+        if self._failures:
+            return self._error(self._failures.pop(0))
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self._error(self._random.choice(self.error_statuses))
+
+        for method, pattern, handler in self._routes:
+            match = pattern.fullmatch(request.url.path)
+            if method == request.method and match:
+                body = json.loads(request.content) if request.content else {}
+                return handler(request, body, *match.groups())
+        return self._error(400, "Invalid request URL.", code="invalid_request_url")
+
+    def _error(self, status: int, message: str = "", code: Optional[str] = None) -> Response:
+        headers = {"Retry-After": "1"} if status == 429 else {}
+        return Response(
+            status,
+            headers=headers,
+            json={
+                "object": "error",
+                "status": status,
+                "code": code or ERROR_CODES.get(status, "internal_server_error"),
+                "message": message or "Mock error {status}.".format(status=status),
+            },
+        )
+
+    def _not_found(self, object_id: str) -> Response:
+        return self._error(404, "Could not find object with ID: {id}.".format(id=object_id))
+
+    def _new_id(self) -> str:
+        return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
+    def _tick(self) -> str:
+        self._clock += timedelta(seconds=1)
+        if self.round_timestamps:
+            return _timestamp(self._clock.replace(second=0))
+        return _timestamp(self._clock)
+
+    def _paginate(self, request: Request, body: Dict, items: List[Dict]) -> Response:
+        params = {**request.url.params, **body}
+        start = int(params.get("start_cursor", None) or 0)
+        page_size = min(int(params.get("page_size", None) or MAX_PAGE_SIZE), MAX_PAGE_SIZE)
+        end = start + page_size
+        return Response(
+            200,
+            json={
+                "object": "list",
+                "results": items[start:end],
+                "has_more": end < len(items),
+                "next_cursor": str(end) if end < len(items) else None,
+            },
+        )
+
+    # Synthetic data
+
+    def add_user(self, name: str = "Mock User", bot: bool = False) -> str:
+        user_id = self._new_id()
+        user: Dict[str, Any] = {
+            "object": "user",
+            "id": user_id,
+            "type": "bot" if bot else "person",
+            "name": name,
+            "avatar_url": None,
+        }
+        if not bot:
+            user["person"] = {"email": "{id}@example.com".format(id=user_id[:8])}
+        self.users[user_id] = user
+        return user_id
+
+    def add_database(self, rows: int = 0, columns: int = 3, title: str = "Mock database") -> str:
+        """
+        Adds a database with `columns` properties and `rows` pages.
+
+        Besides the title, properties cycle through select, date, number,
+        checkbox and rich text columns.
+        """
+
+        database_id = self._new_id()
+        properties: Dict[str, Dict[str, Any]] = {
+            "Name": {"id": "title", "name": "Name", "type": "title", "title": {}}
+        }
+        kinds = ("select", "date", "number", "checkbox", "rich_text")
+        for index in range(columns - 1):
+            kind = kinds[index % len(kinds)]
+            name = {0: "Status", 1: "Due"}.get(index, "Column {index}".format(index=index))
+            config: Dict[str, Any] = {}
+            if kind == "select":
+                config = {
+                    "options": [
+                        {"id": str(option), "name": "Option {n}".format(n=option), "color": "blue"}
+                        for option in range(4)
+                    ]
+                }
+            elif kind == "number":
+                config = {"format": "number"}
+            properties[name] = {"id": "p{index}".format(index=index), "name": name, "type": kind}
+            properties[name][kind] = config
+
+        created_time = self._tick()
+        self.databases[database_id] = {
+            "object": "database",
+            "id": database_id,
+            "parent": {"type": "workspace", "workspace": True},
+            "created_time": created_time,
+            "last_edited_time": created_time,
+            "title": _text(title),
+            "icon": None,
+            "cover": None,
+            "properties": properties,
+        }
+        self.children[database_id] = []
+        for row in range(rows):
+            self.add_page(database_id, self._synthetic_properties(database_id, row))
+        return database_id
+
+    def _synthetic_properties(self, database_id: str, row: int) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+        for name, schema in self.databases[database_id]["properties"].items():
+            kind = schema["type"]
+            if kind == "title":
+                values[name] = {"title": _text("Row {row}".format(row=row))}
+            elif kind == "select":
+                option = schema["select"]["options"][row % len(schema["select"]["options"])]
+                values[name] = {"select": option}
+            elif kind == "date":
+                day = (datetime(2021, 1, 1) + timedelta(days=row % 365)).date().isoformat()
+                values[name] = {"date": {"start": day, "end": None}}
+            elif kind == "number":
+                values[name] = {"number": row * 1.5}
+            elif kind == "checkbox":
+                values[name] = {"checkbox": row % 2 == 0}
+            elif kind == "rich_text":
+                values[name] = {
+                    "rich_text": _text("{name} of row {row}".format(name=name, row=row))
+                }
+        return values
+
+    def add_page(self, database_id: str, properties: Dict[str, Any]) -> str:
+        page_id = self._new_id()
+        created_time = self._tick()
+        self.pages[page_id] = {
+            "object": "page",
+            "id": page_id,
+            "created_time": created_time,
+            "last_edited_time": created_time,
+            "parent": {"type": "database_id", "database_id": database_id},
+            "archived": False,
+            "icon": None,
+            "cover": None,
+            "properties": self._property_values(database_id, properties),
+            "url": "https://www.notion.so/{id}".format(id=page_id.replace("-", "")),
+        }
+        self.children[database_id].append(page_id)
+        self.children[page_id] = []
+        return page_id
+
+    def add_blocks(self, parent_id: str, count: int) -> List[str]:
+        return [
+            self._add_block(
+                parent_id,
+                {"paragraph": {"text": [{"text": {"content": "Paragraph {n}".format(n=n)}}]}},
+            )
+            for n in range(count)
+        ]
+
+    def _add_block(
+        self, parent_id: str, payload: Dict[str, Any], position: Optional[int] = None
+    ) -> str:
+        block_type = payload.get("type", None) or next(key for key in payload if key != "object")
+        content = dict(payload[block_type])
+        children = content.pop("children", None) or []
+        if "text" in content:
+            content["text"] = _rich_text(content["text"])
+        block_id = self._new_id()
+        created_time = self._tick()
+        self.blocks[block_id] = {
+            "object": "block",
+            "id": block_id,
+            "type": block_type,
+            "created_time": created_time,
+            "last_edited_time": created_time,
+            "has_children": bool(children),
+            "archived": False,
+            block_type: content,
+        }
+        siblings = self.children.setdefault(parent_id, [])
+        siblings.insert(len(siblings) if position is None else position, block_id)
+        self.children[block_id] = []
+        for child in children:
+            self._add_block(block_id, child)
+        return block_id
+
+    def _property_values(self, database_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        schema = self.databases[database_id]["properties"]
+        values = {}
+        for name, value in properties.items():
+            kind = schema[name]["type"]
+            content = value[kind]
+            if kind in ("title", "rich_text"):
+                content = _rich_text(content)
+            values[name] = {"id": schema[name]["id"], "type": kind, kind: content}
+        return values
+
+    # Blocks
+
+    def _list_children(self, request: Request, body: Dict, block_id: str) -> Response:
+        if block_id not in self.children:
+            return self._not_found(block_id)
+        blocks = [
+            self.blocks[child]
+            for child in self.children[block_id]
+            if child in self.blocks and not self.blocks[child]["archived"]
+        ]
+        return self._paginate(request, body, blocks)
+
+    def _append_children(self, request: Request, body: Dict, block_id: str) -> Response:
+        if block_id not in self.children:
+            return self._not_found(block_id)
+        position = None
+        if body.get("after", None):
+            if body["after"] not in self.children[block_id]:
+                return self._not_found(body["after"])
+            position = self.children[block_id].index(body["after"]) + 1
+        appended = []
+        for child in body.get("children", []):
+            appended.append(self._add_block(block_id, child, position))
+            if position is not None:
+                position += 1
+        if block_id in self.blocks:
+            self.blocks[block_id]["has_children"] = True
+        # Like the API, returns the appended blocks.
+        return Response(
+            200,
+            json={
+                "object": "list",
+                "results": [self.blocks[child] for child in appended],
+                "next_cursor": None,
+                "has_more": False,
+            },
+        )
+
+    def _retrieve_block(self, request: Request, body: Dict, block_id: str) -> Response:
+        if block_id not in self.blocks:
+            return self._not_found(block_id)
+        return Response(200, json=self.blocks[block_id])
+
+    def _update_block(self, request: Request, body: Dict, block_id: str) -> Response:
+        if block_id not in self.blocks:
+            return self._not_found(block_id)
+        block = self.blocks[block_id]
+        content = body.get(block["type"], {})
+        if "text" in content:
+            content = {**content, "text": _rich_text(content["text"])}
+        block[block["type"]] = {**block[block["type"]], **content}
+        if "archived" in body:
+            block["archived"] = body["archived"]
+        block["last_edited_time"] = self._tick()
+        return Response(200, json=block)
+
+    def _delete_block(self, request: Request, body: Dict, block_id: str) -> Response:
+        return self._update_block(request, {"archived": True}, block_id)
+
+    # Databases
+
+    def _list_databases(self, request: Request, body: Dict) -> Response:
+        return self._paginate(request, body, list(self.databases.values()))
+
+    def _create_database(self, request: Request, body: Dict) -> Response:
+        database_id = self.add_database(columns=0)
+        database = self.databases[database_id]
+        database["parent"] = body.get("parent", database["parent"])
+        database["title"] = _rich_text(body.get("title", []))
+        database["properties"] = {
+            name: {"id": name, "name": name, "type": next(iter(config)), **config}
+            for name, config in body.get("properties", {}).items()
+        }
+        return Response(200, json=database)
+
+    def _query_database(self, request: Request, body: Dict, database_id: str) -> Response:
+        if database_id not in self.databases:
+            return self._not_found(database_id)
+        pages = [
+            self.pages[page_id]
+            for page_id in self.children[database_id]
+            if not self.pages[page_id]["archived"]
+        ]
+        if body.get("filter", None):
+            try:
+                pages = [page for page in pages if _matches(page, body["filter"])]
+            except ValueError as error:
+                return self._error(400, str(error))
+        for sort in reversed(body.get("sorts", [])):
+            if "timestamp" in sort:
+                pages.sort(
+                    key=lambda page: page[sort["timestamp"]],
+                    reverse=sort.get("direction", "ascending") == "descending",
+                )
+        return self._paginate(request, body, pages)
+
+    def _retrieve_database(self, request: Request, body: Dict, database_id: str) -> Response:
+        if database_id not in self.databases:
+            return self._not_found(database_id)
+        return Response(200, json=self.databases[database_id])
+
+    def _update_database(self, request: Request, body: Dict, database_id: str) -> Response:
+        if database_id not in self.databases:
+            return self._not_found(database_id)
+        database = self.databases[database_id]
+        if "title" in body:
+            database["title"] = _rich_text(body["title"])
+        database["last_edited_time"] = self._tick()
+        return Response(200, json=database)
+
+    # Pages
+
+    def _create_page(self, request: Request, body: Dict) -> Response:
+        database_id = body.get("parent", {}).get("database_id", None)
+        if database_id not in self.databases:
+            return self._not_found(str(database_id))
+        page_id = self.add_page(database_id, body.get("properties", {}))
+        for child in body.get("children", []):
+            self._add_block(page_id, child)
+        return Response(200, json=self.pages[page_id])
+
+    def _retrieve_page(self, request: Request, body: Dict, page_id: str) -> Response:
+        if page_id not in self.pages:
+            return self._not_found(page_id)
+        return Response(200, json=self.pages[page_id])
+
+    def _update_page(self, request: Request, body: Dict, page_id: str) -> Response:
+        if page_id not in self.pages:
+            return self._not_found(page_id)
+        page = self.pages[page_id]
+        database_id = page["parent"]["database_id"]
+        page["properties"].update(self._property_values(database_id, body.get("properties", {})))
+        if "archived" in body:
+            page["archived"] = body["archived"]
+        page["last_edited_time"] = self._tick()
+        return Response(200, json=page)
+
+    # Users and search
+
+    def _list_users(self, request: Request, body: Dict) -> Response:
+        return self._paginate(request, body, list(self.users.values()))
+
+    def _retrieve_user(self, request: Request, body: Dict, user_id: str) -> Response:
+        if user_id not in self.users:
+            return self._not_found(user_id)
+        return Response(200, json=self.users[user_id])
+
+    def _search(self, request: Request, body: Dict) -> Response:
+        query = body.get("query", "").lower()
+        kind = body.get("filter", {}).get("value", None)
+        results = []
+        if kind in (None, "database"):
+            results.extend(self.databases.values())
+        if kind in (None, "page"):
+            results.extend(page for page in self.pages.values() if not page["archived"])
+        if query:
+            results = [obj for obj in results if query in self._title(obj).lower()]
+        if body.get("sort", None):
+            results.sort(
+                key=lambda obj: obj[body["sort"]["timestamp"]],
+                reverse=body["sort"].get("direction", "descending") == "descending",
+            )
+        return self._paginate(request, body, results)
+
+    def _title(self, obj: Dict[str, Any]) -> str:
+        if obj["object"] == "database":
+            title = obj["title"]
+        else:
+            title = next(
+                (
+                    value["title"]
+                    for value in obj["properties"].values()
+                    if value["type"] == "title"
+                ),
+                [],
+            )
+        return "".join(text["plain_text"] for text in title)
@@ -0,0 +1,445 @@
+import asyncio
+import hashlib
+import json
+
+from difflib import SequenceMatcher
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from notion.deadlines import gather
+
+
+if TYPE_CHECKING:
+    from notion.client import NotionAsyncClient, NotionClient
+
+
+# Block types whose content can be changed in place with `blocks.update`.
+UPDATABLE_BLOCK_TYPES = frozenset(
+    (
+        "paragraph",
+        "heading_1",
+        "heading_2",
+        "heading_3",
+        "bulleted_list_item",
+        "numbered_list_item",
+        "toggle",
+        "to_do",
+    )
+)
+
+# Read-only keys of blocks returned by the API, ignored when comparing blocks.
+READ_ONLY_KEYS = frozenset(
+    ("object", "id", "created_time", "last_edited_time", "has_children", "archived", "children")
+)
+
+# Blocks holding a subpage, which is deleted with them.
+CHILD_PAGE_BLOCK_TYPES = frozenset(("child_page", "child_database"))
+
+MAX_APPENDED_CHILDREN = 100
+
+DEFAULT_ANNOTATIONS = {
+    "bold": False,
+    "italic": False,
+    "strikethrough": False,
+    "underline": False,
+    "code": False,
+    "color": "default",
+}
+
+
+class BlockUpdate(NamedTuple):
+    block_id: str
+    payload: Dict[str, Any]
+
+
+class BlockAppend(NamedTuple):
+    parent_id: str
+    children: List[Dict[str, Any]]
+    # Block after which the children are inserted, at the end when None.
+    after: Optional[str] = None
+    # Whether the `after` block is archived once the children are inserted.
+    archive_after: bool = False
+
+
+class BlockArchive(NamedTuple):
+    block_id: str
+
+
+BlockOperation = Union[BlockUpdate, BlockAppend, BlockArchive]
+
+
+class EditScript(NamedTuple):
+    operations: List[BlockOperation]
+
+    @property
+    def requests(self) -> int:
+        """
+        Number of API calls needed to run the script.
+        """
+
+        return sum(len(_requests(operation)) for operation in self.operations)
+
+
+def _block_type(block: Dict[str, Any]) -> str:
+    if "type" in block:
+        return block["type"]
+    return next(key for key in block if key not in READ_ONLY_KEYS)
+
+
+def _children(block: Dict[str, Any]) -> List[Dict[str, Any]]:
+    content = block.get(_block_type(block), None) or {}
+    return block.get("children", None) or content.get("children", None) or []
+
+
+def _rich_text(items: List[Dict[str, Any]]) -> List[Tuple[Any, ...]]:
+    normalized = []
+    for item in items:
+        annotations = {
+            key: value
+            for key, value in (item.get("annotations", None) or {}).items()
+            if DEFAULT_ANNOTATIONS.get(key, None) != value
+        }
+        content = item.get(item.get("type", "text"), None) or {}
+        link = content.get("link", None) if isinstance(content, dict) else None
+        if isinstance(link, dict):
+            link = link.get("url", None)
+        normalized.append(
+            (
+                item.get("type", "text"),
+                json.dumps(content, sort_keys=True) if item.get("type", "text") != "text" else "",
+                content.get("content", None) if isinstance(content, dict) else None,
+                link,
+                tuple(sorted(annotations.items())),
+            )
+        )
+    return normalized
+
+
+def _content(block: Dict[str, Any]) -> Dict[str, Any]:
+    content = dict(block.get(_block_type(block), None) or {})
+    content.pop("children", None)
+    return content
+
+
+def block_fingerprint(block: Dict[str, Any]) -> str:
+    """
+    Hash of the type and content of a block, excluding its children and
+    read-only attributes, so that a block returned by the API and the
+    payload used to create it get the same fingerprint.
+    """
+
+    content = _content(block)
+    for key in ("text", "caption"):
+        if key in content:
+            content[key] = _rich_text(content[key])
+    serialized = json.dumps([_block_type(block), content], sort_keys=True, default=str)
+    return hashlib.blake2b(serialized.encode(), digest_size=16).hexdigest()
+
+
+def _has_child_pages(block: Dict[str, Any]) -> bool:
+    return _block_type(block) in CHILD_PAGE_BLOCK_TYPES or any(
+        _has_child_pages(child) for child in _children(block)
+    )
+
+
+def _has_nested_blocks(block: Dict[str, Any]) -> bool:
+    # The children of a child page or database are the content of the
+    # subpage, which is not part of the parent's tree.
+    return block.get("has_children", False) and _block_type(block) not in CHILD_PAGE_BLOCK_TYPES
+
+
+def _payload(block: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converts a desired block to the payload of `blocks.children.append`.
+    """
+
+    block_type = _block_type(block)
+    content = _content(block)
+    children = _children(block)
+    if children:
+        content["children"] = [_payload(child) for child in children]
+    return {"object": "block", "type": block_type, block_type: content}
+
+
+class _Planner:
+    def __init__(self) -> None:
+        self.operations: List[BlockOperation] = []
+        self._fingerprints: Dict[int, str] = {}
+
+    def _fingerprint(self, block: Dict[str, Any]) -> str:
+        fingerprint = self._fingerprints.get(id(block), None)
+        if fingerprint is None:
+            fingerprint = self._fingerprints[id(block)] = block_fingerprint(block)
+        return fingerprint
+
+    def plan(
+        self, parent_id: str, current: List[Dict[str, Any]], desired: List[Dict[str, Any]]
+    ) -> None:
+        pairs = self._match(current, desired)
+        matched = [index for index, pair in enumerate(pairs) if pair is not None]
+
+        # Blocks can only be inserted after another block: new blocks before
+        # the first kept one are inserted after it, and it is recreated after
+        # them.
+        replaced = None
+        if matched and matched[0] > 0:
+            replaced = pairs[matched[0]]
+            assert replaced is not None
+            if _has_child_pages(current[replaced]):
+                raise ValueError(
+                    "Cannot insert blocks before block {id}, which holds subpages".format(
+                        id=current[replaced]["id"]
+                    )
+                )
+            pairs[matched[0]] = None
+        anchor = current[replaced]["id"] if replaced is not None else None
+
+        kept = set()
+        after = None
+        run: List[Dict[str, Any]] = []
+        for index, current_index in enumerate(pairs):
+            if current_index is None:
+                run.append(desired[index])
+                continue
+            self._append(parent_id, run, after, anchor)
+            run = []
+            kept.add(current_index)
+            after = current[current_index]["id"]
+            self._reconcile(current[current_index], desired[index])
+        self._append(parent_id, run, after, anchor)
+
+        # Archiving a child page or database block deletes the subpage: they
+        # are left in place instead.
+        for current_index, block in enumerate(current):
+            if current_index not in kept and current_index != replaced:
+                if _block_type(block) not in CHILD_PAGE_BLOCK_TYPES:
+                    self.operations.append(BlockArchive(block["id"]))
+
+    def _append(
+        self,
+        parent_id: str,
+        blocks: List[Dict[str, Any]],
+        after: Optional[str],
+        anchor: Optional[str],
+    ) -> None:
+        if not blocks:
+            return
+        children = [_payload(block) for block in blocks]
+        if after is None and anchor is not None:
+            # Leading blocks, inserted after the block they replace.
+            self.operations.append(BlockAppend(parent_id, children, anchor, True))
+        else:
+            self.operations.append(BlockAppend(parent_id, children, after))
+
+    def _match(
+        self, current: List[Dict[str, Any]], desired: List[Dict[str, Any]]
+    ) -> List[Optional[int]]:
+        """
+        Pairs each desired block with a current block, or `None`.
+
+        Blocks are matched by ID first, then by content hash over the longest
+        common subsequence of siblings. Unmatched blocks of the same type
+        left between two matches are paired when they can be updated in
+        place.
+        """
+
+        pairs: List[Optional[int]] = [None] * len(desired)
+        positions = {block["id"]: index for index, block in enumerate(current)}
+        if any(block.get("id", None) in positions for block in desired):
+            last = -1
+            for index, block in enumerate(desired):
+                position = positions.get(block.get("id", None), -1)
+                if position > last and self._can_reconcile(current[position], block):
+                    pairs[index] = last = position
+            return pairs
+
+        matcher = SequenceMatcher(
+            None,
+            [self._fingerprint(block) for block in current],
+            [self._fingerprint(block) for block in desired],
+            autojunk=False,
+        )
+        for tag, current_start, current_end, desired_start, desired_end in matcher.get_opcodes():
+            if tag == "equal":
+                for offset in range(desired_end - desired_start):
+                    pairs[desired_start + offset] = current_start + offset
+            elif tag == "replace":
+                current_index = current_start
+                for index in range(desired_start, desired_end):
+                    if current_index == current_end:
+                        break
+                    if self._can_reconcile(current[current_index], desired[index]):
+                        pairs[index] = current_index
+                        current_index += 1
+        return pairs
+
+    def _can_reconcile(self, current: Dict[str, Any], desired: Dict[str, Any]) -> bool:
+        block_type = _block_type(current)
+        if block_type != _block_type(desired):
+            return False
+        return block_type in UPDATABLE_BLOCK_TYPES or (
+            self._fingerprint(current) == self._fingerprint(desired)
+        )
+
+    def _reconcile(self, current: Dict[str, Any], desired: Dict[str, Any]) -> None:
+        if self._fingerprint(current) != self._fingerprint(desired):
+            block_type = _block_type(current)
+            self.operations.append(BlockUpdate(current["id"], {block_type: _content(desired)}))
+        if _block_type(current) in CHILD_PAGE_BLOCK_TYPES:
+            return
+        current_children = _children(current)
+        desired_children = _children(desired)
+        if current_children or desired_children:
+            self.plan(current["id"], current_children, desired_children)
+
+
+def plan_block_updates(
+    block_id: str, current: List[Dict[str, Any]], desired: List[Dict[str, Any]]
+) -> EditScript:
+    """
+    Computes the edit script turning the children of `block_id` from the
+    `current` tree into the `desired` one.
+
+    Both trees are lists of block objects as returned by `fetch_block_tree`
+    or sent to `blocks.children.append`, with nested blocks in a `children`
+    key. Desired blocks may carry the `id` of the block they replace;
+    otherwise blocks are matched on their content. Changed text blocks are
+    updated in place, new blocks inserted after the block preceding them and
+    removed ones archived.
+
+    Blocks cannot be inserted before the first child: new leading blocks are
+    inserted after the first kept block, which is then recreated, and a
+    `ValueError` is raised when it holds subpages. Child page and child
+    database blocks are never archived, since that would delete the subpage.
+    """
+
+    planner = _Planner()
+    planner.plan(block_id, current, desired)
+    return EditScript(planner.operations)
+
+
+def _children_path(block_id: str) -> str:
+    return "blocks/{id}/children".format(id=block_id)
+
+
+def fetch_block_tree(client: "NotionClient", block_id: str) -> List[Dict[str, Any]]:
+    """
+    Returns the children of `block_id` as raw block objects, with their
+    own children fetched recursively into a `children` key. The content of
+    child pages and databases is not fetched.
+    """
+
+    blocks: List[Dict[str, Any]] = []
+    cursor = None
+    while True:
+        query = {"page_size": 100, "start_cursor": cursor} if cursor else {"page_size": 100}
+        response = client.request("GET", _children_path(block_id), query=query)
+        blocks.extend(response["results"])
+        cursor = response.get("next_cursor", None)
+        if not response["has_more"]:
+            break
+    for block in blocks:
+        if _has_nested_blocks(block):
+            block["children"] = fetch_block_tree(client, block["id"])
+    return blocks
+
+
+async def fetch_block_tree_async(
+    client: "NotionAsyncClient", block_id: str, concurrency: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Same as `fetch_block_tree`, fetching up to `concurrency` children lists
+    at the same time. When a request fails, the requests still running are
+    cancelled before the error is raised.
+    """
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(parent_id: str) -> List[Dict[str, Any]]:
+        blocks: List[Dict[str, Any]] = []
+        cursor = None
+        while True:
+            query = {"page_size": 100, "start_cursor": cursor} if cursor else {"page_size": 100}
+            async with semaphore:
+                response = await client.request("GET", _children_path(parent_id), query=query)
+            blocks.extend(response["results"])
+            cursor = response.get("next_cursor", None)
+            if not response["has_more"]:
+                break
+        parents = [block for block in blocks if _has_nested_blocks(block)]
+        children = await gather(*(fetch(block["id"]) for block in parents))
+        for block, block_children in zip(parents, children):
+            block["children"] = block_children
+        return blocks
+
+    return await fetch(block_id)
+
+
+def _requests(operation: BlockOperation) -> List[Tuple[str, str, Optional[Dict[str, Any]]]]:
+    if isinstance(operation, BlockUpdate):
+        return [("PATCH", "blocks/{id}".format(id=operation.block_id), operation.payload)]
+    if isinstance(operation, BlockArchive):
+        return [("DELETE", "blocks/{id}".format(id=operation.block_id), None)]
+    # Chunks of one append are sent in order so that blocks keep their order,
+    # each inserted after the last block of the previous one, see `_after`.
+    requests: List[Tuple[str, str, Optional[Dict[str, Any]]]] = []
+    for start in range(0, len(operation.children), MAX_APPENDED_CHILDREN):
+        body: Dict[str, Any] = {
+            "children": operation.children[start : start + MAX_APPENDED_CHILDREN]
+        }
+        if operation.after is not None:
+            body["after"] = operation.after
+        requests.append(("PATCH", _children_path(operation.parent_id), body))
+    if operation.after is not None and operation.archive_after:
+        requests.append(("DELETE", "blocks/{id}".format(id=operation.after), None))
+    return requests
+
+
+def _chain(body: Optional[Dict[str, Any]], after: Optional[str]) -> Optional[Dict[str, Any]]:
+    if after is None or body is None or "after" not in body:
+        return body
+    return {**body, "after": after}
+
+
+def _after(response: Dict[str, Any]) -> Optional[str]:
+    """
+    Returns the ID of the last block inserted by an append request.
+    """
+
+    results = response.get("results", None) or []
+    return results[-1]["id"] if results else None
+
+
+def apply_edit_script(client: "NotionClient", script: EditScript) -> None:
+    """
+    Runs the operations of `script` on the thread pool of `client`, see
+    `NotionClient.map`. Its `pool_size` bounds the number of concurrent
+    requests.
+    """
+
+    def run(operation: BlockOperation) -> None:
+        after = None
+        for method, path, body in _requests(operation):
+            response = client.request(method, path, body=_chain(body, after))
+            after = _after(response)
+
+    client.map(run, script.operations)
+
+
+async def apply_edit_script_async(
+    client: "NotionAsyncClient", script: EditScript, concurrency: int = 10
+) -> None:
+    """
+    Runs the operations of `script` with up to `concurrency` requests in
+    flight.
+    """
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(operation: BlockOperation) -> None:
+        after = None
+        for method, path, body in _requests(operation):
+            async with semaphore:
+                response = await client.request(method, path, body=_chain(body, after))
+            after = _after(response)
+
+    await gather(*(run(operation) for operation in script.operations))
@@ -0,0 +1,249 @@
+import asyncio
+import inspect
+import time
+
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Union
+
+from httpx import TransportError
+
+from notion.errors import CircuitOpenError, HTTPResponseError, RequestTimeoutError
+from notion.helpers import fingerprint
+
+
+if TYPE_CHECKING:
+    from notion.client import NotionAsyncClient
+
+
+LAST_EDITED_DESCENDING = {"timestamp": "last_edited_time", "direction": "descending"}
+
+
+class ChangeEvent(NamedTuple):
+    # Key of the watch that saw the change: a database ID, or "search".
+    source: str
+    # Raw page or database object, as returned by the API.
+    object: Dict[str, Any]
+
+    @property
+    def id(self) -> str:
+        return self.object["id"]
+
+    @property
+    def last_edited_time(self) -> str:
+        return self.object["last_edited_time"]
+
+
+ChangeCallback = Callable[[ChangeEvent], Union[None, Awaitable[None]]]
+
+
+class _Watch:
+    def __init__(self, key: str, path: str, body: Dict[str, Any], interval: float) -> None:
+        self.key = key
+        self.path = path
+        self.body = body
+        self.interval = interval
+        self.next_poll = 0.0
+        # Most recent `last_edited_time` seen, and the fingerprints of the
+        # objects edited at that time: timestamps are truncated to the minute
+        # by Notion, so several objects, or several versions of one object,
+        # may share the watermark.
+        self.watermark: Optional[str] = None
+        self.versions: Dict[str, str] = {}
+        # Whether a poll completed: the watermark stays unset after polling
+        # an empty database.
+        self.polled = False
+        self.error: Optional[Exception] = None
+
+
+class ChangePoller:
+    """
+    Polls databases and search results for changed pages, and emits a
+    `ChangeEvent` per page created or edited since the previous poll.
+
+    Each poll asks for the most recently edited objects first and stops
+    reading at the last object seen before, so that an idle database costs
+    one request per poll whatever its size. All watches are run by a single
+    scheduler loop on one `NotionAsyncClient`, sharing its connections and
+    rate limiter:
+
+        poller = ChangePoller(notion, callback=on_change)
+        poller.watch_database(database_id)
+        poller.watch_search(filter={"property": "object", "value": "page"})
+        await poller.run()
+
+    Events are passed to `callback`, which may be a coroutine function, or
+    put on `queue`. The polling interval of each watch adapts to its change
+    rate between `min_interval` and `max_interval` seconds: it is halved
+    after a poll that found changes and grows by `backoff` otherwise, or
+    after an error. The first poll of a watch only records the current
+    state, unless `emit_existing` is enabled.
+
+    An object edited again within the minute of its previous version is
+    only emitted when its properties changed, see `fingerprint`.
+    """
+
+    def __init__(
+        self,
+        client: "NotionAsyncClient",
+        callback: Optional[ChangeCallback] = None,
+        queue: Optional["asyncio.Queue[ChangeEvent]"] = None,
+        min_interval: float = 5.0,
+        max_interval: float = 300.0,
+        backoff: float = 1.5,
+        page_size: int = 100,
+        emit_existing: bool = False,
+    ) -> None:
+        if callback is None and queue is None:
+            raise ValueError("Either callback or queue must be given")
+        self.client = client
+        self.callback = callback
+        self.queue = queue
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.page_size = page_size
+        self.emit_existing = emit_existing
+        self.watches: Dict[str, _Watch] = {}
+        self._running = False
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def watch_database(self, database_id: str, filter: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Watches the pages of a database, optionally restricted by a query
+        `filter`. Returns the key of the watch.
+        """
+
+        body: Dict[str, Any] = {"sorts": [LAST_EDITED_DESCENDING]}
+        if filter is not None:
+            body["filter"] = filter
+        return self._watch(database_id, "databases/{id}/query".format(id=database_id), body)
+
+    def watch_search(
+        self, query: Optional[str] = None, filter: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Watches the pages and databases shared with the integration, as
+        returned by `search`. Returns the key of the watch.
+        """
+
+        body: Dict[str, Any] = {"sort": LAST_EDITED_DESCENDING}
+        if query is not None:
+            body["query"] = query
+        if filter is not None:
+            body["filter"] = filter
+        return self._watch("search", "search", body)
+
+    def _watch(self, key: str, path: str, body: Dict[str, Any]) -> str:
+        self.watches[key] = _Watch(key, path, body, self.min_interval)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return key
+
+    def unwatch(self, key: str) -> None:
+        self.watches.pop(key, None)
+
+    async def poll(self, key: str) -> List[ChangeEvent]:
+        """
+        Polls one watch now and returns its changes, oldest first, without
+        emitting them.
+        """
+
+        return await self._poll(self.watches[key])
+
+    async def _poll(self, watch: _Watch) -> List[ChangeEvent]:
+        # Without `emit_existing`, the first poll only needs the most recent
+        # objects to set the watermark.
+        baseline = not watch.polled and not self.emit_existing
+        changes: List[Dict[str, Any]] = []
+        versions: Dict[str, str] = {}
+        cursor = None
+        while True:
+            body = {**watch.body, "page_size": self.page_size}
+            if cursor:
+                body["start_cursor"] = cursor
+            response = await self.client.request("POST", watch.path, body=body)
+            done = False
+            for obj in response["results"]:
+                edited = obj["last_edited_time"]
+                if watch.watermark is not None and edited < watch.watermark:
+                    done = True
+                    break
+                version = versions[obj["id"]] = fingerprint(obj)
+                if edited != watch.watermark or watch.versions.get(obj["id"], None) != version:
+                    changes.append(obj)
+            cursor = response.get("next_cursor", None)
+            if done or baseline or not response["has_more"]:
+                break
+
+        if changes:
+            latest = changes[0]["last_edited_time"]
+            if latest != watch.watermark:
+                watch.watermark = latest
+                watch.versions = {}
+            watch.versions.update(
+                (obj["id"], versions[obj["id"]])
+                for obj in changes
+                if obj["last_edited_time"] == latest
+            )
+        watch.polled = True
+        if baseline:
+            return []
+        return [ChangeEvent(watch.key, obj) for obj in reversed(changes)]
+
+    async def _emit(self, events: List[ChangeEvent]) -> None:
+        for event in events:
+            if self.queue is not None:
+                await self.queue.put(event)
+            if self.callback is not None:
+                result = self.callback(event)
+                if inspect.isawaitable(result):
+                    await result
+
+    async def _run_watch(self, watch: _Watch) -> None:
+        delay = None
+        try:
+            events = await self._poll(watch)
+        except (HTTPResponseError, RequestTimeoutError, TransportError, CircuitOpenError) as error:
+            watch.error = error
+            watch.interval = min(watch.interval * self.backoff, self.max_interval)
+            if isinstance(error, CircuitOpenError):
+                delay = max(watch.interval, error.retry_after)
+        else:
+            watch.error = None
+            if events:
+                watch.interval = max(watch.interval / 2, self.min_interval)
+            else:
+                watch.interval = min(watch.interval * self.backoff, self.max_interval)
+            await self._emit(events)
+        watch.next_poll = time.monotonic() + (delay if delay is not None else watch.interval)
+
+    async def run(self) -> None:
+        """
+        Runs the scheduler loop until `stop` is called.
+        """
+
+        self._running = True
+        self._wakeup = asyncio.Event()
+        try:
+            while self._running:
+                now = time.monotonic()
+                due = [watch for watch in self.watches.values() if watch.next_poll <= now]
+                if due:
+                    await asyncio.gather(*(self._run_watch(watch) for watch in due))
+                    continue
+                self._wakeup.clear()
+                timeout = min(
+                    (watch.next_poll - now for watch in self.watches.values()),
+                    default=self.max_interval,
+                )
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._running = False
+            self._wakeup = None
+
+    def stop(self) -> None:
+        self._running = False
+        if self._wakeup is not None:
+            self._wakeup.set()
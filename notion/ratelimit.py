@@ -0,0 +1,56 @@
+import asyncio
+import threading
+import time
+
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Token bucket limiting the number of requests sent per second.
+
+    Notion allows an average of three requests per second for each
+    integration token, with short bursts above that rate.
+    Each call to `reserve` takes a token and returns the delay to wait
+    before the request can be sent, so concurrent callers queue up in
+    order instead of all retrying at once.
+
+    `acquire` and `acquire_async` return `False` without taking a token
+    when the wait would exceed `timeout` seconds.
+    """
+
+    def __init__(self, rate: float = 3.0, burst: Optional[int] = None) -> None:
+        if rate <= 0:
+            raise ValueError("Rate limit must be a positive number of requests per second.")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, timeout: Optional[float] = None) -> Optional[float]:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            delay = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if timeout is not None and delay > max(timeout, 0.0):
+                return None
+            self._tokens -= 1
+            return delay
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        delay = self.reserve(timeout)
+        if delay is None:
+            return False
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> bool:
+        delay = self.reserve(timeout)
+        if delay is None:
+            return False
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return True
@@ -0,0 +1,103 @@
+import threading
+
+from typing import Any, Dict, Optional, Tuple
+
+from notion.client import (
+    DEFAULT_NOTION_URL,
+    DEFAULT_NOTION_VERSION,
+    NotionClient,
+    normalize_base_url,
+)
+
+
+_RegistryKey = Tuple[Optional[str], str, str]
+
+
+class _Entry:
+    __slots__ = ("client", "options")
+
+    def __init__(self, client: NotionClient, options: Dict[str, Any]) -> None:
+        self.client = client
+        self.options = options
+
+
+class ClientRegistry:
+    """
+    Process-level pool of ready to use `NotionClient`.
+
+    Clients are keyed by `(auth, base_url, notion_version)` and kept for the
+    lifetime of the process, so that serverless handlers invoked in a warm
+    container reuse the client and its open keep-alive connection instead
+    of building a new one:
+
+        def handler(event, context):
+            notion = get_client(auth=os.environ["NOTION_TOKEN"])
+            ...
+
+    Other options are only used to create the client: asking for a
+    registered client with different options raises `ValueError`.
+
+    Idle connections are kept open for `max_idle` seconds, and closed
+    clients are replaced. Returning a client sends no request: connections
+    closed by the server while the process was idle are detected and
+    discarded by the connection pool when the next request is sent.
+    """
+
+    def __init__(self, max_idle: float = 60.0) -> None:
+        self.max_idle = max_idle
+        self._entries: Dict[_RegistryKey, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        auth: Optional[str] = None,
+        base_url: str = DEFAULT_NOTION_URL,
+        notion_version: str = DEFAULT_NOTION_VERSION,
+        **options: Any,
+    ) -> NotionClient:
+        """
+        Returns the client registered for the given credentials, creating
+        it with `options` when there is none yet.
+        """
+
+        base_url = normalize_base_url(base_url)
+        options.setdefault("keepalive_expiry", self.max_idle)
+        key = (auth, base_url, notion_version)
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None or entry.client.http_client.is_closed:
+                client = NotionClient(
+                    auth=auth, base_url=base_url, notion_version=notion_version, **options
+                )
+                self._entries[key] = _Entry(client, options)
+                return client
+            if entry.options != options:
+                raise ValueError(
+                    "A client is registered for these credentials with other options: "
+                    "{options}".format(options=entry.options)
+                )
+            return entry.client
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                entry.client.close()
+            self._entries.clear()
+
+
+_default_registry = ClientRegistry()
+
+
+def get_client(
+    auth: Optional[str] = None,
+    base_url: str = DEFAULT_NOTION_URL,
+    notion_version: str = DEFAULT_NOTION_VERSION,
+    **options: Any,
+) -> NotionClient:
+    """
+    Returns a reusable `NotionClient` from the process-level `ClientRegistry`.
+    """
+
+    return _default_registry.get(
+        auth=auth, base_url=base_url, notion_version=notion_version, **options
+    )
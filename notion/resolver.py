@@ -0,0 +1,238 @@
+import asyncio
+import threading
+
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from notion.deadlines import gather
+from notion.errors import APIErrorCode, APIResponseError
+from notion.helpers import async_iterate_paginated_api, iterate_paginated_api
+
+
+if TYPE_CHECKING:
+    from notion.client import NotionAsyncClient, NotionClient
+
+
+# Errors of objects deleted or not shared with the integration, which are
+# resolved to None instead of being looked up again.
+MISSING_ERROR_CODES = (APIErrorCode.OBJECT_NOT_FOUND, APIErrorCode.RESTRICTED_RESOURCE)
+
+
+def _get(value: Any, key: str) -> Any:
+    if isinstance(value, dict):
+        return value.get(key, None)
+    return getattr(value, key, None)
+
+
+def _is_missing(error: Exception) -> bool:
+    return isinstance(error, APIResponseError) and error.code in MISSING_ERROR_CODES
+
+
+def references(pages: Iterable[Any]) -> Tuple[Set[str], Set[str]]:
+    """
+    Returns the IDs of the users and of the pages referenced by people,
+    created by, last edited by and relation properties of `pages`, either
+    `Page` models or raw pages.
+    """
+
+    users: Set[str] = set()
+    related: Set[str] = set()
+    for page in pages:
+        for value in (_get(page, "properties") or {}).values():
+            kind = _get(value, "type")
+            kind = getattr(kind, "value", kind)
+            if not kind:
+                continue
+            content = _get(value, kind)
+            if kind == "people":
+                users.update(_get(user, "id") for user in content or ())
+            elif kind in ("created_by", "last_edited_by") and content:
+                users.add(_get(content, "id"))
+            elif kind == "relation":
+                related.update(_get(reference, "id") for reference in content or ())
+    return users, related
+
+
+class _Resolver:
+    def __init__(self, list_users: bool) -> None:
+        self.list_users = list_users
+        # Identity maps of the objects looked up, None when missing.
+        self.users: Dict[str, Any] = {}
+        self.pages: Dict[str, Any] = {}
+        # Number of objects retrieved one by one.
+        self.lookups = 0
+
+    def _unknown(self, pages: Iterable[Any]) -> Tuple[Set[str], Set[str]]:
+        users, related = references(pages)
+        return users - self.users.keys(), related - self.pages.keys()
+
+    def clear(self) -> None:
+        """
+        Forgets the objects looked up, e.g. at the end of a session.
+        """
+
+        self.users.clear()
+        self.pages.clear()
+
+
+class Resolver(_Resolver):
+    """
+    Resolves the IDs of users and pages referenced by page properties,
+    fetching each object once.
+
+    People, created by and last edited by properties only carry user IDs,
+    and relations page IDs. `prefetch` collects the references of a batch
+    of pages and fetches the unknown ones on the thread pool of the
+    client, see `NotionClient.map`, listing the users of the workspace
+    with `users.list` first unless `list_users` is false:
+
+        resolver = Resolver(notion)
+        pages = notion.databases.query(database_id).results
+        resolver.prefetch(pages)
+        for page in pages:
+            owners = [resolver.user(user.id).name for user in page.properties["Owner"].people]
+
+    Objects are kept in the `users` and `pages` identity maps for the life
+    of the resolver. Users and pages deleted or not shared with the
+    integration resolve to `None`.
+    """
+
+    def __init__(self, client: "NotionClient", list_users: bool = True) -> None:
+        super().__init__(list_users)
+        self.client = client
+        self._listed = False
+        self._list_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def _list_users(self) -> None:
+        with self._list_lock:
+            if self._listed:
+                return
+            try:
+                for user in iterate_paginated_api(self.client.users.list):
+                    self.users[user.id] = user
+            except APIResponseError as error:
+                # Without the capability to read users, they are retrieved
+                # one by one.
+                if error.code != APIErrorCode.RESTRICTED_RESOURCE:
+                    raise
+            self._listed = True
+
+    def _retrieve(self, identity_map: Dict[str, Any], key: str, retrieve: Callable) -> Any:
+        try:
+            value = retrieve(key)
+        except APIResponseError as error:
+            if not _is_missing(error):
+                raise
+            value = None
+        with self._lock:
+            self.lookups += 1
+        identity_map[key] = value
+        return value
+
+    def user(self, user_id: str) -> Any:
+        if user_id in self.users:
+            return self.users[user_id]
+        return self._retrieve(self.users, user_id, self.client.users.retrieve)
+
+    def page(self, page_id: str) -> Any:
+        if page_id in self.pages:
+            return self.pages[page_id]
+        return self._retrieve(self.pages, page_id, self.client.pages.retrieve)
+
+    def prefetch(self, pages: Iterable[Any]) -> None:
+        """
+        Fetches the users and pages referenced by `pages` that are not
+        known yet.
+        """
+
+        user_ids, page_ids = self._unknown(pages)
+        if user_ids and self.list_users:
+            self._list_users()
+            user_ids -= self.users.keys()
+        self.client.map(self.user, user_ids)
+        self.client.map(self.page, page_ids)
+
+
+class AsyncResolver(_Resolver):
+    """
+    Same as `Resolver` for `NotionAsyncClient`, fetching up to
+    `concurrency` objects at the same time. Concurrent lookups of the same
+    object share a single request.
+    """
+
+    def __init__(
+        self, client: "NotionAsyncClient", concurrency: int = 10, list_users: bool = True
+    ) -> None:
+        super().__init__(list_users)
+        self.client = client
+        self.concurrency = concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._listing: Optional["asyncio.Future[None]"] = None
+        self._tasks: Dict[Tuple[str, str], "asyncio.Future[Any]"] = {}
+
+    async def _fetch_users(self) -> None:
+        try:
+            async for user in async_iterate_paginated_api(self.client.users.list):
+                self.users[user.id] = user
+        except APIResponseError as error:
+            if error.code != APIErrorCode.RESTRICTED_RESOURCE:
+                self._listing = None
+                raise
+
+    async def _list_users(self) -> None:
+        if self._listing is None:
+            self._listing = asyncio.ensure_future(self._fetch_users())
+        await asyncio.shield(self._listing)
+
+    async def _retrieve(
+        self, identity_map: Dict[str, Any], key: str, retrieve: Callable[[str], Awaitable[Any]]
+    ) -> Any:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            try:
+                value = await retrieve(key)
+            except APIResponseError as error:
+                if not _is_missing(error):
+                    raise
+                value = None
+        self.lookups += 1
+        identity_map[key] = value
+        return value
+
+    async def _load(
+        self,
+        kind: str,
+        identity_map: Dict[str, Any],
+        key: str,
+        retrieve: Callable[[str], Awaitable[Any]],
+    ) -> Any:
+        if key in identity_map:
+            return identity_map[key]
+        task = self._tasks.get((kind, key), None)
+        if task is None:
+            task = asyncio.ensure_future(self._retrieve(identity_map, key, retrieve))
+            self._tasks[(kind, key)] = task
+            task.add_done_callback(lambda _: self._tasks.pop((kind, key), None))
+        return await asyncio.shield(task)
+
+    async def user(self, user_id: str) -> Any:
+        return await self._load("user", self.users, user_id, self.client.users.retrieve)
+
+    async def page(self, page_id: str) -> Any:
+        return await self._load("page", self.pages, page_id, self.client.pages.retrieve)
+
+    async def prefetch(self, pages: Iterable[Any]) -> None:
+        """
+        Fetches the users and pages referenced by `pages` that are not
+        known yet.
+        """
+
+        user_ids, page_ids = self._unknown(pages)
+        if user_ids and self.list_users:
+            await self._list_users()
+            user_ids -= self.users.keys()
+        await gather(
+            *(self.user(user_id) for user_id in user_ids),
+            *(self.page(page_id) for page_id in page_ids),
+        )
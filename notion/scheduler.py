@@ -0,0 +1,204 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
+
+
+class Priority(str, Enum):
+    INTERACTIVE = "interactive"
+    DEFAULT = "default"
+    BATCH = "batch"
+
+
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    Priority.INTERACTIVE: 16.0,
+    Priority.DEFAULT: 4.0,
+    Priority.BATCH: 1.0,
+}
+
+_priority: ContextVar[str] = ContextVar("notion_priority", default=Priority.DEFAULT)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+@contextmanager
+def priority(value: str) -> Iterator[None]:
+    """
+    Sets the priority class of the requests sent in the block, in the
+    current thread or task and the tasks it starts:
+
+        with priority(Priority.BATCH):
+            for page_id in page_ids:
+                notion.pages.update(page_id, properties=properties)
+    """
+
+    token = _priority.set(value)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def _bounded(delay: Optional[float], expires: Optional[float]) -> Optional[float]:
+    """
+    Returns how long to wait for a slot, at most until `expires`. A delay
+    longer than the time left is not waited at all, since the slot would
+    come too late.
+    """
+
+    if expires is None:
+        return delay
+    left = expires - time.monotonic()
+    if delay is not None and delay > left:
+        return 0.0
+    return left if delay is None else delay
+
+
+class _Ticket:
+    __slots__ = ("finish", "sequence", "wake", "cancelled")
+
+    def __init__(self, finish: float, sequence: int) -> None:
+        self.finish = finish
+        self.sequence = sequence
+        self.wake: Callable[[], Any] = lambda: None
+        self.cancelled = False
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.finish, self.sequence) < (other.finish, other.sequence)
+
+
+class PriorityScheduler:
+    """
+    Rate limiter handing out request slots by priority class.
+
+    Requests are limited to `rate` per second with bursts of `burst`, like
+    `RateLimiter`, but waiting requests are not served in arrival order:
+    slots are shared between the priority classes waiting at the same time
+    in proportion to their `weights` (weighted fair queuing), and served in
+    order within a class. With the default weights, interactive requests
+    get 16 slots for every batch one, so they do not wait behind a backlog
+    of bulk updates when the quota is saturated, while batch traffic still
+    makes progress.
+
+    The class of a request is read from the `priority` context. `acquire`
+    and `acquire_async` give up and return `False` when no slot is granted
+    within `timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        rate: float = 3.0,
+        burst: Optional[int] = None,
+        weights: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("Rate limit must be a positive number of requests per second.")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.weights = dict(weights if weights is not None else DEFAULT_WEIGHTS)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._virtual_time = 0.0
+        self._last_finish: Dict[str, float] = {}
+        self._queue: List[_Ticket] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def _push(self, priority_class: str) -> _Ticket:
+        weight = self.weights.get(priority_class, None)
+        if weight is None:
+            raise ValueError("Unknown priority {value!r}".format(value=priority_class))
+        start = max(self._virtual_time, self._last_finish.get(priority_class, 0.0))
+        ticket = _Ticket(start + 1 / weight, next(self._sequence))
+        self._last_finish[priority_class] = ticket.finish
+        heapq.heappush(self._queue, ticket)
+        return ticket
+
+    def _poll(self, ticket: _Ticket) -> Optional[float]:
+        """
+        Grants a slot to `ticket` if it is next and a token is available.
+        Otherwise returns how long to wait before polling again, `None`
+        meaning until woken up.
+        """
+
+        if self._queue[0] is not ticket:
+            return None
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+        self._tokens -= 1
+        self._virtual_time = ticket.finish
+        heapq.heappop(self._queue)
+        self._wake_next()
+        return 0.0
+
+    def _wake_next(self) -> None:
+        while self._queue and self._queue[0].cancelled:
+            heapq.heappop(self._queue)
+        if self._queue:
+            self._queue[0].wake()
+
+    def _cancel(self, ticket: _Ticket) -> None:
+        with self._lock:
+            ticket.cancelled = True
+            self._wake_next()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        expires = time.monotonic() + timeout if timeout is not None else None
+        event = threading.Event()
+        with self._lock:
+            ticket = self._push(current_priority())
+            ticket.wake = event.set
+        granted = False
+        try:
+            while True:
+                event.clear()
+                with self._lock:
+                    delay = self._poll(ticket)
+                if delay == 0:
+                    granted = True
+                    return True
+                wait = _bounded(delay, expires)
+                if wait is not None and wait <= 0:
+                    return False
+                event.wait(wait)
+        finally:
+            if not granted:
+                self._cancel(ticket)
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> bool:
+        expires = time.monotonic() + timeout if timeout is not None else None
+        loop = asyncio.get_event_loop()
+        event = asyncio.Event()
+        with self._lock:
+            ticket = self._push(current_priority())
+            ticket.wake = lambda: loop.call_soon_threadsafe(event.set)
+        granted = False
+        try:
+            while True:
+                event.clear()
+                with self._lock:
+                    delay = self._poll(ticket)
+                if delay == 0:
+                    granted = True
+                    return True
+                wait = _bounded(delay, expires)
+                if wait is not None and wait <= 0:
+                    return False
+                try:
+                    await asyncio.wait_for(event.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if not granted:
+                self._cancel(ticket)
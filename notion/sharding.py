@@ -0,0 +1,208 @@
+import asyncio
+
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Union
+
+from notion.types import Database, PropertyType
+
+
+if TYPE_CHECKING:
+    from notion.client import NotionAsyncClient
+
+
+Filter = Dict[str, Any]
+
+
+def _schema(database: Union[Database, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    if isinstance(database, Database):
+        return {
+            name: {**value.dict(), "type": PropertyType(value.type).value}
+            for name, value in database.properties.items()
+        }
+    return database["properties"]
+
+
+def _datetime(value: Union[datetime, str]) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _isoformat(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def created_time_shards(
+    database: Union[Database, Dict[str, Any]],
+    count: int,
+    start: Optional[Union[datetime, str]] = None,
+    end: Optional[Union[datetime, str]] = None,
+) -> List[Filter]:
+    """
+    Splits a database into `count` shards of pages created in consecutive
+    time ranges, from `start`, the creation of the database by default,
+    to `end`, now by default.
+
+    The first and last shards are open ended, so that every page belongs
+    to exactly one shard. Ranges have the same length, not the same number
+    of pages: use more shards than concurrent requests when pages were
+    created in bursts.
+    """
+
+    if count < 1:
+        raise ValueError("Expected at least one shard, got {count}".format(count=count))
+    if isinstance(database, Database):
+        created_time: Union[datetime, str] = database.created_time
+    else:
+        created_time = database["created_time"]
+    first = _datetime(start if start is not None else created_time)
+    last = _datetime(end if end is not None else datetime.now(timezone.utc))
+    if last <= first:
+        raise ValueError("Shards end {end} before they start {start}".format(end=last, start=first))
+    step = (last - first) / count
+    bounds = [_isoformat(first + step * index) for index in range(1, count)]
+
+    # A created time property filters the same timestamp as the timestamp
+    # filter, which is only available in recent versions of the API.
+    names = [
+        name
+        for name, value in _schema(database).items()
+        if value["type"] == PropertyType.CREATED_TIME.value
+    ]
+
+    def condition(operator: str, bound: str) -> Filter:
+        if names:
+            return {"property": names[0], "created_time": {operator: bound}}
+        return {"timestamp": "created_time", "created_time": {operator: bound}}
+
+    if not bounds:
+        return [{}]
+    shards = [condition("before", bounds[0])]
+    for lower, upper in zip(bounds, bounds[1:]):
+        shards.append({"and": [condition("on_or_after", lower), condition("before", upper)]})
+    shards.append(condition("on_or_after", bounds[-1]))
+    return shards
+
+
+def property_shards(database: Union[Database, Dict[str, Any]], name: str) -> List[Filter]:
+    """
+    Splits a database into one shard per value of the select,
+    multi-select or checkbox property `name`, read from the database
+    schema, plus a shard of pages without a value.
+
+    Pages with several values of a multi-select property belong to
+    several shards, and are only yielded once by `parallel_query`.
+    """
+
+    schema = _schema(database)
+    if name not in schema:
+        raise KeyError("Database has no property {name!r}".format(name=name))
+    property_type = schema[name]["type"]
+    if property_type == PropertyType.CHECKBOX.value:
+        return [{"property": name, "checkbox": {"equals": value}} for value in (True, False)]
+    if property_type == PropertyType.SELECT.value:
+        operator = "equals"
+    elif property_type == PropertyType.MULTI_SELECT.value:
+        operator = "contains"
+    else:
+        raise ValueError(
+            "Property {name!r} of type {type} cannot be sharded".format(
+                name=name, type=property_type
+            )
+        )
+    options = schema[name][property_type].get("options", None) or []
+    shards = [
+        {"property": name, property_type: {operator: option["name"]}}
+        for option in options
+        if option.get("name", None)
+    ]
+    shards.append({"property": name, property_type: {"is_empty": True}})
+    return shards
+
+
+def _combine(filter: Optional[Filter], shard: Filter) -> Optional[Filter]:
+    if not shard:
+        return filter
+    if not filter:
+        return shard
+    return {"and": [filter, shard]}
+
+
+async def parallel_query(
+    client: "NotionAsyncClient",
+    database_id: str,
+    shards: Sequence[Filter],
+    concurrency: int = 4,
+    page_size: int = 100,
+    **kwargs: Any,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yields the raw pages of a database, querying the `shards` built by
+    `created_time_shards` or `property_shards` concurrently:
+
+        database = await notion.databases.retrieve(database_id)
+        shards = property_shards(database, "Status")
+        async for page in parallel_query(notion, database_id, shards, concurrency=4):
+            ...
+
+    Up to `concurrency` shards are paginated at the same time, each by a
+    single chain of requests since cursors are sequential. Pages are
+    yielded in the order they are received, once even if they belong to
+    several shards. `filter` is combined with the filter of each shard,
+    and `sorts` applies within each shard only.
+    """
+
+    path = "databases/{id}/query".format(id=database_id)
+    remaining: "asyncio.Queue[Filter]" = asyncio.Queue()
+    for shard in shards:
+        remaining.put_nowait(shard)
+    # Results of each response, the error of a failed worker, or None when
+    # a worker is done.
+    results: "asyncio.Queue[Union[List[Dict[str, Any]], Exception, None]]" = asyncio.Queue(
+        maxsize=concurrency * 2
+    )
+
+    async def scan() -> None:
+        try:
+            while not remaining.empty():
+                shard = remaining.get_nowait()
+                body: Dict[str, Any] = {"page_size": page_size}
+                shard_filter = _combine(kwargs.get("filter", None), shard)
+                if shard_filter:
+                    body["filter"] = shard_filter
+                if kwargs.get("sorts", None):
+                    body["sorts"] = kwargs["sorts"]
+                while True:
+                    response = await client.request(
+                        "POST", path, auth=kwargs.get("auth", None), body=body
+                    )
+                    await results.put(response["results"])
+                    if not response.get("next_cursor", None):
+                        break
+                    body["start_cursor"] = response["next_cursor"]
+        except Exception as error:
+            await results.put(error)
+        else:
+            await results.put(None)
+
+    workers = [asyncio.ensure_future(scan()) for _ in range(max(min(concurrency, len(shards)), 1))]
+    seen: Set[str] = set()
+    running = len(workers)
+    try:
+        while running:
+            batch = await results.get()
+            if batch is None:
+                running -= 1
+            elif isinstance(batch, Exception):
+                raise batch
+            else:
+                for page in batch:
+                    if page["id"] not in seen:
+                        seen.add(page["id"])
+                        yield page
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,141 @@
+import json
+import sys
+
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+
+try:
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:  # pragma: no cover
+    # Python 3.7
+    SharedMemory = None  # type: ignore
+
+try:
+    from orjson import loads
+except ImportError:  # pragma: no cover
+
+    def loads(content: Any) -> Any:  # type: ignore
+        return json.loads(bytes(content))
+
+
+SHARED_MEMORY_AVAILABLE = SharedMemory is not None
+
+
+class SharedSlice(NamedTuple):
+    # Name of the shared memory block, and position of the data in it.
+    name: str
+    offset: int
+    length: int
+
+
+class SharedMemoryRing:
+    """
+    Ring buffer in a shared memory block of `size` bytes, passing response
+    bodies to worker processes without pickling them.
+
+    The producer copies each body into the ring with `write` and sends the
+    returned `SharedSlice` to a worker, which decodes it in place with
+    `read_results`. Slices are released in the order they were written,
+    once their results have been received, with `release`. Requires
+    Python 3.8.
+    """
+
+    def __init__(self, size: int = 64 * 1024 * 1024) -> None:
+        if SharedMemory is None:
+            raise RuntimeError("Shared memory requires Python 3.8 or later.")
+        self.size = size
+        self._memory = SharedMemory(create=True, size=size)
+        self._regions: Deque[Tuple[int, int]] = deque()
+        self._head = 0
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def _allocate(self, length: int) -> Optional[int]:
+        if not self._regions:
+            return 0 if length <= self.size else None
+        tail = self._regions[0][0]
+        if self._head > tail:
+            if self._head + length <= self.size:
+                return self._head
+            return 0 if length <= tail else None
+        if self._head + length <= tail:
+            return self._head
+        return None
+
+    def write(self, content: bytes) -> Optional[SharedSlice]:
+        """
+        Copies `content` into the ring, or returns `None` when there is not
+        enough free space until slices are released.
+        """
+
+        length = len(content)
+        offset = self._allocate(length)
+        if offset is None:
+            return None
+        self._memory.buf[offset : offset + length] = content
+        self._regions.append((offset, length))
+        self._head = offset + length
+        return SharedSlice(self._memory.name, offset, length)
+
+    def release(self) -> None:
+        """
+        Frees the oldest slice written.
+        """
+
+        self._regions.popleft()
+        if not self._regions:
+            self._head = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._regions)
+
+    def close(self) -> None:
+        self._regions.clear()
+        self._memory.close()
+        self._memory.unlink()
+
+
+# Blocks attached by a worker process, the least recently used being
+# closed once there are more than MAX_ATTACHED, e.g. after exports ended.
+MAX_ATTACHED = 8
+_attached: "OrderedDict[str, Any]" = OrderedDict()
+
+
+def _attach(name: str) -> Any:
+    memory = _attached.get(name, None)
+    if memory is not None:
+        _attached.move_to_end(name)
+    else:
+        # Workers share the resource tracker of the process that created
+        # the block, which unlinks it, so attaching does not track it again.
+        if sys.version_info >= (3, 13):
+            memory = SharedMemory(name=name, track=False)
+        else:
+            memory = SharedMemory(name=name)
+        _attached[name] = memory
+        while len(_attached) > MAX_ATTACHED:
+            _attached.popitem(last=False)[1].close()
+    return memory
+
+
+def read_results(
+    shared: SharedSlice, transform: Optional[Callable[[Dict[str, Any]], Any]] = None
+) -> List[Any]:
+    """
+    Decodes the results of a list response written in a `SharedMemoryRing`,
+    applying `transform` to each of them. Bodies are decoded in place with
+    orjson when it is installed, and copied first otherwise.
+    """
+
+    view = _attach(shared.name).buf[shared.offset : shared.offset + shared.length]
+    try:
+        results = loads(view)["results"]
+    finally:
+        view.release()
+    if transform is None:
+        return results
+    return [transform(result) for result in results]
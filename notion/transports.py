@@ -0,0 +1,200 @@
+import asyncio
+import gzip
+import json
+import threading
+import time
+
+from collections import defaultdict, deque
+from typing import IO, Any, Deque, Dict, List, Optional, Union
+
+from httpx import (
+    AsyncBaseTransport,
+    AsyncHTTPTransport,
+    BaseTransport,
+    HTTPTransport,
+    Request,
+    Response,
+)
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")  # type: ignore
+    return open(path, mode, encoding="utf-8")
+
+
+def _request_key(method: str, url: str, content: bytes) -> str:
+    body = ""
+    if content:
+        try:
+            body = json.dumps(json.loads(content), sort_keys=True, separators=(",", ":"))
+        except ValueError:
+            body = content.decode("utf-8", "replace")
+    return "{method} {url} {body}".format(method=method, url=url, body=body)
+
+
+def _body(content: bytes) -> Dict[str, Any]:
+    # Bodies are stored as JSON, or as text when they are not JSON, like
+    # the HTML error pages of proxies.
+    if not content:
+        return {"body": None}
+    try:
+        return {"body": json.loads(content)}
+    except ValueError:
+        return {"text": content.decode("utf-8", "replace")}
+
+
+def _url(request: Request) -> str:
+    return request.url.raw_path.decode("ascii")
+
+
+class RecordingTransport(BaseTransport, AsyncBaseTransport):
+    """
+    Transport sending requests through `transport` and appending every
+    request/response pair to the cassette at `path`.
+
+    The cassette is a JSON Lines file, gzip compressed when `path` ends
+    with `.gz`. Headers of the requests, including `Authorization`, are
+    never written. Works with both `NotionClient` and `NotionAsyncClient`:
+
+        with NotionClient(auth="token", transport=RecordingTransport("run.jsonl.gz")) as notion:
+            ...
+
+    Entries are kept in memory and appended to the cassette every
+    `buffer_size` requests, and when the transport is closed with its
+    client.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        transport: Optional[Union[BaseTransport, AsyncBaseTransport]] = None,
+        buffer_size: int = 1000,
+    ) -> None:
+        self.path = path
+        self.transport = transport
+        self.buffer_size = buffer_size
+        self._entries: List[str] = []
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: Request) -> Response:
+        if self.transport is None:
+            self.transport = HTTPTransport()
+        started = time.perf_counter()
+        response = self.transport.handle_request(request)  # type: ignore
+        response.read()
+        self._record(request, response, time.perf_counter() - started)
+        return response
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if self.transport is None:
+            self.transport = AsyncHTTPTransport()
+        started = time.perf_counter()
+        response = await self.transport.handle_async_request(request)  # type: ignore
+        await response.aread()
+        self._record(request, response, time.perf_counter() - started)
+        return response
+
+    def _record(self, request: Request, response: Response, elapsed: float) -> None:
+        # Responses are stored decoded, so the content encoding is dropped.
+        content = response.content
+        entry = {
+            "method": request.method,
+            "url": _url(request),
+            "request": json.loads(request.content) if request.content else None,
+            "status": response.status_code,
+            "headers": {
+                key: value
+                for key, value in response.headers.items()
+                if key.lower() in ("content-type", "retry-after")
+            },
+            **_body(content),
+            "elapsed": round(elapsed, 6),
+        }
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._entries.append(line)
+            full = len(self._entries) >= self.buffer_size
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Appends the entries recorded so far to the cassette.
+        """
+
+        with self._lock:
+            entries, self._entries = self._entries, []
+            if entries:
+                with _open(self.path, "a") as cassette:
+                    cassette.writelines(entries)
+
+    def close(self) -> None:
+        self.flush()
+        if isinstance(self.transport, BaseTransport):
+            self.transport.close()
+
+    async def aclose(self) -> None:
+        self.flush()
+        if isinstance(self.transport, AsyncBaseTransport):
+            await self.transport.aclose()
+
+
+class ReplayTransport(BaseTransport, AsyncBaseTransport):
+    """
+    Transport answering requests from a cassette written by
+    `RecordingTransport`, without any network access.
+
+    Requests are matched on method, URL and JSON body. When the same
+    request was recorded several times, its responses are replayed in
+    order and the last one is repeated. With `preserve_timing`, each
+    response is delayed by the time it originally took.
+    """
+
+    def __init__(self, path: str, preserve_timing: bool = False) -> None:
+        self.path = path
+        self.preserve_timing = preserve_timing
+        self._responses: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+        with _open(path, "r") as cassette:
+            for line in cassette:
+                entry = json.loads(line)
+                request = entry["request"]
+                key = _request_key(
+                    entry["method"],
+                    entry["url"],
+                    json.dumps(request).encode() if request is not None else b"",
+                )
+                body = entry.get("body", None)
+                if "text" in entry:
+                    entry["content"] = entry["text"].encode()
+                else:
+                    entry["content"] = json.dumps(body).encode() if body is not None else b""
+                self._responses[key].append(entry)
+        self._lock = threading.Lock()
+
+    def _next(self, request: Request) -> Dict[str, Any]:
+        key = _request_key(request.method, _url(request), request.read())
+        with self._lock:
+            entries = self._responses.get(key, None)
+            if not entries:
+                raise LookupError(
+                    "No recorded response for {method} {url} in {path}".format(
+                        method=request.method, url=_url(request), path=self.path
+                    )
+                )
+            return entries.popleft() if len(entries) > 1 else entries[0]
+
+    def _response(self, entry: Dict[str, Any]) -> Response:
+        return Response(entry["status"], headers=entry["headers"], content=entry["content"])
+
+    def handle_request(self, request: Request) -> Response:
+        entry = self._next(request)
+        if self.preserve_timing:
+            time.sleep(entry["elapsed"])
+        return self._response(entry)
+
+    async def handle_async_request(self, request: Request) -> Response:
+        entry = self._next(request)
+        if self.preserve_timing:
+            await asyncio.sleep(entry["elapsed"])
+        return self._response(entry)
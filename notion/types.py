@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from enum import Enum
-from typing import Dict, Generic, List, Optional, TypeVar, Union
+from typing import Any, Dict, Generic, List, NamedTuple, Optional, Tuple, TypeVar, Union
 
 from pydantic import BaseModel, Field
 from pydantic.generics import GenericModel
@@ -864,6 +864,15 @@ class LastEditedByPropertyValue(PropertyValueBase):
     last_edited_by: User
 
 
+class PageReference(BaseModel):
+    id: str
+
+
+class RelationPropertyValue(PropertyValueBase):
+    type: PropertyValueType = Field(PropertyValueType.RELATION, const=True)
+    relation: List[PageReference]
+
+
 class ExternalFileWithName(ExternalFile):
     name: str
 
@@ -893,9 +902,32 @@ PropertyValue = TypeVar(
     CreatedByPropertyValue,
     LastEditedTimePropertyValue,
     LastEditedByPropertyValue,
+    RelationPropertyValue,
     FilesPropertyInputValue,
 )
 
+PROPERTY_VALUE_MAPPING: Dict[PropertyValueType, PropertyValue] = {
+    PropertyValueType.TITLE: TitlePropertyValue,
+    PropertyValueType.RICH_TEXT: RichTextPropertyValue,
+    PropertyValueType.NUMBER: NumberPropertyValue,
+    PropertyValueType.SELECT: SelectPropertyValue,
+    PropertyValueType.MULTI_SELECT: MultiSelectPropertyValue,
+    PropertyValueType.DATE: DatePropertyValue,
+    PropertyValueType.FORMULA: FormulaPropertyValue,
+    PropertyValueType.ROLLUP: RollupPropertyValue,
+    PropertyValueType.PEOPLE: PeoplePropertyValue,
+    PropertyValueType.FILES: FilesPropertyValue,
+    PropertyValueType.CHECKBOX: CheckboxPropertyValue,
+    PropertyValueType.URL: URLPropertyValue,
+    PropertyValueType.EMAIL: EmailPropertyValue,
+    PropertyValueType.PHONE_NUMBER: PhoneNumberPropertyValue,
+    PropertyValueType.CREATED_TIME: CreatedTimePropertyValue,
+    PropertyValueType.CREATED_BY: CreatedByPropertyValue,
+    PropertyValueType.LAST_EDITED_TIME: LastEditedTimePropertyValue,
+    PropertyValueType.LAST_EDITED_BY: LastEditedByPropertyValue,
+    PropertyValueType.RELATION: RelationPropertyValue,
+}
+
 InputPropertyValueWithRequiredId = TypeVar(
     "InputPropertyValueWithRequiredId",
     TitleInputPropertyValue,
@@ -937,6 +969,22 @@ class Page(BaseModel):
     url: HttpUrl
 
 
+PageOrDatabase = Union[Page, Database]
+
+
+class PageRow(NamedTuple):
+    """
+    Page reduced to a selection of its properties.
+
+    `values` holds the decoded property values in the order they were
+    requested, with `None` for properties missing from the page.
+    """
+
+    id: str
+    last_edited_time: datetime
+    values: Tuple[Optional[Any], ...]
+
+
 class TitlePropertySchema(BaseModel):
     title: Dict = Field({}, const=True)
 
@@ -0,0 +1,20 @@
+import pytest
+
+from notion import NotionAsyncClient, NotionClient
+from notion.mock import MockNotionServer
+
+
+@pytest.fixture
+def server() -> MockNotionServer:
+    return MockNotionServer()
+
+
+@pytest.fixture
+def client(server: MockNotionServer) -> NotionClient:
+    with NotionClient(auth="secret", transport=server.transport()) as client:
+        yield client
+
+
+@pytest.fixture
+def async_client(server: MockNotionServer) -> NotionAsyncClient:
+    return NotionAsyncClient(auth="secret", transport=server.async_transport())
@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+from notion import NotionClient
+from notion.breaker import CircuitBreaker, CircuitState, endpoint_key
+from notion.errors import CircuitOpenError, HTTPResponseError
+from notion.mock import MockNotionServer
+
+
+PATH = "pages/c0ffee00-0000-4000-8000-000000000000"
+
+
+def test_endpoint_key_replaces_ids() -> None:
+    assert endpoint_key("GET", "/" + PATH + "/") == "GET pages/{id}"
+
+
+def test_client_fails_fast_once_open(server: MockNotionServer) -> None:
+    database_id = server.add_database(rows=1)
+    page_id = server.children[database_id][0]
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=60)
+    client = NotionClient(auth="secret", transport=server.transport(), circuit_breaker=breaker)
+    server.fail_next(503, count=2)
+
+    for _ in range(2):
+        with pytest.raises(HTTPResponseError):
+            client.pages.retrieve(page_id)
+    with pytest.raises(CircuitOpenError):
+        client.pages.retrieve(page_id)
+
+    assert len(server.requests) == 2
+    assert client.databases.retrieve(database_id).id == database_id
+
+
+def test_probe_closes_circuit_after_cooldown() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0.01)
+    breaker.release(breaker.acquire("GET", PATH), True)
+    assert breaker.state("GET", PATH) == CircuitState.OPEN
+    time.sleep(0.02)
+
+    probe = breaker.acquire("GET", PATH)
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire("GET", PATH)
+    breaker.release(probe, False)
+
+    assert breaker.state("GET", PATH) == CircuitState.CLOSED
+
+
+def test_late_success_does_not_close_open_circuit() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=60)
+    slow = breaker.acquire("GET", PATH)
+    breaker.release(breaker.acquire("GET", PATH), True)
+
+    breaker.release(slow, False)
+
+    assert breaker.state("GET", PATH) == CircuitState.OPEN
+
+
+def test_only_probes_free_probe_slots() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0.01)
+    slow = breaker.acquire("GET", PATH)
+    breaker.release(breaker.acquire("GET", PATH), True)
+    time.sleep(0.02)
+    probe = breaker.acquire("GET", PATH)
+
+    breaker.release(slow, None)
+
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire("GET", PATH)
+    breaker.release(probe, True)
+    assert breaker.state("GET", PATH) == CircuitState.OPEN
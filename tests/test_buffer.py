@@ -0,0 +1,135 @@
+import asyncio
+import threading
+
+from typing import Any, Dict
+
+import pytest
+
+from notion import NotionAsyncClient, NotionClient
+from notion.buffer import AsyncPageUpdateBuffer, PageUpdateBuffer
+from notion.errors import APIResponseError
+from notion.mock import MockNotionServer
+
+
+def title(name: str) -> Dict[str, Any]:
+    return {"Name": {"title": [{"text": {"content": name}}]}}
+
+
+def name(server: MockNotionServer, page_id: str) -> str:
+    return server.pages[page_id]["properties"]["Name"]["title"][0]["plain_text"]
+
+
+def test_updates_of_a_page_are_merged(server: MockNotionServer, client: NotionClient) -> None:
+    database_id = server.add_database(rows=2, columns=4)
+    page_id = server.children[database_id][0]
+
+    with PageUpdateBuffer(client, flush_interval=60) as buffer:
+        buffer.update(page_id, properties=title("First"))
+        buffer.update(page_id, properties={"Column 2": {"number": 3}})
+        buffer.update(page_id, properties=title("Last"))
+
+    assert (buffer.updates, buffer.writes) == (3, 1)
+    assert server.requests.count(("PATCH", "/v1/pages/" + page_id)) == 1
+    assert name(server, page_id) == "Last"
+    assert server.pages[page_id]["properties"]["Column 2"]["number"] == 3
+
+
+def test_full_buffer_is_flushed(server: MockNotionServer, client: NotionClient) -> None:
+    database_id = server.add_database(rows=5)
+    buffer = PageUpdateBuffer(client, flush_interval=60, max_pending=5)
+
+    for page_id in server.children[database_id]:
+        buffer.update(page_id, properties=title("Done"))
+    buffer.close()
+
+    assert buffer.writes == 5
+
+
+def test_batch_is_kept_when_pool_is_closed(server: MockNotionServer) -> None:
+    database_id = server.add_database(rows=3)
+    page_ids = server.children[database_id]
+    client = NotionClient(auth="secret", transport=server.transport())
+    client.map(lambda value: value, [1])
+    client._pool().shutdown()
+    buffer = PageUpdateBuffer(client, flush_interval=60)
+    for page_id in page_ids:
+        buffer.update(page_id, properties=title("Kept"))
+
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+    assert buffer.pending == 3
+
+    # On close, the updates are written from the calling thread.
+    buffer.close()
+    assert [name(server, page_id) for page_id in page_ids] == ["Kept"] * 3
+
+
+@pytest.mark.parametrize("at_exit", [False, True])
+def test_close_writes_on_the_thread_pool(
+    server: MockNotionServer, client: NotionClient, at_exit: bool
+) -> None:
+    database_id = server.add_database(rows=4)
+    page_ids = server.children[database_id]
+    buffer = PageUpdateBuffer(client, flush_interval=60)
+    for page_id in page_ids:
+        buffer.update(page_id, properties=title("Closed"))
+    threads = set()
+    request = client.request
+
+    def record(*args: Any, **kwargs: Any) -> Any:
+        threads.add(threading.current_thread())
+        return request(*args, **kwargs)
+
+    client.request = record  # type: ignore
+    if at_exit:
+        buffer._close_at_exit()
+    else:
+        buffer.close()
+
+    assert [name(server, page_id) for page_id in page_ids] == ["Closed"] * 4
+    assert (threading.current_thread() in threads) is at_exit
+
+
+def test_retryable_failures_are_retried_on_close(
+    server: MockNotionServer, client: NotionClient
+) -> None:
+    database_id = server.add_database(rows=1)
+    page_id = server.children[database_id][0]
+    buffer = PageUpdateBuffer(client, flush_interval=0.01)
+    buffer.update(page_id, properties=title("Retried"))
+    server.fail_next(503, count=2)
+
+    with pytest.raises(APIResponseError):
+        buffer.close()
+
+    assert buffer.pending == 0
+    assert name(server, page_id) == "Retried"
+
+
+def test_retries_are_bounded_on_close(server: MockNotionServer, client: NotionClient) -> None:
+    database_id = server.add_database(rows=1)
+    page_id = server.children[database_id][0]
+    buffer = PageUpdateBuffer(client, flush_interval=0.01, max_retries=2)
+    buffer.update(page_id, properties=title("Lost"))
+    server.fail_next(503, count=10)
+
+    with pytest.raises(APIResponseError):
+        buffer.close()
+
+    assert buffer.pending == 1
+
+
+def test_async_buffer(server: MockNotionServer, async_client: NotionAsyncClient) -> None:
+    database_id = server.add_database(rows=3)
+    page_ids = server.children[database_id]
+
+    async def main() -> AsyncPageUpdateBuffer:
+        async with AsyncPageUpdateBuffer(async_client, flush_interval=60) as buffer:
+            for page_id in page_ids:
+                buffer.update(page_id, properties=title("Async"))
+                buffer.update(page_id, archived=False)
+        return buffer
+
+    buffer = asyncio.run(main())
+    assert buffer.writes == 3
+    assert [name(server, page_id) for page_id in page_ids] == ["Async"] * 3
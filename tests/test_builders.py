@@ -0,0 +1,67 @@
+from datetime import date
+from typing import Any, Dict
+
+import pytest
+
+from notion import NotionClient
+from notion.builders import PagePayloadBuilder
+from notion.mock import MockNotionServer
+
+
+@pytest.fixture
+def database(server: MockNotionServer) -> Dict[str, Any]:
+    database_id = server.add_database(columns=6)
+    server.databases[database_id]["properties"]["Stage"] = {
+        "id": "stage",
+        "name": "Stage",
+        "type": "status",
+        "status": {},
+    }
+    return server.databases[database_id]
+
+
+def test_build_creates_page(server: MockNotionServer, client: NotionClient) -> None:
+    database_id = server.add_database(columns=6)
+    builder = PagePayloadBuilder(client.databases.retrieve(database_id))
+
+    page = client.pages.create(
+        **builder.build(
+            {"Name": "Task", "Status": "Option 1", "Due": date(2021, 5, 1), "Column 2": 3}
+        )
+    )
+
+    properties = server.pages[page.id]["properties"]
+    assert properties["Name"]["title"][0]["plain_text"] == "Task"
+    assert properties["Status"]["select"] == {"name": "Option 1"}
+    assert properties["Due"]["date"] == {"start": "2021-05-01", "end": None}
+    assert properties["Column 2"]["number"] == 3
+
+
+def test_rows_in_column_order(database: Dict[str, Any]) -> None:
+    builder = PagePayloadBuilder(database, columns=["Name", "Column 3"])
+
+    assert builder.properties(["Task", True]) == {
+        "Name": {"title": [{"type": "text", "text": {"content": "Task"}}]},
+        "Column 3": {"checkbox": True},
+    }
+    with pytest.raises(ValueError):
+        builder.properties(["Task"])
+
+
+def test_none_text_is_empty(database: Dict[str, Any]) -> None:
+    builder = PagePayloadBuilder(database)
+
+    assert builder.properties({"Column 4": None}) == {"Column 4": {"rich_text": []}}
+
+
+def test_unsupported_property_only_fails_when_set(database: Dict[str, Any]) -> None:
+    builder = PagePayloadBuilder(database)
+
+    assert builder.properties({"Name": "Task"})
+    assert builder.properties({"Stage": {"status": {"name": "Done"}}}) == {
+        "Stage": {"status": {"name": "Done"}}
+    }
+    with pytest.raises(ValueError):
+        builder.properties({"Stage": "Done"})
+    with pytest.raises(KeyError):
+        builder.properties({"Missing": "value"})
@@ -0,0 +1,112 @@
+import subprocess
+import sys
+import threading
+import warnings
+
+import pytest
+
+from notion import NotionAsyncClient, NotionClient
+from notion import client as client_module
+from notion.mock import MockNotionServer
+
+
+def test_map_returns_results_in_order(server: MockNotionServer, client: NotionClient) -> None:
+    database_id = server.add_database(rows=20)
+    page_ids = server.children[database_id]
+
+    pages = client.map(client.pages.retrieve, page_ids)
+
+    assert [page.id for page in pages] == page_ids
+
+
+def test_client_shared_between_threads() -> None:
+    server = MockNotionServer(latency=0.001)
+    database_id = server.add_database(rows=50)
+    page_ids = server.children[database_id]
+    client = NotionClient(auth="secret", transport=server.transport(), pool_size=4)
+    errors = []
+    results = {}
+
+    def work(index: int) -> None:
+        try:
+            # Half of the threads go through the shared pool, the others
+            # send requests directly.
+            if index % 2:
+                pages = client.map(client.pages.retrieve, page_ids)
+            else:
+                pages = [client.pages.retrieve(page_id) for page_id in page_ids]
+            results[index] = [page.id for page in pages]
+        except Exception as error:  # pragma: no cover
+            errors.append(error)
+
+    threads = [threading.Thread(target=work, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    client.close()
+
+    assert not errors
+    assert all(result == page_ids for result in results.values())
+    assert client.metrics.requests == 8 * len(page_ids)
+    assert client.metrics.errors == 0
+
+
+def test_concurrent_map_creates_a_single_pool(server: MockNotionServer) -> None:
+    client = NotionClient(auth="secret", transport=server.transport())
+    barrier = threading.Barrier(8)
+    pools = []
+
+    def work() -> None:
+        barrier.wait()
+        client.map(lambda value: value, range(4))
+        pools.append(client._executor)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    client.close()
+
+    assert len(pools) == 8
+    assert len({id(pool) for pool in pools}) == 1
+
+
+def test_import_is_lazy() -> None:
+    code = (
+        "import sys, notion; before = 'notion.types' in sys.modules; "
+        "client = notion.NotionClient(auth='secret'); client.users; "
+        "print(before, 'notion.types' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert output.split() == ["False", "True"]
+
+
+@pytest.mark.parametrize("available", [True, False])
+def test_http2_falls_back_without_h2(monkeypatch: pytest.MonkeyPatch, available: bool) -> None:
+    monkeypatch.setattr(client_module, "HTTP2_AVAILABLE", available)
+    client = NotionClient(auth="secret")
+    client.http2 = True
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        # Reads the options the httpx client would be built with.
+        options = client._create_http_client(lambda **kwargs: kwargs)
+    client.close()
+
+    assert options.get("http2", False) is available
+    assert len(caught) == (0 if available else 1)
+    assert all("falling back to HTTP/1.1" in str(warning.message) for warning in caught)
+
+
+def test_http2_option_warns_without_h2(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(client_module, "HTTP2_AVAILABLE", False)
+
+    with pytest.warns(UserWarning, match="h2"):
+        client = NotionAsyncClient(auth="secret", http2=True)
+
+    assert not client.http_client.is_closed
@@ -0,0 +1,140 @@
+import asyncio
+import time
+
+import pytest
+
+from notion import NotionAsyncClient, NotionClient
+from notion.deadlines import deadline, gather, remaining
+from notion.errors import APIResponseError, DeadlineExceededError
+from notion.helpers import async_collect_paginated_api, collect_paginated_api
+from notion.mock import MockNotionServer
+from notion.ratelimit import RateLimiter
+from notion.scheduler import PriorityScheduler
+
+
+def test_remaining_is_none_without_deadline() -> None:
+    assert remaining() is None
+    with deadline(10.0):
+        with deadline(20.0):
+            left = remaining()
+            assert left is not None and left <= 10.0
+    assert remaining() is None
+
+
+def test_collect_returns_partial_results() -> None:
+    server = MockNotionServer(latency=0.02)
+    database_id = server.add_database(rows=500)
+    client = NotionClient(auth="secret", transport=server.transport())
+
+    with pytest.raises(DeadlineExceededError) as info:
+        with deadline(0.05):
+            collect_paginated_api(client.databases.query, database_id=database_id, page_size=10)
+
+    assert 0 < len(info.value.results) < 500
+
+
+def test_async_collect_returns_partial_results() -> None:
+    server = MockNotionServer(latency=0.02)
+    database_id = server.add_database(rows=500)
+    client = NotionAsyncClient(auth="secret", transport=server.async_transport())
+
+    async def main() -> None:
+        with deadline(0.05):
+            await async_collect_paginated_api(
+                client.databases.query, database_id=database_id, page_size=10
+            )
+
+    with pytest.raises(DeadlineExceededError) as info:
+        asyncio.run(main())
+    assert 0 < len(info.value.results) < 500
+
+
+def test_async_request_is_cancelled_at_deadline() -> None:
+    server = MockNotionServer(latency=1.0)
+    user_id = server.add_user()
+    client = NotionAsyncClient(auth="secret", transport=server.async_transport())
+
+    async def main() -> None:
+        with deadline(0.1):
+            await client.users.retrieve(user_id)
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(main())
+
+    assert time.monotonic() - started < 0.5
+    assert client.metrics.requests == 1
+
+
+def test_rate_limiter_wait_is_bounded_by_deadline(server: MockNotionServer) -> None:
+    database_id = server.add_database(rows=1)
+    client = NotionClient(auth="secret", transport=server.transport(), rate_limit=1.0)
+    client.databases.retrieve(database_id)
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        with deadline(0.2):
+            client.databases.retrieve(database_id)
+
+    assert time.monotonic() - started < 0.5
+    assert len(server.requests) == 1
+
+
+def test_rate_limiter_timeout_keeps_token() -> None:
+    limiter = RateLimiter(rate=1.0)
+
+    assert limiter.acquire()
+    assert not limiter.acquire(timeout=0.1)
+    assert limiter.reserve() == pytest.approx(1.0, abs=0.05)
+
+
+def test_scheduler_timeout() -> None:
+    scheduler = PriorityScheduler(rate=2.0, burst=1)
+
+    assert scheduler.acquire(timeout=1.0)
+    started = time.monotonic()
+    assert not scheduler.acquire(timeout=0.1)
+    assert time.monotonic() - started < 0.2
+    assert scheduler.acquire(timeout=1.0)
+
+
+def test_scheduler_async_timeout() -> None:
+    scheduler = PriorityScheduler(rate=2.0, burst=1)
+
+    async def main() -> bool:
+        await scheduler.acquire_async()
+        return await scheduler.acquire_async(timeout=0.1)
+
+    assert not asyncio.run(main())
+
+
+def test_map_cancels_pending_calls(server: MockNotionServer) -> None:
+    database_id = server.add_database(rows=20)
+    page_ids = ["missing", *server.children[database_id]]
+    client = NotionClient(auth="secret", transport=server.transport(), pool_size=1)
+
+    with pytest.raises(APIResponseError):
+        client.map(client.pages.retrieve, page_ids)
+
+    assert len(server.requests) < len(page_ids)
+
+
+def test_gather_cancels_running_tasks() -> None:
+    cancelled = []
+
+    async def slow() -> None:
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def fail() -> None:
+        raise ValueError()
+
+    async def main() -> None:
+        await gather(slow(), fail())
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
+    assert cancelled == [True]
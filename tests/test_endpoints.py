@@ -0,0 +1,178 @@
+import asyncio
+import gzip
+
+from typing import Any, Dict
+
+import pytest
+
+from httpx import ByteStream, MockTransport, Request, Response
+
+from notion import APIErrorCode, APIResponseError, NotionAsyncClient, NotionClient
+from notion.helpers import async_collect_paginated_api, collect_paginated_api
+from notion.mock import MockNotionServer
+from notion.types import BotUser, Database, Page, PersonUser
+
+
+def title(name: str) -> Dict[str, Any]:
+    return {"Name": {"title": [{"text": {"content": name}}]}}
+
+
+def test_databases(server: MockNotionServer, client: NotionClient) -> None:
+    database_id = server.add_database(rows=150, columns=4)
+
+    database = client.databases.retrieve(database_id)
+    pages = collect_paginated_api(client.databases.query, database_id=database_id)
+    databases = client.databases.list()
+
+    assert isinstance(database, Database)
+    assert set(database.properties) == {"Name", "Status", "Due", "Column 2"}
+    assert [page.id for page in pages] == server.children[database_id]
+    assert [database.id for database in databases.results] == [database_id]
+
+
+def test_query_filter(server: MockNotionServer, client: NotionClient) -> None:
+    database_id = server.add_database(rows=40, columns=5)
+
+    pages = client.databases.query(
+        database_id, filter={"property": "Column 3", "checkbox": {"equals": True}}
+    ).results
+
+    expected = [
+        page_id
+        for page_id in server.children[database_id]
+        if server.pages[page_id]["properties"]["Column 3"]["checkbox"]
+    ]
+    assert [page.id for page in pages] == expected
+
+
+def test_query_rows(server: MockNotionServer, client: NotionClient) -> None:
+    database_id = server.add_database(rows=3, columns=4)
+    page_id = server.children[database_id][0]
+
+    rows = client.databases.query_rows(database_id, ["Name", "Missing"]).results
+    row = client.pages.retrieve_row(page_id, ["Column 2"])
+
+    assert [row.id for row in rows] == server.children[database_id]
+    assert rows[0].values[1] is None
+    assert row.values[0].number == server.pages[page_id]["properties"]["Column 2"]["number"]
+
+
+def test_pages(server: MockNotionServer, client: NotionClient) -> None:
+    database_id = server.add_database()
+
+    page = client.pages.create(parent={"database_id": database_id}, properties=title("Created"))
+    updated = client.pages.update(page.id, properties=title("Updated"))
+    archived = client.pages.update(page.id, archived=True)
+
+    assert isinstance(page, Page)
+    assert updated.properties["Name"].title[0].plain_text == "Updated"
+    assert archived.archived
+    assert client.databases.query(database_id).results == []
+
+
+def test_blocks(server: MockNotionServer, client: NotionClient) -> None:
+    database_id = server.add_database(rows=1)
+    page_id = server.children[database_id][0]
+    server.add_blocks(page_id, 3)
+
+    blocks = client.blocks.children.list(page_id).results
+    appended = client.blocks.children.append(
+        page_id,
+        children=[{"paragraph": {"text": [{"text": {"content": "Inserted"}}]}}],
+        after=blocks[0].id,
+    ).results
+    updated = client.blocks.update(
+        blocks[1].id, paragraph={"text": [{"text": {"content": "Updated"}}]}
+    )
+    client.blocks.delete(blocks[2].id)
+
+    children = client.blocks.children.list(page_id).results
+    assert [block.id for block in children] == [blocks[0].id, appended[0].id, blocks[1].id]
+    assert client.blocks.retrieve(updated.id).id == blocks[1].id
+    assert server.blocks[blocks[2].id]["archived"]
+
+
+def test_users(server: MockNotionServer, client: NotionClient) -> None:
+    person_id = server.add_user("Person")
+    bot_id = server.add_user("Bot", bot=True)
+
+    users = client.users.list().results
+
+    assert [user.id for user in users] == [person_id, bot_id]
+    assert isinstance(client.users.retrieve(person_id), PersonUser)
+    assert isinstance(client.users.retrieve(bot_id), BotUser)
+
+
+def test_search(server: MockNotionServer, client: NotionClient) -> None:
+    database_id = server.add_database(rows=2, title="Tasks")
+
+    databases = client.search(query="tasks", filter={"property": "object", "value": "database"})
+    everything = client.search()
+
+    assert [result.id for result in databases.results] == [database_id]
+    assert len(everything.results) == 3
+
+
+def test_errors(server: MockNotionServer, client: NotionClient) -> None:
+    with pytest.raises(APIResponseError) as info:
+        client.pages.retrieve("c0ffee00-0000-4000-8000-000000000000")
+    assert info.value.code == APIErrorCode.OBJECT_NOT_FOUND
+    assert info.value.status == 404
+
+    server.fail_next(429)
+    with pytest.raises(APIResponseError) as info:
+        client.users.list()
+    assert info.value.code == APIErrorCode.RATE_LIMITED
+
+
+def test_metrics(server: MockNotionServer) -> None:
+    encodings = []
+
+    def handle(request: Request) -> Response:
+        # Sends the responses of the mock server compressed with gzip.
+        encodings.append(request.headers["Accept-Encoding"])
+        response = server.handle(request)
+        return Response(
+            response.status_code,
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            stream=ByteStream(gzip.compress(response.content)),
+        )
+
+    client = NotionClient(auth="secret", transport=MockTransport(handle))
+    records = []
+    client.metrics.subscribe(records.append)
+    server.fail_next(500)
+    server.add_database(rows=20)
+
+    with pytest.raises(APIResponseError):
+        client.users.list()
+    client.databases.list()
+
+    assert (client.metrics.requests, client.metrics.errors) == (2, 1)
+    assert [record.status for record in records] == [500, 200]
+    assert all("gzip" in encoding.split(", ") for encoding in encodings)
+    assert 0 < records[1].bytes_received < records[1].bytes_decoded
+    assert client.metrics.bytes_decoded == sum(record.bytes_decoded for record in records)
+
+
+def test_async_endpoints(server: MockNotionServer, async_client: NotionAsyncClient) -> None:
+    database_id = server.add_database(rows=120)
+    user_id = server.add_user()
+
+    async def main() -> None:
+        async with async_client:
+            database = await async_client.databases.retrieve(database_id)
+            pages = await async_collect_paginated_api(
+                async_client.databases.query, database_id=database_id
+            )
+            page = await async_client.pages.update(pages[0].id, properties=title("Async"))
+            user = await async_client.users.retrieve(user_id)
+            results = await async_client.search(query="Async")
+
+        assert database.id == database_id
+        assert len(pages) == 120
+        assert page.properties["Name"].title[0].plain_text == "Async"
+        assert user.id == user_id
+        assert [result.id for result in results.results] == [page.id]
+
+    asyncio.run(main())
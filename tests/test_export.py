@@ -0,0 +1,51 @@
+import asyncio
+import functools
+
+from typing import Any, List, Optional
+
+import pytest
+
+from notion import NotionAsyncClient
+from notion.export import DatabaseExporter, decode_results, next_cursor
+from notion.helpers import project_page
+from notion.mock import MockNotionServer
+from notion.sharedmemory import SHARED_MEMORY_AVAILABLE
+from notion.types import Page
+
+
+def export(server: MockNotionServer, database_id: str, **kwargs: Any) -> List[Any]:
+    client = NotionAsyncClient(auth="secret", transport=server.async_transport())
+
+    async def main() -> List[Any]:
+        async with DatabaseExporter(processes=2, page_size=25, **kwargs) as exporter:
+            return [page async for page in exporter.export(client, database_id)]
+
+    return asyncio.run(main())
+
+
+def test_next_cursor() -> None:
+    assert next_cursor(b'{"results": [{"next_cursor": "x"}], "next_cursor": "25"}') == "25"
+    assert next_cursor(b'{"results": [], "next_cursor": null}') is None
+    assert decode_results(b'{"results": [1, 2]}', str) == ["1", "2"]
+
+
+def test_export_yields_pages_in_order(server: MockNotionServer) -> None:
+    database_id = server.add_database(rows=120)
+
+    pages = export(server, database_id)
+
+    assert all(isinstance(page, Page) for page in pages)
+    assert [page.id for page in pages] == server.children[database_id]
+
+
+@pytest.mark.parametrize("ring_size", [None, 64 * 1024])
+def test_export_with_transform(server: MockNotionServer, ring_size: Optional[int]) -> None:
+    if ring_size and not SHARED_MEMORY_AVAILABLE:
+        pytest.skip("Shared memory requires Python 3.8")
+    database_id = server.add_database(rows=120)
+    transform = functools.partial(project_page, properties=("Name",))
+
+    rows = export(server, database_id, transform=transform, ring_size=ring_size)
+
+    assert [row.id for row in rows] == server.children[database_id]
+    assert rows[0].values[0].title[0].plain_text == "Row 0"
@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from notion import NotionAsyncClient
+from notion.breaker import endpoint_key
+from notion.errors import APIResponseError
+from notion.hedging import HedgingPolicy
+from notion.mock import MockNotionServer
+from notion.ratelimit import RateLimiter
+
+
+class SlowFirstTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport, delay: float) -> None:
+        self.transport = transport
+        self.delay = delay
+        self.calls = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.calls == 1:
+            await asyncio.sleep(self.delay)
+        return await self.transport.handle_async_request(request)
+
+
+def samples(policy: HedgingPolicy, path: str) -> list:
+    latencies = policy._endpoints.get(endpoint_key("GET", path), None)
+    return list(latencies.samples) if latencies is not None else []
+
+
+def test_hedge_wins_over_slow_request(server: MockNotionServer) -> None:
+    database_id = server.add_database(rows=1)
+    page_id = server.children[database_id][0]
+    policy = HedgingPolicy(max_delay=0.05)
+    transport = SlowFirstTransport(server.async_transport(), delay=1.0)
+    client = NotionAsyncClient(auth="secret", transport=transport, hedging=policy)
+
+    page = asyncio.run(client.pages.retrieve(page_id))
+
+    assert page.id == page_id
+    assert (policy.hedges, policy.wins) == (1, 1)
+    # The latency of the hedge is observed, then the time the cancelled
+    # request had been running.
+    latency, censored = samples(policy, "pages/" + page_id)
+    assert latency < censored < 0.5
+    assert censored >= 0.05
+
+
+def test_failed_requests_are_not_observed(server: MockNotionServer) -> None:
+    policy = HedgingPolicy()
+    client = NotionAsyncClient(auth="secret", transport=server.async_transport(), hedging=policy)
+    page_id = "c0ffee00-0000-4000-8000-000000000000"
+
+    with pytest.raises(APIResponseError):
+        asyncio.run(client.pages.retrieve(page_id))
+
+    assert samples(policy, "pages/" + page_id) == []
+    assert policy.hedges == 0
+
+
+def test_requests_waiting_for_the_rate_limiter_are_not_hedged(server: MockNotionServer) -> None:
+    user_id = server.add_user()
+    policy = HedgingPolicy(max_delay=0.05)
+    client = NotionAsyncClient(auth="secret", transport=server.async_transport(), hedging=policy)
+    client.rate_limiter = RateLimiter(5, burst=1)
+
+    async def main() -> None:
+        # The second request waits 0.2s for a slot, longer than the delay.
+        await asyncio.gather(*(client.users.retrieve(user_id) for _ in range(2)))
+
+    asyncio.run(main())
+
+    assert policy.hedges == 0
+    assert all(latency < 0.05 for latency in samples(policy, "users/" + user_id))
+
+
+def test_delay_follows_percentile() -> None:
+    policy = HedgingPolicy(percentile=90, min_samples=10, min_delay=0.0)
+    for index in range(100):
+        policy.observe("GET", "users", index / 100)
+
+    assert policy.delay("GET", "users") == pytest.approx(0.9)
+    assert policy.delay("GET", "search") == policy.max_delay
+
+
+def test_budget_limits_hedges() -> None:
+    policy = HedgingPolicy(budget=0.1, max_rate=1000)
+
+    assert policy.acquire()
+    assert not policy.acquire()
+    # Each request earns a tenth of a hedge, censored samples nothing.
+    for _ in range(11):
+        policy.observe("GET", "users", 0.1, censored=True)
+    time.sleep(0.01)
+    assert not policy.acquire()
+    for _ in range(11):
+        policy.observe("GET", "users", 0.1)
+    assert policy.acquire()
@@ -0,0 +1,24 @@
+from notion import NotionClient
+from notion.helpers import paginated_list
+from notion.mock import MockNotionServer
+from notion.types import Page, PaginatedList
+
+
+def test_paginated_list_specializations_are_cached() -> None:
+    model = paginated_list(Page)
+
+    assert issubclass(model, PaginatedList)
+    assert paginated_list(Page) is model
+    assert paginated_list(Page) is not paginated_list(str)
+
+
+def test_endpoints_parse_cached_specializations(
+    server: MockNotionServer, client: NotionClient
+) -> None:
+    database_id = server.add_database(rows=3)
+
+    first = client.databases.query(database_id)
+    second = client.databases.query(database_id)
+
+    assert type(first) is type(second) is paginated_list(Page)
+    assert [page.id for page in first.results] == server.children[database_id]
@@ -0,0 +1,94 @@
+import subprocess
+import sys
+
+from typing import Any, Dict
+
+from notion import NotionAsyncClient, NotionClient
+from notion.identity import IdentityMap
+from notion.mock import MockNotionServer
+
+
+def title(name: str) -> Dict[str, Any]:
+    return {"Name": {"title": [{"text": {"content": name}}]}}
+
+
+def page_title(page: Any) -> str:
+    return page.properties["Name"].title[0].plain_text
+
+
+def test_unchanged_objects_are_reused(server: MockNotionServer) -> None:
+    database_id = server.add_database(rows=20)
+    identity_map = IdentityMap()
+    client = NotionClient(auth="secret", transport=server.transport(), identity_map=identity_map)
+
+    first = client.databases.query(database_id).results
+    page = client.pages.retrieve(first[0].id)
+    second = client.databases.query(database_id).results
+
+    assert page is first[0]
+    assert all(a is b for a, b in zip(first, second))
+    assert (identity_map.hits, identity_map.misses) == (21, 20)
+
+
+def test_writes_within_the_same_minute_are_parsed() -> None:
+    server = MockNotionServer(round_timestamps=True)
+    database_id = server.add_database(rows=1)
+    page_id = server.children[database_id][0]
+    client = NotionClient(auth="secret", transport=server.transport(), identity_map=IdentityMap())
+
+    page = client.pages.retrieve(page_id)
+    updated = client.pages.update(page_id, properties=title("New"))
+
+    assert updated is not page
+    assert page_title(updated) == "New"
+    assert client.pages.retrieve(page_id) is updated
+
+
+def test_objects_sharing_an_id_are_kept_apart() -> None:
+    identity_map = IdentityMap()
+    version = {"id": "1", "last_edited_time": "2021-05-20T10:00:00.000Z"}
+    block = {**version, "object": "block", "type": "child_page"}
+    page = {**version, "object": "page"}
+
+    parsed_block = identity_map.parse(lambda response: ("block", response), block)
+    parsed_page = identity_map.parse(lambda response: ("page", response), page)
+
+    assert parsed_block[0] == "block"
+    assert parsed_page[0] == "page"
+    assert identity_map.get(block) is parsed_block
+    assert identity_map.get(page) is parsed_page
+
+
+def test_tenants_do_not_share_objects(server: MockNotionServer) -> None:
+    client = NotionAsyncClient(
+        auth="secret", transport=server.async_transport(), identity_map=IdentityMap(max_size=5)
+    )
+
+    first = client.tenant("first")
+    second = client.tenant("second")
+
+    assert first.identity_map is not None and second.identity_map is not None
+    assert first.identity_map is not second.identity_map
+    assert first.identity_map is not client.identity_map
+    assert first.identity_map.max_size == 5
+
+
+def test_least_recently_used_objects_are_evicted(server: MockNotionServer) -> None:
+    database_id = server.add_database(rows=5)
+    identity_map = IdentityMap(max_size=3)
+    client = NotionClient(auth="secret", transport=server.transport(), identity_map=identity_map)
+
+    client.databases.query(database_id)
+
+    assert len(identity_map) == 3
+    identity_map.clear()
+    assert len(identity_map) == 0
+
+
+def test_client_import_does_not_load_models() -> None:
+    code = "import sys; from notion import NotionClient; print('pydantic' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert output.strip() == "False"
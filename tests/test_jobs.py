@@ -0,0 +1,142 @@
+import asyncio
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from notion import NotionAsyncClient, NotionClient
+from notion.errors import HTTPResponseError
+from notion.jobs import Job, JobQueue, is_idempotent
+from notion.mock import MockNotionServer
+
+
+def create_jobs(database_id: str, count: int) -> List[Any]:
+    return [
+        (
+            "row-{n}".format(n=n),
+            "POST",
+            "pages",
+            {
+                "parent": {"database_id": database_id},
+                "properties": {"Name": {"title": [{"text": {"content": "Row {n}".format(n=n)}}]}},
+            },
+        )
+        for n in range(count)
+    ]
+
+
+@pytest.fixture
+def queue(tmp_path: Path) -> JobQueue:
+    with JobQueue(str(tmp_path / "jobs.sqlite"), retry_delay=0.01) as queue:
+        yield queue
+
+
+def test_is_idempotent() -> None:
+    assert is_idempotent("PATCH", "pages/id")
+    assert not is_idempotent("PATCH", "blocks/id/children")
+    assert not is_idempotent("POST", "pages")
+
+
+def test_run_creates_each_page_once(
+    server: MockNotionServer, client: NotionClient, queue: JobQueue
+) -> None:
+    database_id = server.add_database()
+    jobs = create_jobs(database_id, 10)
+
+    assert queue.put_many(jobs) == 10
+    assert queue.run(client) == {"done": 10}
+    assert queue.put_many(jobs) == 0
+    assert queue.run(client) == {"done": 10}
+
+    results = dict(queue.results())
+    assert sorted(result["id"] for result in results.values()) == sorted(
+        server.children[database_id]
+    )
+
+
+def test_server_error_on_creation_is_not_sent_again(
+    server: MockNotionServer, client: NotionClient, queue: JobQueue
+) -> None:
+    database_id = server.add_database()
+    queue.put_many(create_jobs(database_id, 1))
+    server.fail_next(500)
+
+    assert queue.run(client) == {"unknown": 1}
+    assert len(server.requests) == 1
+
+
+def test_unsure_creation_is_reconciled(
+    server: MockNotionServer, client: NotionClient, queue: JobQueue
+) -> None:
+    database_id = server.add_database()
+    queue.put_many(create_jobs(database_id, 2))
+    server.fail_next(502, count=2)
+    reconciled: List[Job] = []
+
+    def reconcile(job: Job) -> Dict[str, Any]:
+        reconciled.append(job)
+        return {"object": "page", "id": "found-" + job.key}
+
+    assert queue.run(client, reconcile=reconcile) == {"done": 2}
+    assert sorted(job.key for job in reconciled) == ["row-0", "row-1"]
+    assert dict(queue.results())["row-0"] == {"object": "page", "id": "found-row-0"}
+
+
+def test_rate_limited_creation_is_retried(
+    server: MockNotionServer, client: NotionClient, queue: JobQueue
+) -> None:
+    database_id = server.add_database()
+    queue.put_many(create_jobs(database_id, 1))
+    server.fail_next(429)
+
+    assert queue.run(client) == {"done": 1}
+    assert len(server.children[database_id]) == 1
+
+
+def test_retries_wait_for_backoff(tmp_path: Path) -> None:
+    queue = JobQueue(str(tmp_path / "backoff.sqlite"), retry_delay=60)
+    queue.put("update", "PATCH", "pages/id", {"archived": True})
+
+    (job,) = queue._claim()
+    queue._save([(job, None, HTTPResponseError(httpx.Response(503)))])
+
+    assert queue._claim() == []
+    delay = queue._next_delay()
+    assert delay is not None and delay > 59
+    queue.close()
+
+
+def test_failed_jobs_are_requeued(
+    server: MockNotionServer, client: NotionClient, queue: JobQueue
+) -> None:
+    queue.put("missing", "GET", "pages/c0ffee00-0000-4000-8000-000000000000")
+
+    assert queue.run(client) == {"failed": 1}
+    assert queue.requeue() == 1
+    assert queue.counts() == {"pending": 1}
+
+
+def test_interrupted_jobs(server: MockNotionServer, client: NotionClient, queue: JobQueue) -> None:
+    database_id = server.add_database(rows=1)
+    page_id = server.children[database_id][0]
+    queue.put_many(create_jobs(database_id, 1))
+    queue.put("update", "PATCH", "pages/" + page_id, {"archived": True})
+    queue._claim()
+
+    # The creation may have been applied, the update can be sent again.
+    assert queue.run(client) == {"done": 1, "unknown": 1}
+
+
+def test_run_async(server: MockNotionServer, queue: JobQueue) -> None:
+    database_id = server.add_database()
+    queue.put_many(create_jobs(database_id, 5))
+    client = NotionAsyncClient(auth="secret", transport=server.async_transport())
+    server.fail_next(500)
+
+    async def reconcile(job: Job) -> None:
+        return None
+
+    assert asyncio.run(queue.run_async(client, reconcile=reconcile)) == {"done": 5}
+    assert len(server.children[database_id]) == 5
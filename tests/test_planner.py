@@ -0,0 +1,166 @@
+import asyncio
+
+from typing import Any, Dict, List
+
+import pytest
+
+from notion import NotionAsyncClient, NotionClient
+from notion.mock import MockNotionServer
+from notion.planner import (
+    BlockAppend,
+    BlockArchive,
+    apply_edit_script,
+    apply_edit_script_async,
+    fetch_block_tree,
+    fetch_block_tree_async,
+    plan_block_updates,
+)
+
+
+def paragraph(content: str) -> Dict[str, Any]:
+    return {"type": "paragraph", "paragraph": {"text": [{"text": {"content": content}}]}}
+
+
+def texts(blocks: List[Dict[str, Any]]) -> List[str]:
+    return [
+        "".join(item["text"]["content"] for item in block[block["type"]].get("text", []))
+        for block in blocks
+    ]
+
+
+@pytest.fixture
+def page_id(server: MockNotionServer) -> str:
+    database_id = server.add_database(rows=1)
+    page_id = server.children[database_id][0]
+    server.add_blocks(page_id, 5)
+    return page_id
+
+
+def test_unchanged_tree_needs_no_request(client: NotionClient, page_id: str) -> None:
+    current = fetch_block_tree(client, page_id)
+
+    script = plan_block_updates(page_id, current, current)
+
+    assert script.operations == []
+
+
+def test_insert_in_the_middle_is_a_single_request(client: NotionClient, page_id: str) -> None:
+    current = fetch_block_tree(client, page_id)
+    desired = [*current[:2], paragraph("New"), *current[2:]]
+
+    script = plan_block_updates(page_id, current, desired)
+    assert script.requests == 1
+    apply_edit_script(client, script)
+
+    blocks = fetch_block_tree(client, page_id)
+    assert texts(blocks) == texts(desired)
+    assert [block["id"] for block in blocks[:2]] == [block["id"] for block in current[:2]]
+    assert [block["id"] for block in blocks[3:]] == [block["id"] for block in current[2:]]
+
+
+def test_insert_at_the_start_recreates_the_first_block(client: NotionClient, page_id: str) -> None:
+    current = fetch_block_tree(client, page_id)
+    desired = [paragraph("First"), *current]
+
+    script = plan_block_updates(page_id, current, desired)
+    (operation,) = script.operations
+    assert isinstance(operation, BlockAppend)
+    assert (operation.after, operation.archive_after) == (current[0]["id"], True)
+    assert texts(operation.children) == ["First", "Paragraph 0"]
+    assert script.requests == 2
+    apply_edit_script(client, script)
+
+    assert texts(fetch_block_tree(client, page_id)) == texts(desired)
+
+
+def test_update_and_remove(client: NotionClient, page_id: str) -> None:
+    current = fetch_block_tree(client, page_id)
+    desired = [current[0], {**paragraph("Changed"), "id": current[1]["id"]}, *current[3:]]
+
+    script = plan_block_updates(page_id, current, desired)
+    assert script.requests == 2
+    apply_edit_script(client, script)
+
+    assert texts(fetch_block_tree(client, page_id)) == [
+        "Paragraph 0",
+        "Changed",
+        "Paragraph 3",
+        "Paragraph 4",
+    ]
+
+
+def test_long_insert_keeps_order_across_chunks(client: NotionClient, page_id: str) -> None:
+    current = fetch_block_tree(client, page_id)
+    inserted = [paragraph("New {n}".format(n=n)) for n in range(250)]
+    desired = [current[0], *inserted, *current[1:]]
+
+    script = plan_block_updates(page_id, current, desired)
+    assert script.requests == 3
+    apply_edit_script(client, script)
+
+    assert texts(fetch_block_tree(client, page_id)) == texts(desired)
+
+
+def test_child_pages_are_not_archived(
+    server: MockNotionServer, client: NotionClient, page_id: str
+) -> None:
+    subpage = server._add_block(page_id, {"child_page": {"title": "Subpage"}})
+    current = fetch_block_tree(client, page_id)
+
+    script = plan_block_updates(page_id, current, [])
+
+    assert BlockArchive(subpage) not in script.operations
+    assert len(script.operations) == 5
+
+
+def test_subpage_content_is_left_alone(
+    server: MockNotionServer, client: NotionClient, page_id: str
+) -> None:
+    server._add_block(page_id, {"child_page": {"title": "Sub", "children": [paragraph("p1")]}})
+    current = fetch_block_tree(client, page_id)
+    desired = [
+        *map(paragraph, texts(current[:5])),
+        {"type": "child_page", "child_page": {"title": "Sub"}},
+    ]
+
+    assert "children" not in current[5]
+    assert plan_block_updates(page_id, current, desired).operations == []
+
+
+def test_child_page_children_are_not_planned() -> None:
+    current = [
+        {
+            "id": "sub",
+            "type": "child_page",
+            "child_page": {"title": "Sub"},
+            "children": [{"id": "p1", **paragraph("p1")}],
+        }
+    ]
+
+    script = plan_block_updates(
+        "root", current, [{"type": "child_page", "child_page": {"title": "Sub"}}]
+    )
+
+    assert script.operations == []
+
+
+def test_insert_before_child_page_is_refused(
+    server: MockNotionServer, client: NotionClient
+) -> None:
+    database_id = server.add_database(rows=1)
+    page_id = server.children[database_id][0]
+    server._add_block(page_id, {"child_page": {"title": "Subpage"}})
+    current = fetch_block_tree(client, page_id)
+
+    with pytest.raises(ValueError):
+        plan_block_updates(page_id, current, [paragraph("First"), *current])
+
+
+def test_async_apply(async_client: NotionAsyncClient, page_id: str) -> None:
+    async def main() -> List[str]:
+        current = await fetch_block_tree_async(async_client, page_id)
+        desired = [*current[:3], paragraph("New"), *current[3:]]
+        await apply_edit_script_async(async_client, plan_block_updates(page_id, current, desired))
+        return texts(await fetch_block_tree_async(async_client, page_id))
+
+    assert asyncio.run(main())[3] == "New"
@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+from typing import Any, Dict, List
+
+import httpx
+
+from notion import NotionAsyncClient
+from notion.errors import CircuitOpenError
+from notion.mock import MockNotionServer
+from notion.poller import ChangeEvent, ChangePoller
+
+
+def title(name: str) -> Dict[str, Any]:
+    return {"Name": {"title": [{"text": {"content": name}}]}}
+
+
+class FlakyTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport, failures: int) -> None:
+        self.transport = transport
+        self.failures = failures
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.failures:
+            self.failures -= 1
+            raise httpx.ConnectError("Connection refused", request=request)
+        return await self.transport.handle_async_request(request)
+
+
+def test_poll_emits_changes_since_previous_poll(
+    server: MockNotionServer, async_client: NotionAsyncClient
+) -> None:
+    database_id = server.add_database(rows=3)
+    page_id = server.children[database_id][1]
+
+    async def main() -> List[List[ChangeEvent]]:
+        poller = ChangePoller(async_client, queue=asyncio.Queue())
+        key = poller.watch_database(database_id)
+        polls = [await poller.poll(key)]
+        await async_client.pages.update(page_id, properties=title("Edited"))
+        polls.append(await poller.poll(key))
+        polls.append(await poller.poll(key))
+        return polls
+
+    baseline, changes, idle = asyncio.run(main())
+    assert baseline == []
+    assert [event.id for event in changes] == [page_id]
+    assert idle == []
+
+
+def test_first_page_of_an_empty_database_is_emitted(
+    server: MockNotionServer, async_client: NotionAsyncClient
+) -> None:
+    database_id = server.add_database()
+
+    async def main() -> List[List[ChangeEvent]]:
+        poller = ChangePoller(async_client, queue=asyncio.Queue())
+        key = poller.watch_database(database_id)
+        polls = [await poller.poll(key)]
+        await async_client.pages.create(
+            parent={"database_id": database_id}, properties=title("New")
+        )
+        polls.append(await poller.poll(key))
+        return polls
+
+    baseline, changes = asyncio.run(main())
+    assert baseline == []
+    assert [event.id for event in changes] == server.children[database_id]
+
+
+def test_edits_within_the_same_minute_are_emitted() -> None:
+    server = MockNotionServer(round_timestamps=True)
+    database_id = server.add_database(rows=3)
+    page_id = server.children[database_id][0]
+    client = NotionAsyncClient(auth="secret", transport=server.async_transport())
+
+    async def main() -> List[List[ChangeEvent]]:
+        poller = ChangePoller(client, queue=asyncio.Queue())
+        key = poller.watch_database(database_id)
+        await poller.poll(key)
+        polls = []
+        for name in ("First", "Second"):
+            await client.pages.update(page_id, properties=title(name))
+            polls.append(await poller.poll(key))
+        polls.append(await poller.poll(key))
+        return polls
+
+    first, second, idle = asyncio.run(main())
+    assert [event.id for event in first] == [page_id]
+    assert [event.id for event in second] == [page_id]
+    assert idle == []
+
+
+def test_connection_errors_back_off(server: MockNotionServer) -> None:
+    database_id = server.add_database(rows=1)
+    transport = FlakyTransport(server.async_transport(), failures=1)
+    client = NotionAsyncClient(auth="secret", transport=transport)
+
+    async def main() -> ChangePoller:
+        poller = ChangePoller(client, queue=asyncio.Queue(), min_interval=1.0)
+        poller.watch_database(database_id)
+        await poller._run_watch(poller.watches[database_id])
+        return poller
+
+    watch = asyncio.run(main()).watches[database_id]
+    assert isinstance(watch.error, httpx.ConnectError)
+    assert watch.interval == 1.5
+
+
+def test_open_circuit_delays_next_poll(
+    server: MockNotionServer, async_client: NotionAsyncClient
+) -> None:
+    database_id = server.add_database(rows=1)
+
+    async def request(*args: Any, **kwargs: Any) -> Any:
+        raise CircuitOpenError("POST databases/query", retry_after=60.0)
+
+    async_client.request = request  # type: ignore
+
+    async def main() -> ChangePoller:
+        poller = ChangePoller(async_client, queue=asyncio.Queue())
+        poller.watch_database(database_id)
+        await poller._run_watch(poller.watches[database_id])
+        return poller
+
+    watch = asyncio.run(main()).watches[database_id]
+    assert isinstance(watch.error, CircuitOpenError)
+    assert watch.next_poll >= time.monotonic() + 59
+
+
+def test_run_survives_errors(server: MockNotionServer) -> None:
+    database_id = server.add_database(rows=2)
+    transport = FlakyTransport(server.async_transport(), failures=2)
+    client = NotionAsyncClient(auth="secret", transport=transport)
+
+    async def main() -> None:
+        poller = ChangePoller(client, queue=asyncio.Queue(), min_interval=0.01, max_interval=0.01)
+        poller.watch_database(database_id)
+        task = asyncio.ensure_future(poller.run())
+        while server.requests == [] or transport.failures:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        poller.stop()
+        await task
+        assert poller.watches[database_id].error is None
+
+    asyncio.run(main())
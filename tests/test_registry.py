@@ -0,0 +1,49 @@
+import pytest
+
+from notion.mock import MockNotionServer
+from notion.registry import ClientRegistry
+
+
+def test_get_reuses_clients(server: MockNotionServer) -> None:
+    registry = ClientRegistry()
+    transport = server.transport()
+
+    client = registry.get(auth="secret", transport=transport)
+
+    assert registry.get(auth="secret", transport=transport) is client
+    same = registry.get(auth="secret", base_url="https://api.notion.com", transport=transport)
+    assert same is client
+    assert registry.get(auth="other", transport=transport) is not client
+    registry.clear()
+
+
+def test_get_rejects_other_options(server: MockNotionServer) -> None:
+    registry = ClientRegistry()
+    transport = server.transport()
+    registry.get(auth="secret", transport=transport)
+
+    with pytest.raises(ValueError):
+        registry.get(auth="secret", transport=transport, rate_limit=3)
+    registry.clear()
+
+
+def test_get_sends_no_request(server: MockNotionServer) -> None:
+    registry = ClientRegistry(max_idle=30)
+    transport = server.transport()
+
+    client = registry.get(auth="secret", transport=transport)
+    registry.get(auth="secret", transport=transport)
+
+    assert server.requests == []
+    assert client.keepalive_expiry == 30
+    registry.clear()
+
+
+def test_get_replaces_closed_clients(server: MockNotionServer) -> None:
+    registry = ClientRegistry()
+    transport = server.transport()
+    client = registry.get(auth="secret", transport=transport)
+    client.close()
+
+    assert registry.get(auth="secret", transport=transport) is not client
+    registry.clear()
@@ -0,0 +1,68 @@
+import asyncio
+
+from typing import Any, Dict, List
+
+import pytest
+
+from notion import NotionAsyncClient, NotionClient
+from notion.mock import MockNotionServer
+from notion.resolver import AsyncResolver, Resolver, references
+
+
+MISSING_ID = "c0ffee00-0000-4000-8000-000000000000"
+
+
+@pytest.fixture
+def pages(server: MockNotionServer) -> List[Dict[str, Any]]:
+    database_id = server.add_database()
+    schema = server.databases[database_id]["properties"]
+    schema["Owner"] = {"id": "owner", "name": "Owner", "type": "people", "people": {}}
+    schema["Related"] = {"id": "related", "name": "Related", "type": "relation", "relation": {}}
+    users = [server.add_user("User {n}".format(n=n)) for n in range(3)]
+    targets = server.children[server.add_database(rows=2)]
+    for n in range(10):
+        server.add_page(
+            database_id,
+            {
+                "Owner": {"people": [{"object": "user", "id": users[n % 3]}]},
+                "Related": {"relation": [{"id": targets[n % 2]}, {"id": MISSING_ID}]},
+            },
+        )
+    return [server.pages[page_id] for page_id in server.children[database_id]]
+
+
+def test_references(server: MockNotionServer, pages: List[Dict[str, Any]]) -> None:
+    users, related = references(pages)
+
+    assert users == set(server.users)
+    assert len(related) == 3
+
+
+def test_prefetch_fetches_each_object_once(
+    server: MockNotionServer, client: NotionClient, pages: List[Dict[str, Any]]
+) -> None:
+    resolver = Resolver(client)
+
+    resolver.prefetch(pages)
+    resolver.prefetch(pages)
+
+    # Users are listed at once, and related pages retrieved one by one.
+    assert resolver.lookups == 3
+    assert len(server.requests) == 4
+    owner = pages[0]["properties"]["Owner"]["people"][0]["id"]
+    assert resolver.user(owner).name == "User 0"
+    assert resolver.page(MISSING_ID) is None
+
+
+def test_async_prefetch(
+    server: MockNotionServer, async_client: NotionAsyncClient, pages: List[Dict[str, Any]]
+) -> None:
+    resolver = AsyncResolver(async_client, list_users=False)
+
+    async def main() -> None:
+        await asyncio.gather(resolver.prefetch(pages), resolver.prefetch(pages))
+
+    asyncio.run(main())
+
+    assert resolver.lookups == 6
+    assert len(server.requests) == 6
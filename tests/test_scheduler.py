@@ -0,0 +1,65 @@
+import threading
+import time
+
+from types import SimpleNamespace
+from typing import Callable, List
+
+import pytest
+
+from notion import scheduler as scheduler_module
+from notion.scheduler import Priority, PriorityScheduler, priority
+
+
+def wait_until(condition: Callable[[], bool]) -> None:
+    expires = time.monotonic() + 5.0
+    while not condition():
+        assert time.monotonic() < expires
+        time.sleep(0.001)
+
+
+def serve(
+    monkeypatch: pytest.MonkeyPatch, scheduler: PriorityScheduler, priorities: List[str]
+) -> List[str]:
+    """
+    Queues one request per priority class in `priorities`, in order, while
+    the scheduler clock is stopped, then lets the clock run and returns
+    the classes in the order they were served.
+    """
+
+    now = [scheduler._updated]
+    monkeypatch.setattr(scheduler_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    scheduler._tokens = 0.0
+    served = []
+
+    def request(value: str) -> None:
+        with priority(value):
+            scheduler.acquire()
+        served.append(value)
+
+    threads = []
+    for value in priorities:
+        threads.append(threading.Thread(target=request, args=(value,)))
+        threads[-1].start()
+        wait_until(lambda: len(scheduler._queue) == len(threads))
+    while len(served) < len(priorities):
+        now[0] += 1 / scheduler.rate
+        time.sleep(0.005)
+    for thread in threads:
+        thread.join()
+    return served
+
+
+def test_scheduler_serves_interactive_first(monkeypatch: pytest.MonkeyPatch) -> None:
+    scheduler = PriorityScheduler(rate=1000.0, burst=1)
+
+    served = serve(monkeypatch, scheduler, [Priority.BATCH] * 4 + [Priority.INTERACTIVE])
+
+    assert served == [Priority.INTERACTIVE] + [Priority.BATCH] * 4
+
+
+def test_scheduler_shares_slots_by_weight(monkeypatch: pytest.MonkeyPatch) -> None:
+    scheduler = PriorityScheduler(rate=1000.0, burst=1, weights={"a": 4.0, "b": 1.0})
+
+    served = serve(monkeypatch, scheduler, list("bbbbaaaaaa"))
+
+    assert "".join(served) == "aaabaaabbb"
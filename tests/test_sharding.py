@@ -0,0 +1,81 @@
+import asyncio
+
+from typing import Any, Dict, List
+
+import pytest
+
+from notion import APIResponseError, NotionAsyncClient
+from notion.mock import MockNotionServer
+from notion.sharding import created_time_shards, parallel_query, property_shards
+
+
+def scan(client: NotionAsyncClient, database_id: str, shards: Any, **kwargs: Any) -> List[str]:
+    async def main() -> List[str]:
+        return [
+            page["id"]
+            async for page in parallel_query(client, database_id, shards, page_size=7, **kwargs)
+        ]
+
+    return asyncio.run(main())
+
+
+def test_created_time_shards_cover_every_page(
+    server: MockNotionServer, async_client: NotionAsyncClient
+) -> None:
+    database_id = server.add_database(rows=100)
+    database = server.databases[database_id]
+    end = server.pages[server.children[database_id][-1]]["created_time"]
+
+    shards = created_time_shards(database, 5, end=end)
+    page_ids = scan(async_client, database_id, shards, concurrency=3)
+
+    assert len(shards) == 5
+    assert sorted(page_ids) == sorted(server.children[database_id])
+
+
+def test_property_shards_cover_every_page(
+    server: MockNotionServer, async_client: NotionAsyncClient
+) -> None:
+    database_id = server.add_database(rows=60)
+
+    shards = property_shards(server.databases[database_id], "Status")
+    page_ids = scan(async_client, database_id, shards)
+
+    assert len(shards) == 5
+    assert sorted(page_ids) == sorted(server.children[database_id])
+
+
+def test_filter_is_combined_with_shards(
+    server: MockNotionServer, async_client: NotionAsyncClient
+) -> None:
+    database_id = server.add_database(rows=60, columns=5)
+    checkbox: Dict[str, Any] = {"property": "Column 3", "checkbox": {"equals": True}}
+
+    shards = property_shards(server.databases[database_id], "Status")
+    page_ids = scan(async_client, database_id, shards, filter=checkbox)
+
+    expected = [
+        page_id
+        for page_id in server.children[database_id]
+        if server.pages[page_id]["properties"]["Column 3"]["checkbox"]
+    ]
+    assert sorted(page_ids) == sorted(expected)
+
+
+def test_invalid_shards(server: MockNotionServer) -> None:
+    database = server.databases[server.add_database(columns=4)]
+
+    with pytest.raises(ValueError):
+        created_time_shards(database, 0)
+    with pytest.raises(ValueError):
+        property_shards(database, "Due")
+    with pytest.raises(KeyError):
+        property_shards(database, "Missing")
+
+
+def test_errors_stop_the_scan(server: MockNotionServer, async_client: NotionAsyncClient) -> None:
+    database_id = server.add_database(rows=10)
+    server.fail_next(400)
+
+    with pytest.raises(APIResponseError):
+        scan(async_client, database_id, [{}])
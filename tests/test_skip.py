@@ -0,0 +1,34 @@
+from notion import NotionClient
+from notion.helpers import SkipSet, fingerprint, iterate_paginated_api
+from notion.mock import MockNotionServer
+
+
+def test_fingerprint_changes_with_properties(server: MockNotionServer) -> None:
+    database_id = server.add_database(rows=1)
+    page = server.pages[server.children[database_id][0]]
+
+    before = fingerprint(page)
+    assert fingerprint(dict(page)) == before
+    page["properties"]["Name"]["title"][0]["plain_text"] = "Changed"
+    assert fingerprint(page) != before
+
+
+def test_unchanged_pages_are_skipped(server: MockNotionServer, client: NotionClient) -> None:
+    database_id = server.add_database(rows=30)
+    first = SkipSet()
+    pages = list(iterate_paginated_api(client.databases.query, database_id=database_id, skip=first))
+    assert len(pages) == 30 and first.skipped == 0
+
+    changed = server.children[database_id][3]
+    client.pages.update(changed, properties={"Name": {"title": [{"text": {"content": "New"}}]}})
+    deleted = server.children[database_id][5]
+    client.pages.update(deleted, archived=True)
+
+    second = SkipSet(first.seen)
+    pages = list(
+        iterate_paginated_api(client.databases.query, database_id=database_id, skip=second)
+    )
+
+    assert [page.id for page in pages] == [changed]
+    assert second.skipped == 28
+    assert first.ids - second.ids == {deleted}
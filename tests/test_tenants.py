@@ -0,0 +1,82 @@
+import asyncio
+
+from typing import List, Optional
+
+from httpx import MockTransport, Request, Response
+
+from notion import NotionAsyncClient
+from notion.mock import MockNotionServer
+from notion.ratelimit import RateLimiter
+
+
+def recording_client(server: MockNotionServer, tokens: List[Optional[str]]) -> NotionAsyncClient:
+    async def handle(request: Request) -> Response:
+        tokens.append(request.headers.get("Authorization", None))
+        return await server.handle_async(request)
+
+    return NotionAsyncClient(auth="parent", rate_limit=10, transport=MockTransport(handle))
+
+
+def test_tenants_send_their_token(server: MockNotionServer) -> None:
+    user_id = server.add_user()
+    tokens: List[Optional[str]] = []
+    client = recording_client(server, tokens)
+
+    async def main() -> None:
+        await client.users.retrieve(user_id)
+        await client.tenant("first").users.retrieve(user_id)
+        await client.tenant("second").users.list()
+
+    asyncio.run(main())
+
+    assert tokens == ["Bearer parent", "Bearer first", "Bearer second"]
+
+
+def test_tenants_keep_their_own_limiter_and_metrics(server: MockNotionServer) -> None:
+    user_id = server.add_user()
+    client = recording_client(server, [])
+    first = client.tenant("first")
+    second = client.tenant("second")
+
+    async def main() -> None:
+        await first.users.retrieve(user_id)
+        await first.users.retrieve(user_id)
+        await second.users.retrieve(user_id)
+
+    asyncio.run(main())
+
+    assert client.tenant("first") is first
+    assert isinstance(first.rate_limiter, RateLimiter)
+    assert len({id(first.rate_limiter), id(second.rate_limiter), id(client.rate_limiter)}) == 3
+    assert (first.metrics.requests, second.metrics.requests, client.metrics.requests) == (2, 1, 0)
+
+
+def test_closing_a_tenant_leaves_the_pool_open(server: MockNotionServer) -> None:
+    user_id = server.add_user()
+    client = NotionAsyncClient(auth="parent", transport=server.async_transport())
+
+    async def main() -> None:
+        async with client.tenant("first") as tenant:
+            await tenant.users.retrieve(user_id)
+        assert not client.http_client.is_closed
+        await client.tenant("second").users.retrieve(user_id)
+        await client.aclose()
+
+    asyncio.run(main())
+
+    assert client.http_client.is_closed
+
+
+def test_client_used_from_successive_event_loops(server: MockNotionServer) -> None:
+    user_id = server.add_user()
+    client = NotionAsyncClient(auth="parent", transport=server.async_transport())
+    tenant = client.tenant("first")
+    pools = []
+
+    for _ in range(2):
+        asyncio.run(client.users.retrieve(user_id))
+        asyncio.run(tenant.users.retrieve(user_id))
+        pools.append(client.http_client)
+
+    assert pools[0] is not pools[1]
+    assert tenant.metrics.requests == 2
@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from httpx import MockTransport, Request, Response
+
+from notion import NotionClient
+from notion.errors import HTTPResponseError
+from notion.mock import MockNotionServer
+from notion.transports import RecordingTransport, ReplayTransport
+
+
+def test_record_and_replay(server: MockNotionServer, tmp_path) -> None:
+    database_id = server.add_database(rows=5)
+    path = str(tmp_path / "run.jsonl.gz")
+
+    recording = RecordingTransport(path, transport=server.transport())
+    with NotionClient(auth="secret", transport=recording) as notion:
+        recorded = notion.databases.query(database_id)
+        # Entries are buffered until the client is closed.
+        assert not os.path.exists(path)
+
+    notion = NotionClient(transport=ReplayTransport(path))
+    replayed = notion.databases.query(database_id)
+
+    assert replayed == recorded
+
+
+def test_record_non_json_body(tmp_path) -> None:
+    path = str(tmp_path / "run.jsonl")
+
+    def handler(request: Request) -> Response:
+        return Response(502, text="<html>Bad Gateway</html>")
+
+    recording = RecordingTransport(path, transport=MockTransport(handler))
+    with NotionClient(auth="secret", transport=recording) as notion:
+        with pytest.raises(HTTPResponseError):
+            notion.request("GET", "users")
+
+    replay = ReplayTransport(path)
+    response = replay.handle_request(Request("GET", "https://api.notion.com/v1/users"))
+    assert response.status_code == 502
+    assert response.text == "<html>Bad Gateway</html>"
+
+
+def test_record_flushes_every_buffer_size(server: MockNotionServer, tmp_path) -> None:
+    user_id = server.add_user()
+    path = str(tmp_path / "run.jsonl")
+
+    recording = RecordingTransport(path, transport=server.transport(), buffer_size=2)
+    notion = NotionClient(auth="secret", transport=recording)
+    for _ in range(3):
+        notion.users.retrieve(user_id)
+
+    with open(path) as cassette:
+        assert len(cassette.readlines()) == 2
+    notion.close()
+    with open(path) as cassette:
+        assert len(cassette.readlines()) == 3